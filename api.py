@@ -0,0 +1,293 @@
+import argparse
+import asyncio
+import json
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from instrumentation import span, snapshot, prometheus_text
+from pipeline import normalize_symbol, analysis_report
+
+# ---------------- Server Settings ----------------
+MAX_CONCURRENCY = 32      # analyses running at once (each holds one worker thread)
+MAX_QUEUE = 256           # analyses allowed to wait for a slot before load is shed
+MAX_BULK = 200            # symbols per bulk request
+MAX_BODY = 64 * 1024
+READ_TIMEOUT = 30
+
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+class Overloaded(Exception):
+    pass
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ---------------- Data Providers ----------------
+# A provider maps a symbol to the inputs dict of pipeline.fetch_inputs. The live
+# one goes to Yahoo/Google News (through the shared caches and fetch pool); the
+# stub serves deterministic synthetic data after an optional delay, so the
+# service can be load tested locally.
+def live_provider(symbol):
+    from pipeline import fetch_inputs
+
+    return fetch_inputs(symbol)
+
+
+def stub_provider(latency=0.0):
+    from benchmarks import synthetic
+    from marketmind_v5_final import sentiment_from_headlines
+    from price_store import last_days
+
+    def provider(symbol):
+        if latency:
+            time.sleep(latency)
+        seed = zlib.crc32(symbol.encode())
+        info = next(iter(synthetic.info_dicts(1, seed=seed).values()))
+        history = synthetic.ohlcv(days=22, seed=seed)
+        return {
+            "symbol": symbol,
+            "errors": {},
+            "info": info,
+            "history": history,
+            "news": sentiment_from_headlines(synthetic.headlines(5, seed=seed)),
+            "window_1mo": history,
+            "window_7d": last_days(history, 7),
+        }
+
+    return provider
+
+
+# ---------------- Analysis Service ----------------
+class AnalysisService:
+    def __init__(self, provider=live_provider, max_concurrency=MAX_CONCURRENCY, max_queue=MAX_QUEUE):
+        self.provider = provider
+        self.max_queue = max_queue
+        # Blocking fetches run on a pool sized to the semaphore, so upstream
+        # calls in flight never exceed max_concurrency however many clients wait
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="marketmind-api")
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.running = 0
+        self.waiting = 0
+        self.shed = 0
+
+    def _analyze(self, symbol):
+        with span("api.analyze"):
+            return analysis_report(self.provider(symbol))
+
+    def _admit(self, count):
+        if self.waiting + count > self.max_queue:
+            self.shed += count
+            raise Overloaded(f"{self.waiting} analyses already queued")
+
+    async def _run(self, symbol):
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._analyze, symbol)
+        finally:
+            self.running -= 1
+            self._slots.release()
+
+    async def analyze(self, symbol):
+        self._admit(1)
+        return await self._run(symbol)
+
+    async def analyze_many(self, symbols):
+        # A bulk request is admitted as a whole, so a shed request never leaves
+        # half of its symbols queued; one failing symbol does not fail the rest
+        self._admit(len(symbols))
+
+        async def one(symbol):
+            try:
+                return await self._run(symbol)
+            except Exception as e:
+                return {"symbol": symbol, "errors": {"analysis": str(e)}}
+
+        return await asyncio.gather(*(one(s) for s in symbols))
+
+    def health(self):
+        return {"status": "ok", "running": self.running, "waiting": self.waiting, "shed": self.shed}
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ---------------- HTTP ----------------
+async def read_request(reader):
+    # (method, target, headers, body) or None when the client closed the connection
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HTTPError(400, "bad Content-Length")
+    if length > MAX_BODY:
+        raise HTTPError(413, f"body larger than {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+def write_response(writer, status, payload, keep_alive=True, extra_headers=None):
+    # str payloads go out as plain text (Prometheus), everything else as JSON
+    if isinstance(payload, str):
+        body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+    else:
+        body = json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+        content_type = "application/json"
+    head = [
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+        f"Content-Type: {content_type}; charset=utf-8",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    head += [f"{k}: {v}" for k, v in (extra_headers or {}).items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+
+
+def _json_default(value):
+    # NumPy scalars from the valuation/psychology helpers
+    item = getattr(value, "item", None)
+    return item() if item else str(value)
+
+
+def _bulk_symbols(query, body):
+    if body:
+        try:
+            symbols = json.loads(body).get("symbols")
+        except (ValueError, AttributeError):
+            raise HTTPError(400, 'body must be {"symbols": [...]}')
+    else:
+        symbols = ",".join(query.get("symbols", [])).split(",")
+    if not isinstance(symbols, list):
+        raise HTTPError(400, "symbols must be a list")
+    symbols = [normalize_symbol(str(s)) for s in symbols if str(s).strip()]
+    if not symbols:
+        raise HTTPError(400, "no symbols given")
+    if len(symbols) > MAX_BULK:
+        raise HTTPError(413, f"at most {MAX_BULK} symbols per request")
+    return list(dict.fromkeys(symbols))
+
+
+class AnalysisServer:
+    # GET  /health
+    # GET  /metrics                      (Prometheus text; /metrics.json for JSON)
+    # GET  /analyze/<SYMBOL>
+    # GET  /analyze?symbols=INFY,TCS     (bulk)
+    # POST /analyze  {"symbols": [...]}  (bulk)
+    def __init__(self, service):
+        self.service = service
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        path = url.path.rstrip("/")
+        if path == "/health":
+            return 200, self.service.health()
+        if path == "/metrics":
+            return 200, prometheus_text()
+        if path == "/metrics.json":
+            return 200, snapshot()
+        if path.startswith("/analyze/") and method == "GET":
+            return 200, await self.service.analyze(normalize_symbol(unquote(path[len("/analyze/"):])))
+        if path == "/analyze":
+            if method not in ("GET", "POST"):
+                raise HTTPError(405, "use GET or POST")
+            symbols = _bulk_symbols(parse_qs(url.query), body)
+            return 200, {"results": await self.service.analyze_many(symbols)}
+        raise HTTPError(404, f"no route for {method} {url.path}")
+
+    async def handle(self, reader, writer):
+        # HTTP/1.1 with keep-alive, one request at a time per connection
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), READ_TIMEOUT)
+                except HTTPError as e:
+                    write_response(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                extra = None
+                try:
+                    status, payload = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Overloaded as e:
+                    status, payload, extra = 503, {"error": f"overloaded: {e}"}, {"Retry-After": "1"}
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+                write_response(writer, status, payload, keep_alive, extra)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host, port, service):
+    server = await asyncio.start_server(AnalysisServer(service).handle, host, port)
+    async with server:
+        print(f"MarketMind API listening on http://{host}:{port}")
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MarketMind analysis as a JSON HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENCY)
+    parser.add_argument("--max-queue", type=int, default=MAX_QUEUE)
+    parser.add_argument("--stub", action="store_true", help="serve synthetic data instead of Yahoo/Google News")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="seconds each stubbed fetch takes")
+    args = parser.parse_args()
+
+    async def run():
+        provider = stub_provider(args.stub_latency) if args.stub else live_provider
+        service = AnalysisService(provider, args.max_concurrency, args.max_queue)
+        try:
+            await serve(args.host, args.port, service)
+        finally:
+            service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,7 @@
+import os
+import threading
+
 import streamlit as st
-import yfinance as yf
-from textblob import TextBlob
-import feedparser
-import re
-import pandas as pd
-import datetime
 
 st.set_page_config(page_title="📊 MarketMind", layout="centered", initial_sidebar_state="collapsed")
 
@@ -82,30 +79,43 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ----- Copy your helper functions from marketmind_v5_final.py -----
-# Include: extract_number, determine_sector, sector_benchmarks, get_news_sentiment, get_market_psychology, ai_summary_from_metrics
+# Include: Fundamentals, determine_sector, sector_benchmarks, get_news_sentiment, get_market_psychology, ai_summary_from_metrics
 
 # For demo: we'll simulate with a minimal version.
 from marketmind_v5_final import (
-    extract_number,
+    Fundamentals,
     determine_sector,
-    sector_benchmarks,
-    get_news_sentiment,
-    get_market_psychology,
-    ai_summary_from_metrics
+    GROWTH_RATE,
+    DISCOUNT_RATE,
+    intrinsic_value,
+    marketmind_score,
+    final_verdict,
+    ai_summary_from_metrics,
+    warm_up
 )
 
-# Sector Outlook Multiplier
-sector_outlook_map = {
-    "Renewable": 15,
-    "EV": 10,
-    "IT": 5,
-    "Banking": 0,
-    "FMCG": 0,
-    "Oil": -15,
-    "Coal": -15,
-    "Industrial": -10,
-    "Default": 0
-}
+# pandas, yfinance, TextBlob etc. load on a background thread after the first
+# paint, once per process, instead of blocking every cold start.
+@st.cache_resource
+def start_warm_up():
+    thread = threading.Thread(target=warm_up, daemon=True)
+    thread.start()
+    return thread
+
+# Precomputed analyses from snapshot.py, read once per process and again only
+# after a new build replaces the file; the previous build is evicted then
+@st.cache_resource(max_entries=1)
+def load_snapshot_cached(path, mtime):
+    from snapshot import load_snapshot
+
+    return load_snapshot(path)
+
+
+def current_snapshot():
+    from snapshot import SNAPSHOT_PATH
+
+    mtime = os.path.getmtime(SNAPSHOT_PATH) if os.path.exists(SNAPSHOT_PATH) else None
+    return load_snapshot_cached(SNAPSHOT_PATH, mtime)
 
 st.title("📊 MarketMind: Is Your Stock Pick Rational?")
 st.caption("Understand fundamentals, sentiment, and psychology in one click.")
@@ -119,179 +129,435 @@ with st.container():
             st.session_state["last_symbol"] = symbol if symbol.endswith(".NS") or symbol.endswith(".BSE") else symbol + ".NS"
         analyze = st.button("🚀 Analyze")
 
+start_warm_up()
+
 if analyze:
-    with st.spinner("Fetching data..."):
-        try:
-            ticker = yf.Ticker(st.session_state.get("last_symbol", symbol))
-            info = ticker.info
-            sector = determine_sector(info)
-
-            # Prepare report
-            report = {
-                "PE Ratio": str(info.get("trailingPE", "N/A")),
-                "ROE": str(info.get("returnOnEquity", 0) * 100) + "%" if info.get("returnOnEquity") else "N/A",
-                "EPS Growth": "N/A",
-                "Free Cash Flow": "N/A",
-                "Profit Margin": str(info.get("profitMargins", 0) * 100) + "%" if info.get("profitMargins") else "N/A",
-                "PB Ratio": str(info.get("priceToBook", "N/A")),
-            }
-
-            score = sum(
-                1 for v in report.values()
-                if v != "N/A" and extract_number(v) is not None and extract_number(v) > 0
-            )
-
-            eps = info.get("trailingEps")
-            current_price = info.get("currentPrice")
-
-            growth_rate = 0.15
-            discount_rate = 0.10
-
-            custom_sector_pe = {
-                "Power": 35,
-                "Infrastructure": 30,
-                "Renewable": 40,
-                "Default": 15
-            }
-            sector_pe = custom_sector_pe.get(sector, 15)
-
-            projected_eps = eps * ((1 + growth_rate) ** 5)
-            intrinsic = (projected_eps * sector_pe) / ((1 + discount_rate) ** 5)
-
-            verdict = "✅ Undervalued" if intrinsic > current_price else "❌ Overvalued"
+    import pandas as pd
+    import altair as alt
+    from pipeline import (
+        fetch_inputs, psychology_from_inputs, sentiment_from_inputs, alert_from_inputs, PAGE_BUDGET, PENDING, STALE,
+    )
+    from valuation import sensitivity_frame, monte_carlo, DRAWS
+    from instrumentation import span, trace, format_table, snapshot
+    from sector_index import get_sector_index, sector_benchmark, valuation_pe
+
+    target = st.session_state.get("last_symbol", symbol)
+    with trace() as spans:
+        # A fresh snapshot row stands in for the three fetches, sentiment and
+        # psychology; everything derived from it below is recomputed as usual
+        cached = None
+        with span("snapshot.lookup"):
+            try:
+                cached = current_snapshot().lookup(target)
+            except Exception:
+                cached = None
+
+        inputs = None
+        if cached is None:
+            with st.spinner("Fetching data..."):
+                try:
+                    inputs = fetch_inputs(target, budget=PAGE_BUDGET)
+                except Exception as e:
+                    st.error(f"Error: {e}")
+        else:
+            inputs = {"symbol": target, "errors": {}, "status": {}}
+            st.caption(f"⚡ From the precomputed snapshot ({cached['age_s'] / 3600:.1f}h old).")
+
+        if inputs is not None:
+            # Sources that missed their deadline render as pending or from cache
+            status = inputs["status"]
+            source_names = {"info": "fundamentals", "history": "price history", "news": "news"}
+            pending = [source_names[n] for n, state in status.items() if state == PENDING]
+            stale = [source_names[n] for n, state in status.items() if state == STALE]
+            if pending:
+                st.info(f"⏳ Still loading: {', '.join(pending)}. Click Analyze again in a moment for the full picture.")
+            if stale:
+                st.caption(f"🕰️ Showing cached {', '.join(stale)} — the live source was slow or unavailable.")
+
+            # Fundamentals feed three tabs; each tab degrades on its own below
+            report = None
+            fundamentals_error = inputs["errors"].get("info")
+            if fundamentals_error is None:
+                try:
+                    if cached is not None:
+                        sector = cached["sector"]
+                        report = Fundamentals(**cached["fundamentals"])
+                    else:
+                        info = inputs["info"]
+                        sector = determine_sector(info)
+                        report = Fundamentals.from_info(info)
+                    score = report.score()
+                except Exception as e:
+                    fundamentals_error = e
+
+            valuation_error = None
+            valuation_missing = False
+            verdict = "N/A"
+            if report is not None:
+                eps = report.eps
+                current_price = report.price
+                valuation_missing = eps is None or current_price is None
+            if report is not None and not valuation_missing:
+                try:
+                    growth_rate = GROWTH_RATE
+                    discount_rate = DISCOUNT_RATE
+
+                    sector_pe = valuation_pe(sector)
+
+                    projected_eps, intrinsic = intrinsic_value(eps, sector_pe, growth_rate, discount_rate)
+
+                    verdict = "✅ Undervalued" if intrinsic > current_price else "❌ Overvalued"
+                except Exception as e:
+                    valuation_error = e
+            if report is not None:
+                base_score, adjusted_score = marketmind_score(score, verdict, sector)
+
+            if cached is not None:
+                sentiment, headlines = cached["sentiment"], cached["headlines"]
+            else:
+                sentiment, headlines = sentiment_from_inputs(inputs)
+
+            if status.get("info") == PENDING:
+                fundamentals_notice = (st.info, "⏳ Fundamentals are still loading.")
+            else:
+                fundamentals_notice = (st.error, f"Fundamentals unavailable: {fundamentals_error}")
 
             tabs = st.tabs(["Overview", "Valuation", "Sentiment", "Recommendation"])
 
-            with tabs[0]:  # Overview
-                st.header("📊 Fundamental Report")
-                for k, v in report.items():
-                    if v == "N/A":
-                        continue
-                    icon = "✅" if ("%" in v and "-" not in v) or ("Cr" in v and "-" not in v) or extract_number(v) > 0 else "❌"
-                    st.markdown(f"<span style='font-size:16px'><strong>{k}:</strong> {v} {icon}</span>", unsafe_allow_html=True)
-                st.markdown(f"**Final Score:** {score}/6")
-                if score >= 5:
-                    st.markdown("🏅 <strong>Top Fundamental Pick</strong>", unsafe_allow_html=True)
-                elif score == 4:
-                    st.markdown("👀 <strong>Watchlist Potential</strong>", unsafe_allow_html=True)
+            with tabs[0], span("render.overview"):  # Overview
+                if report is None:
+                    fundamentals_notice[0](fundamentals_notice[1])
                 else:
-                    st.markdown("⚠️ <strong>High Risk Zone</strong>", unsafe_allow_html=True)
-
-                sector_icon_map = {
-                    "Power": "🔌", "Oil": "🛢️", "IT": "💻", "Banking": "🏦", "FMCG": "🛍️", 
-                    "Renewable": "🌿", "Coal": "⛏️", "Infrastructure": "🏗️", "Default": "📦"
-                }
-                st.markdown(f"**Sector:** {sector_icon_map.get(sector, '📦')} {sector}")
-
-                if report["PE Ratio"] != "N/A" and report["PB Ratio"] != "N/A":
-                    sector_avg = sector_benchmarks.get(sector, sector_benchmarks["Default"])
-                    pe_df = pd.DataFrame({
-                        "P/E": [extract_number(report["PE Ratio"]), sector_avg["PE"]],
-                    }, index=["This Stock", "Sector Avg"])
-                    pb_df = pd.DataFrame({
-                        "P/B": [extract_number(report["PB Ratio"]), sector_avg["PB"]],
-                    }, index=["This Stock", "Sector Avg"])
-
-                    st.markdown("**P/E Comparison**")
-                    st.bar_chart(pe_df)
-
-                    st.markdown("**P/B Comparison**")
-                    st.bar_chart(pb_df)
-
-                st.header("🧠 AI Summary")
-                st.write(ai_summary_from_metrics(report, score, sector))
-
-                sector_outlook = sector_outlook_map.get(sector, 0)
-                base_score = score * 15 + (25 if '✅ Undervalued' in (locals().get('verdict', '') or '') else 10)
-                adjusted_score = min(100, max(0, base_score + sector_outlook))
-
-                st.markdown("### 📈 MarketMind Score", unsafe_allow_html=True)
-                st.markdown(f"<h4 style='color:#00ffcc'>🔢 Base Score: <strong>{base_score}/100</strong></h4>", unsafe_allow_html=True)
-                st.markdown(f"<h4 style='color:#33ff99'>🌍 Sector Outlook Applied: <strong>{adjusted_score}/100</strong></h4>", unsafe_allow_html=True)
-                st.progress(int(adjusted_score))
-
-            with tabs[1]:  # Valuation
-                st.header("💰 Valuation Analysis")
-
-                st.markdown(f"- EPS Used: ₹{eps}")
-                st.markdown(f"- Sector PE Used: {sector_pe}")
-                st.markdown(f"- Growth Rate Assumption: {growth_rate * 100}%")
-                st.markdown(f"- Discount Rate Assumption: {discount_rate * 100}%")
-
-                if intrinsic > current_price * 5:
-                    st.warning("⚠️ Intrinsic value is unusually high — check EPS or growth assumptions.")
-                if intrinsic < current_price * 0.3:
-                    st.warning("⚠️ Intrinsic value is far below market price. This may be a high-growth stock or valuation assumptions may need review.")
-
-                st.markdown(f"- Projected EPS (5yr): ₹{projected_eps:.2f}")
-                st.markdown(f"- Intrinsic Value: ₹{intrinsic:.2f}")
-                st.markdown(f"- Current Price: ₹{current_price}")
-                st.markdown(f"- **{verdict}**")
-
-                st.markdown("### 🔍 Raw Valuation Inputs")
-                st.json({
-                    "EPS": eps,
-                    "Sector PE": sector_pe,
-                    "Growth Rate": growth_rate,
-                    "Discount Rate": discount_rate,
-                    "Projected EPS (5yr)": projected_eps,
-                    "Intrinsic Value": intrinsic,
-                    "Current Price": current_price
-                })
-
-            with tabs[2]:  # Sentiment
+                    try:
+                        st.header("📊 Fundamental Report")
+                        for k, v, positive in report.display_items():
+                            icon = "✅" if positive else "❌"
+                            st.markdown(f"<span style='font-size:16px'><strong>{k}:</strong> {v} {icon}</span>", unsafe_allow_html=True)
+                        st.markdown(f"**Final Score:** {score}/6")
+                        if score >= 5:
+                            st.markdown("🏅 <strong>Top Fundamental Pick</strong>", unsafe_allow_html=True)
+                        elif score == 4:
+                            st.markdown("👀 <strong>Watchlist Potential</strong>", unsafe_allow_html=True)
+                        else:
+                            st.markdown("⚠️ <strong>High Risk Zone</strong>", unsafe_allow_html=True)
+
+                        sector_icon_map = {
+                            "Power": "🔌", "Oil": "🛢️", "IT": "💻", "Banking": "🏦", "FMCG": "🛍️", 
+                            "Renewable": "🌿", "Coal": "⛏️", "Infrastructure": "🏗️", "Default": "📦"
+                        }
+                        st.markdown(f"**Sector:** {sector_icon_map.get(sector, '📦')} {sector}")
+
+                        if report.pe is not None and report.pb is not None:
+                            sector_avg = sector_benchmark(sector)
+                            pe_df = pd.DataFrame({
+                                "P/E": [report.pe, sector_avg["PE"]],
+                            }, index=["This Stock", "Sector Avg"])
+                            pb_df = pd.DataFrame({
+                                "P/B": [report.pb, sector_avg["PB"]],
+                            }, index=["This Stock", "Sector Avg"])
+
+                            st.markdown("**P/E Comparison**")
+                            st.bar_chart(pe_df)
+
+                            st.markdown("**P/B Comparison**")
+                            st.bar_chart(pb_df)
+
+                            pe_rank = get_sector_index().percentile_rank(sector, "PE", report.pe)
+                            if pe_rank is not None:
+                                st.caption(f"P/E is above {pe_rank:.0f}% of {sector} peers in the local universe.")
+
+                        st.header("🧠 AI Summary")
+                        st.write(ai_summary_from_metrics(report, score, sector, sector_benchmark(sector)))
+
+                        st.markdown("### 📈 MarketMind Score", unsafe_allow_html=True)
+                        st.markdown(f"<h4 style='color:#00ffcc'>🔢 Base Score: <strong>{base_score}/100</strong></h4>", unsafe_allow_html=True)
+                        st.markdown(f"<h4 style='color:#33ff99'>🌍 Sector Outlook Applied: <strong>{adjusted_score}/100</strong></h4>", unsafe_allow_html=True)
+                        st.progress(int(adjusted_score))
+                    except Exception as e:
+                        st.error(f"Overview unavailable: {e}")
+
+            with tabs[1], span("render.valuation"):  # Valuation
+                if report is None:
+                    fundamentals_notice[0](fundamentals_notice[1])
+                elif valuation_missing:
+                    st.header("💰 Valuation Analysis")
+                    st.info("Valuation Verdict: N/A (missing EPS or price)")
+                elif valuation_error is not None:
+                    st.error(f"Valuation unavailable: {valuation_error}")
+                else:
+                    try:
+                        st.header("💰 Valuation Analysis")
+
+                        st.markdown(f"- EPS Used: ₹{eps}")
+                        st.markdown(f"- Sector PE Used: {sector_pe}")
+                        st.markdown(f"- Growth Rate Assumption: {growth_rate * 100}%")
+                        st.markdown(f"- Discount Rate Assumption: {discount_rate * 100}%")
+
+                        if intrinsic > current_price * 5:
+                            st.warning("⚠️ Intrinsic value is unusually high — check EPS or growth assumptions.")
+                        if intrinsic < current_price * 0.3:
+                            st.warning("⚠️ Intrinsic value is far below market price. This may be a high-growth stock or valuation assumptions may need review.")
+
+                        st.markdown(f"- Projected EPS (5yr): ₹{projected_eps:.2f}")
+                        st.markdown(f"- Intrinsic Value: ₹{intrinsic:.2f}")
+                        st.markdown(f"- Current Price: ₹{current_price}")
+                        st.markdown(f"- **{verdict}**")
+
+                        st.markdown("### 🔍 Raw Valuation Inputs")
+                        st.json({
+                            "EPS": eps,
+                            "Sector PE": sector_pe,
+                            "Growth Rate": growth_rate,
+                            "Discount Rate": discount_rate,
+                            "Projected EPS (5yr)": projected_eps,
+                            "Intrinsic Value": intrinsic,
+                            "Current Price": current_price
+                        })
+
+                        st.markdown("### 🌡️ Sensitivity: Growth × Discount Rate")
+                        grid = sensitivity_frame(eps, sector_pe)
+                        heat = grid.stack().rename("Intrinsic Value").reset_index()
+                        heatmap = alt.Chart(heat).mark_rect().encode(
+                            x=alt.X("Discount Rate (%):O"),
+                            y=alt.Y("Growth Rate (%):O", sort="descending"),
+                            color=alt.Color("Intrinsic Value:Q", scale=alt.Scale(scheme="redyellowgreen", domainMid=current_price)),
+                            tooltip=["Growth Rate (%)", "Discount Rate (%)", alt.Tooltip("Intrinsic Value:Q", format=",.2f")],
+                        )
+                        st.altair_chart(heatmap)
+                        st.caption(f"Green cells are above the current price of ₹{current_price}.")
+
+                        st.markdown(f"### 🎲 Monte Carlo ({DRAWS:,} scenarios)")
+                        mc = monte_carlo(eps, sector_pe, current_price).iloc[0]
+                        st.markdown(
+                            f"- Intrinsic Value P5 / P50 / P95: ₹{mc['p5']:.2f} / ₹{mc['p50']:.2f} / ₹{mc['p95']:.2f}\n"
+                            f"- Probability Undervalued: {mc['prob_undervalued'] * 100:.1f}%"
+                        )
+                    except Exception as e:
+                        st.error(f"Valuation unavailable: {e}")
+
+            with tabs[2], span("render.sentiment"):  # Sentiment
                 st.header("🧠 Market Psychology")
-                st.write(get_market_psychology(st.session_state.get("last_symbol", symbol)))
-
-                # ----- Behavioral Alert -----
-                history = ticker.history(period="7d")
-                price_change = None
-                if not history.empty:
-                    closing_prices = history["Close"]
-                    volume = history["Volume"]
-                    price_change = (closing_prices.iloc[-1] - closing_prices.iloc[0]) / closing_prices.iloc[0] * 100
-                    latest_volume = volume.iloc[-1]
-                    avg_volume = volume.mean()
-
-                    st.markdown("### 📉 Behavioral Alert")
-                    if price_change and abs(price_change) > 7:
-                        if price_change > 0:
-                            st.warning(f"🚨 FOMO Alert: Stock rose {price_change:.2f}% in the last week.")
+                if status.get("history") == PENDING:
+                    st.info("⏳ Price history is still loading.")
+                else:
+                    try:
+                        if cached is not None:
+                            psychology, alert, price_change = cached["psychology"], cached["alert"], cached["alert_change"]
                         else:
-                            st.warning(f"😨 Panic Risk: Stock dropped {price_change:.2f}% in the last week.")
-                    elif latest_volume > 1.5 * avg_volume:
-                        st.info("⚠️ Sudden spike in trading volume — watch for sentiment shift.")
-                    else:
-                        st.info("🧘 Calm Market: No significant emotional signals detected.")
+                            psychology = psychology_from_inputs(inputs)
+                            alert, price_change = alert_from_inputs(inputs)
+                        st.write(psychology)
+
+                        # ----- Behavioral Alert -----
+                        if alert is not None:
+                            st.markdown("### 📉 Behavioral Alert")
+                            if alert == "fomo":
+                                st.warning(f"🚨 FOMO Alert: Stock rose {price_change:.2f}% in the last week.")
+                            elif alert == "panic":
+                                st.warning(f"😨 Panic Risk: Stock dropped {price_change:.2f}% in the last week.")
+                            elif alert == "volume_spike":
+                                st.info("⚠️ Sudden spike in trading volume — watch for sentiment shift.")
+                            else:
+                                st.info("🧘 Calm Market: No significant emotional signals detected.")
+                    except Exception as e:
+                        st.error(f"Market psychology unavailable: {e}")
 
                 st.header("📰 News Sentiment")
-                sentiment, headlines = get_news_sentiment(st.session_state.get("last_symbol", symbol))
-                st.markdown(f"**Sentiment:** {sentiment}")
-                for h in headlines:
-                    st.markdown(f"🔹 <span style='font-size:16px'>{h}</span>", unsafe_allow_html=True)
+                if status.get("news") == PENDING:
+                    st.info("⏳ News is still loading.")
+                else:
+                    st.markdown(f"**Sentiment:** {sentiment}")
+                    for h in headlines:
+                        st.markdown(f"🔹 <span style='font-size:16px'>{h}</span>", unsafe_allow_html=True)
 
-            with tabs[3]:  # Recommendation
+            with tabs[3], span("render.recommendation"):  # Recommendation
                 st.header("🎯 MarketMind Verdict (Smart Summary Mode)")
-                if score >= 5 and '✅ Undervalued' in verdict and "🟢 Positive sentiment" in sentiment:
-                    st.success("✅ Strong Buy: Undervalued with solid fundamentals and positive sentiment.")
-                elif score >= 4 and '✅ Undervalued' in verdict:
-                    st.success("✅ Likely Buy: Good fundamentals, undervaluation detected.")
-                elif score >= 4 and '❌ Overvalued' in verdict:
-                    st.info("💡 Consider for Growth Portfolio: Strong fundamentals but currently expensive.")
-                elif score >= 3:
-                    st.warning("⚠️ Watch: Fundamentals are average. Further confirmation needed.")
+                if report is None:
+                    fundamentals_notice[0](fundamentals_notice[1])
                 else:
-                    st.error("❌ Avoid: Weak fundamentals or high valuation.")
+                    if status.get("news") == PENDING:
+                        st.caption("⏳ News sentiment is still loading and is not part of this verdict yet.")
+                    if score >= 5 and '✅ Undervalued' in verdict and "🟢 Positive sentiment" in sentiment:
+                        st.success("✅ Strong Buy: Undervalued with solid fundamentals and positive sentiment.")
+                    elif score >= 4 and '✅ Undervalued' in verdict:
+                        st.success("✅ Likely Buy: Good fundamentals, undervaluation detected.")
+                    elif score >= 4 and '❌ Overvalued' in verdict:
+                        st.info("💡 Consider for Growth Portfolio: Strong fundamentals but currently expensive.")
+                    elif score >= 3:
+                        st.warning("⚠️ Watch: Fundamentals are average. Further confirmation needed.")
+                    else:
+                        st.error("❌ Avoid: Weak fundamentals or high valuation.")
+
+                    final = final_verdict(adjusted_score)
+                    if final == "BUY":
+                        st.success("✅ **Final Verdict: BUY** — Strong fundamentals and undervaluation. 🟢")
+                    elif final == "WATCH":
+                        st.info("⏳ **Final Verdict: WATCH** — Decent fundamentals, needs confirmation. 🟡")
+                    else:
+                        st.error("❌ **Final Verdict: AVOID** — Weak fundamentals or poor outlook. 🔴")
+
+        with st.expander("🛠️ Debug: stage timings"):
+            st.markdown("**This analysis**")
+            st.code(format_table(spans) or "no spans recorded", language=None)
+            st.markdown("**Process-wide p50 / p99**")
+            st.code(format_table(), language=None)
+            metrics = snapshot()
+            st.json({"counters": metrics["counters"], "gauges": metrics["gauges"]}, expanded=False)
+
+# ---------------- Comparison Mode ----------------
+def comparison_row(result):
+    # One analysis_report (live or from the snapshot) -> one row of the side-by-side table
+    errors = result.get("errors", {})
+    if "score" not in result:
+        state = f"⚠️ {next(iter(errors.values()))}" if errors else "⏳ loading"
+        return {"Symbol": result["symbol"], "Status": state}
+    fundamentals = result["fundamentals"]
+    pending = [name for name, state in result.get("status", {}).items() if state != "fresh"]
+    return {
+        "Symbol": result["symbol"],
+        "Sector": result["sector"],
+        "Score": f"{result['score']}/6",
+        "P/E": fundamentals["pe"],
+        "P/B": fundamentals["pb"],
+        "ROE %": fundamentals["roe"],
+        "Margin %": fundamentals["margin"],
+        "Valuation": result["valuation"]["verdict"],
+        "MarketMind": result["adjusted_score"],
+        "Verdict": result["final_verdict"],
+        "Sentiment": result["sentiment"],
+        "Psychology": result["psychology"].replace("🧠 Market Psychology: ", ""),
+        "Status": f"⏳ {', '.join(pending)}" if pending else "✅",
+    }
 
-                if adjusted_score >= 80:
-                    st.success("✅ **Final Verdict: BUY** — Strong fundamentals and undervaluation. 🟢")
-                elif adjusted_score >= 60:
-                    st.info("⏳ **Final Verdict: WATCH** — Decent fundamentals, needs confirmation. 🟡")
+
+st.markdown("---")
+st.subheader("⚖️ Compare Stocks")
+compare_picks = st.multiselect("Pick stocks to compare:", stock_options, default=stock_options[:3])
+compare_extra = st.text_input("➕ More symbols (comma-separated):", "")
+compare = st.button("⚖️ Compare")
+
+if compare:
+    import pandas as pd
+    from pipeline import analyze_many, normalize_symbol, MAX_COMPARE
+    from instrumentation import span
+
+    symbols = list(dict.fromkeys(
+        normalize_symbol(s) for s in compare_picks + compare_extra.split(",") if s.strip()
+    ))
+    if len(symbols) > MAX_COMPARE:
+        st.warning(f"Comparing the first {MAX_COMPARE} of {len(symbols)} symbols.")
+        symbols = symbols[:MAX_COMPARE]
+
+    if not symbols:
+        st.info("Pick at least one stock to compare.")
+    else:
+        # Placeholders are filled in again as each symbol completes instead of
+        # blocking the page behind one spinner until the slowest is done
+        progress_slot = st.empty()
+        table_slot = st.empty()
+        pe_slot = st.empty()
+        pb_slot = st.empty()
+        rows = {symbol: comparison_row({"symbol": symbol}) for symbol in symbols}
+
+        def render_comparison(done):
+            frame = pd.DataFrame(list(rows.values())).set_index("Symbol")
+            progress_slot.progress(done / len(symbols), text=f"{done}/{len(symbols)} analyzed")
+            table_slot.dataframe(frame)
+            for slot, column in ((pe_slot, "P/E"), (pb_slot, "P/B")):
+                values = frame[column].dropna() if column in frame else []
+                if len(values):
+                    with slot.container():
+                        st.markdown(f"**{column} Comparison**")
+                        st.bar_chart(values)
+
+        with span("compare"):
+            # Symbols in a fresh snapshot show up at once; the rest are analyzed live
+            try:
+                snapshot_now = current_snapshot()
+            except Exception:
+                snapshot_now = None
+            live = []
+            for symbol in symbols:
+                cached = snapshot_now.lookup(symbol) if snapshot_now is not None else None
+                if cached is not None:
+                    rows[symbol] = comparison_row(cached)
                 else:
-                    st.error("❌ **Final Verdict: AVOID** — Weak fundamentals or poor outlook. 🔴")
+                    live.append(symbol)
+            done = len(symbols) - len(live)
+            render_comparison(done)
+
+            for result in analyze_many(live):
+                rows[result["symbol"]] = comparison_row(result)
+                done += 1
+                render_comparison(done)
+        progress_slot.empty()
 
+# ---------------- Portfolio Mode ----------------
+st.markdown("---")
+st.subheader("💼 Portfolio Check")
+holdings_file = st.file_uploader("Upload holdings CSV (symbol, quantity or weight):", type="csv")
+refresh_portfolio = st.checkbox("Fetch a year of prices and missing fundamentals first (slower)")
+check_portfolio = st.button("💼 Analyze Portfolio")
+
+if check_portfolio:
+    if holdings_file is None:
+        st.info("Upload a holdings CSV first.")
+    else:
+        import altair as alt
+        from portfolio import read_holdings, analyze_portfolio
+        from instrumentation import span
+
+        try:
+            with st.spinner("Analyzing portfolio..."), span("portfolio"):
+                result = analyze_portfolio(read_holdings(holdings_file), refresh=refresh_portfolio)
         except Exception as e:
-            st.error(f"Error: {e}")
+            st.error(f"Portfolio analysis failed: {e}")
+            result = None
+
+        if result is not None:
+            summary, table = result["summary"], result["holdings"]
+            st.caption(f"{summary['holdings']} holdings • prices for {summary['with_prices']} • "
+                       f"fundamentals for {summary['with_fundamentals']} • as of {summary['as_of']}")
+
+            cols = st.columns(4)
+            score = summary["weighted_score"]
+            cols[0].metric("MarketMind Score", f"{score:.0f}/100" if score is not None else "N/A",
+                           summary["weighted_verdict"], delta_color="off")
+            cols[1].metric("Volatility (1y)", f"{summary['portfolio_volatility'] * 100:.1f}%")
+            corr = summary["weighted_avg_correlation"]
+            cols[2].metric("Avg Correlation", f"{corr:.2f}" if corr is not None else "N/A")
+            cols[3].metric("Effective Holdings", f"{summary['effective_holdings']:.1f}" if summary["effective_holdings"] else "N/A",
+                           f"top 10 = {summary['top10_weight'] * 100:.0f}%", delta_color="off")
+
+            flagged = table[table["flag"].notna()].sort_values("weight", ascending=False)
+            if len(flagged):
+                st.markdown("### 🚨 Panic / FOMO Holdings")
+                for symbol, row in flagged.head(10).iterrows():
+                    icon = "😨 Panic" if row["flag"] == "panic" else "🚀 FOMO"
+                    st.warning(f"{icon}: {symbol} ({row['weight'] * 100:.1f}% of the book) — "
+                               f"1-month {row['psychology']}, 7-day {row['alert']}")
+                if len(flagged) > 10:
+                    st.caption(f"…and {len(flagged) - 10} more in the table below.")
+            else:
+                st.success("🧘 No holding shows panic or FOMO signals.")
+
+            st.markdown("### 🏭 Sector Weights")
+            st.bar_chart(result["sectors"].rename("Weight"))
+
+            st.markdown("### 📋 Holdings")
+            st.dataframe(table.sort_values("weight", ascending=False))
+
+            # The heatmap stays readable with the largest positions only
+            top = table["weight"].sort_values(ascending=False).index[:25]
+            heat = (result["correlation"].loc[top, top].rename_axis(index="A", columns="B")
+                    .stack().rename("Correlation").reset_index())
+            st.markdown(f"### 🔗 Return Correlation (top {len(top)} positions)")
+            st.altair_chart(alt.Chart(heat).mark_rect().encode(
+                x=alt.X("A:N", sort=list(top), title=None),
+                y=alt.Y("B:N", sort=list(top), title=None),
+                color=alt.Color("Correlation:Q", scale=alt.Scale(scheme="redblue", domain=[-1, 1], reverse=True)),
+                tooltip=["A", "B", alt.Tooltip("Correlation:Q", format=".2f")],
+            ))
 
 st.markdown("---")
 st.caption("Made by MarketMind Insights • Smart Investing for Everyone")
\ No newline at end of file
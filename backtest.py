@@ -0,0 +1,177 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from psychology import psychology_regimes
+from screener import screen_universe, buy_scores
+
+# Local fixture layout:
+#   <data_dir>/prices/<SYMBOL>.csv|.parquet   Date, Open, High, Low, Close, Volume
+#   <data_dir>/fundamentals.csv|.parquet      date, symbol, sector, trailingEps,
+#                                             returnOnEquity, profitMargins, bookValue
+# Fundamentals rows are point-in-time snapshots; P/E and P/B are recomputed from
+# the rebalance-date close so no future price leaks into the score.
+HORIZONS = (21, 63, 126)
+
+
+# ---------------- Fixture Loading ----------------
+def _read_table(path):
+    return pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+
+
+def _find(directory, name):
+    for ext in (".parquet", ".csv"):
+        path = os.path.join(directory, name + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_prices(data_dir, symbol):
+    frame = _read_table(_find(os.path.join(data_dir, "prices"), symbol))
+    frame["Date"] = pd.to_datetime(frame["Date"], utc=True).dt.tz_localize(None)
+    return frame.set_index("Date").sort_index()
+
+
+def load_fundamentals(data_dir):
+    frame = _read_table(_find(data_dir, "fundamentals"))
+    frame["date"] = pd.to_datetime(frame["date"])
+    return frame.sort_values("date")
+
+
+def list_symbols(data_dir):
+    names = os.listdir(os.path.join(data_dir, "prices"))
+    return sorted({os.path.splitext(n)[0] for n in names if n.endswith((".csv", ".parquet"))})
+
+
+# ---------------- Per-Symbol Replay (worker) ----------------
+def replay_symbol(data_dir, symbol, fundamentals, rebalance_dates, horizons=HORIZONS,
+                  risk="Low", horizon="3+ Years"):
+    prices = load_prices(data_dir, symbol)
+    if prices.empty or fundamentals.empty:
+        return None
+
+    close = prices["Close"].to_numpy(dtype=float)
+    # Last trading session on or before each rebalance date
+    pos = prices.index.searchsorted(rebalance_dates, side="right") - 1
+    keep = pos >= 0
+    pos = pos[keep]
+    dates = prices.index[pos]
+
+    snapshots = pd.merge_asof(
+        pd.DataFrame({"date": dates}),
+        fundamentals.drop(columns="symbol"),
+        on="date",
+        direction="backward",
+    )
+    price = close[pos]
+    eps = pd.to_numeric(snapshots.get("trailingEps"), errors="coerce").to_numpy(dtype=float)
+    book = pd.to_numeric(snapshots.get("bookValue"), errors="coerce").to_numpy(dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rows = pd.DataFrame({
+            "trailingPE": np.where(eps > 0, price / eps, np.nan),
+            "returnOnEquity": snapshots.get("returnOnEquity"),
+            "profitMargins": snapshots.get("profitMargins"),
+            "priceToBook": np.where(book > 0, price / book, np.nan),
+            "trailingEps": eps,
+            "currentPrice": price,
+            "sector": snapshots.get("sector"),
+        })
+    # Static sector tables on purpose: today's peer medians would leak into the
+    # scores of past rebalance dates
+    scored = screen_universe(rows)
+    scored.insert(0, "date", dates)
+    scored.insert(0, "symbol", symbol)
+    scored["buy_score"] = buy_scores(scored["score"], scored["verdict"], risk, horizon)
+    scored["regime"] = psychology_regimes(prices)["regime"].to_numpy()[pos]
+
+    for h in horizons:
+        ahead = pos + h
+        forward = np.full(len(pos), np.nan)
+        valid = ahead < len(close)
+        forward[valid] = close[ahead[valid]] / close[pos[valid]] - 1
+        scored[f"fwd_{h}d"] = forward
+
+    return scored.reset_index(drop=True)
+
+
+def _replay_worker(args):
+    return replay_symbol(*args)
+
+
+# ---------------- Backtest Driver ----------------
+def run_backtest(data_dir, start, end, freq="MS", horizons=HORIZONS, symbols=None,
+                 workers=None, risk="Low", horizon="3+ Years"):
+    fundamentals = load_fundamentals(data_dir)
+    symbols = symbols or list_symbols(data_dir)
+    rebalance_dates = pd.date_range(start, end, freq=freq)
+    by_symbol = dict(tuple(fundamentals.groupby("symbol")))
+
+    jobs = [
+        (data_dir, symbol, by_symbol.get(symbol, fundamentals.iloc[:0]), rebalance_dates, horizons, risk, horizon)
+        for symbol in symbols
+    ]
+    frames = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_replay_worker, job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            if result is not None and not result.empty:
+                frames.append(result)
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True).sort_values(["date", "symbol"], ignore_index=True)
+
+
+def summarize(results, horizons=HORIZONS, by="final_verdict"):
+    # Forward return statistics per verdict bucket
+    agg = {}
+    for h in horizons:
+        col = f"fwd_{h}d"
+        agg[f"mean_{h}d"] = (col, "mean")
+        agg[f"median_{h}d"] = (col, "median")
+        agg[f"hit_rate_{h}d"] = (col, lambda r: (r.dropna() > 0).mean())
+    agg["observations"] = ("symbol", "size")
+    return results.groupby(by, observed=True).agg(**agg)
+
+
+def buy_score_buckets(results, bins=(0, 40, 60, 80, 101)):
+    return results.assign(buy_bucket=pd.cut(results["buy_score"], bins=bins, right=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay MarketMind verdicts over historical fixtures.")
+    parser.add_argument("data_dir")
+    parser.add_argument("--start", required=True)
+    parser.add_argument("--end", required=True)
+    parser.add_argument("--freq", default="MS", help="pandas offset alias for rebalance dates")
+    parser.add_argument("--horizons", default=",".join(str(h) for h in HORIZONS),
+                        help="forward return horizons in trading sessions")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--risk", default="Low")
+    parser.add_argument("--horizon", default="3+ Years")
+    parser.add_argument("--out", help="write per-symbol, per-date rows to this CSV")
+    args = parser.parse_args()
+
+    horizons = tuple(int(h) for h in args.horizons.split(","))
+    results = run_backtest(args.data_dir, args.start, args.end, args.freq, horizons,
+                           workers=args.workers, risk=args.risk, horizon=args.horizon)
+    if results.empty:
+        print("No results: check the fixture directory and date range.")
+        return
+    if args.out:
+        results.to_csv(args.out, index=False)
+
+    print("\n📊 Forward returns by MarketMind verdict")
+    print(summarize(results, horizons).to_string(float_format=lambda x: f"{x:.4f}"))
+    print("\n✅ Forward returns by advice buy score")
+    print(summarize(buy_score_buckets(results), horizons, by="buy_bucket").to_string(float_format=lambda x: f"{x:.4f}"))
+
+
+if __name__ == "__main__":
+    main()
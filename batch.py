@@ -0,0 +1,232 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+# Nightly analysis of a whole symbol list. Symbols are fanned out over a process
+# pool and every result is appended to the output as soon as it finishes, so the
+# output file doubles as the checkpoint: a rerun skips the symbols already in it.
+FORMATS = ("jsonl", "csv")
+IN_FLIGHT_PER_WORKER = 4    # queued symbols per process; keeps Ctrl-C and memory bounded
+
+CSV_FIELDS = (
+    "symbol", "analyzed_at", "sector", "score", "pe", "roe", "eps_growth", "fcf", "margin", "pb",
+    "eps", "current_price", "intrinsic_value", "valuation_verdict", "base_score", "adjusted_score",
+    "final_verdict", "buy_score", "psychology", "alert", "sentiment", "headlines", "errors",
+)
+
+
+# ---------------- Symbols ----------------
+def read_symbols(path):
+    # One symbol per line (a CSV's first column works too); '#' starts a comment.
+    # Duplicates are dropped so no two processes ever write the same symbol's files.
+    from pipeline import normalize_symbol
+
+    symbols = []
+    with open(path) as f:
+        for line in f:
+            symbol = line.split("#", 1)[0].split(",", 1)[0].strip()
+            if symbol and symbol.lower() != "symbol":
+                symbols.append(normalize_symbol(symbol))
+    return list(dict.fromkeys(symbols))
+
+
+# ---------------- Worker ----------------
+def _init_worker(workers):
+    # Every process has its own gateway; split the upstream rate limits between
+    # them so the pool as a whole stays within what one process is allowed
+    from gateway import get_gateway
+
+    gateway = get_gateway()
+    gateway.limits.update({
+        name: (rate / workers, max(1, burst // workers)) for name, (rate, burst) in gateway.limits.items()
+    })
+
+
+def analyze_symbol(symbol, risk="Low", horizon="3+ Years"):
+    from marketmind_v5_final import compute_buy_score
+    from pipeline import fetch_inputs, analysis_report
+
+    try:
+        result = analysis_report(fetch_inputs(symbol))
+    except Exception as e:
+        result = {"symbol": symbol, "errors": {"analysis": str(e)}}
+    if "score" in result:
+        result["buy_score"] = compute_buy_score(result["score"], result["valuation"]["verdict"], risk, horizon)
+    result["analyzed_at"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    return result
+
+
+# ---------------- Output & Checkpoint ----------------
+def _plain(value):
+    # NumPy scalars from the valuation/psychology helpers
+    item = getattr(value, "item", None)
+    return item() if item else str(value)
+
+
+def csv_row(result):
+    valuation = result.get("valuation", {})
+    row = dict(result.get("fundamentals", {}))
+    row.update(
+        {key: result.get(key) for key in CSV_FIELDS if key in result},
+        current_price=valuation.get("current_price"),
+        eps=valuation.get("eps"),
+        intrinsic_value=valuation.get("intrinsic_value"),
+        valuation_verdict=valuation.get("verdict"),
+        headlines=" | ".join(result.get("headlines") or []),
+        errors="; ".join(f"{k}: {v}" for k, v in result.get("errors", {}).items()),
+    )
+    return row
+
+
+def completed(path, fmt):
+    # Symbols an earlier run finished without errors. A row torn by a crash
+    # mid-write is cut off, and rows with errors are dropped from the file, so
+    # the rerun retries those symbols and its rows replace them instead of
+    # appending duplicates.
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb") as f:
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    text = data[:end].decode("utf-8")
+
+    if fmt == "jsonl":
+        lines = [line for line in text.splitlines(keepends=True) if line.strip()]
+        kept = [line for line in lines if not json.loads(line).get("errors")]
+        done = {json.loads(line)["symbol"] for line in kept}
+        if end < len(data) or len(kept) < len(lines):
+            _rewrite(path, "".join(kept))
+        return done
+
+    reader = csv.DictReader(io.StringIO(text, newline=""))
+    rows = list(reader)
+    kept = [row for row in rows if not row.get("errors")]
+    if end < len(data) or len(kept) < len(rows):
+        out = io.StringIO(newline="")
+        if reader.fieldnames:
+            writer = csv.DictWriter(out, fieldnames=reader.fieldnames)
+            writer.writeheader()
+            writer.writerows(kept)
+        _rewrite(path, out.getvalue())
+    return {row["symbol"] for row in kept}
+
+
+def _rewrite(path, text):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class RowWriter:
+    def __init__(self, out, fmt):
+        self.out = out
+        self.fmt = fmt
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(out, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            if not out.seekable() or out.tell() == 0:
+                self._csv.writeheader()
+
+    def write(self, result):
+        if self._csv is not None:
+            self._csv.writerow(csv_row(result))
+        else:
+            self.out.write(json.dumps(result, ensure_ascii=False, default=_plain) + "\n")
+        # Flushed per row: whatever is on disk is exactly what a rerun skips
+        self.out.flush()
+
+
+# ---------------- Batch Driver ----------------
+def run_batch(symbols, out, fmt="jsonl", workers=None, risk="Low", horizon="3+ Years", progress=None):
+    workers = workers or os.cpu_count() or 1
+    writer = RowWriter(out, fmt)
+    stats = {"symbols": 0, "errors": 0}
+    start = time.perf_counter()
+    queue = iter(symbols)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(workers,)) as pool:
+        in_flight = set()
+
+        def fill():
+            while len(in_flight) < workers * IN_FLIGHT_PER_WORKER:
+                symbol = next(queue, None)
+                if symbol is None:
+                    return
+                in_flight.add(pool.submit(analyze_symbol, symbol, risk, horizon))
+
+        try:
+            fill()
+            while in_flight:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result = future.result()
+                    writer.write(result)
+                    stats["symbols"] += 1
+                    stats["errors"] += bool(result["errors"])
+                    if progress:
+                        progress.write(f"\r{stats['symbols']} done, {stats['errors']} with errors")
+                        progress.flush()
+                fill()
+        except KeyboardInterrupt:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    stats["seconds"] = time.perf_counter() - start
+    if progress:
+        progress.write("\n")
+    return stats
+
+
+def add_arguments(parser):
+    # Shared with marketmind_v5_final's --batch
+    parser.add_argument("--output", "-o", help="file to append rows to and resume from (default: stdout)")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--risk", default="Low", choices=("Low", "Medium", "High"))
+    parser.add_argument("--horizon", default="3+ Years", choices=("< 1 Year", "1 Year", "3+ Years"))
+    parser.add_argument("--restart", action="store_true", help="ignore existing output and start over")
+
+
+def run_cli(symbols_file, args):
+    symbols = read_symbols(symbols_file)
+    if args.output in (None, "-"):
+        return _report(run_batch(symbols, sys.stdout, args.format, args.workers, args.risk, args.horizon))
+
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+    done = completed(args.output, args.format)
+    todo = [s for s in symbols if s not in done]
+    print(f"{len(symbols)} symbols, {len(symbols) - len(todo)} already in {args.output}, {len(todo)} to go",
+          file=sys.stderr)
+    with open(args.output, "a", newline="" if args.format == "csv" else None, encoding="utf-8") as out:
+        try:
+            stats = run_batch(todo, out, args.format, args.workers, args.risk, args.horizon, progress=sys.stderr)
+        except KeyboardInterrupt:
+            print("\ninterrupted; rerun the same command to resume", file=sys.stderr)
+            return 130
+    return _report(stats)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a list of NSE/BSE stocks in parallel.")
+    parser.add_argument("symbols_file", help="one symbol per line")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    return run_cli(args.symbols_file, args)
+
+
+def _report(stats):
+    rate = stats["symbols"] / stats["seconds"] if stats["seconds"] else 0.0
+    print(f"{stats['symbols']} symbols in {stats['seconds']:.1f}s ({rate:.1f}/s), {stats['errors']} with errors",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+import argparse
+import json
+
+
+# ---------------- Compare Two Benchmark Runs ----------------
+def load(path):
+    with open(path) as f:
+        data = json.load(f)
+    return {(r["stage"], r["size"]): r for r in data["results"]}
+
+
+def compare(baseline, candidate, threshold=0.10):
+    # Rows of (stage, size, old s, new s, ratio, regressed) for stages in both runs
+    rows = []
+    for key in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[key]["total_s"], candidate[key]["total_s"]
+        ratio = new / old if old else float("inf")
+        rows.append((key[0], key[1], old, new, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON files.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    rows = compare(load(args.baseline), load(args.candidate), args.threshold)
+    regressions = 0
+    for stage, size, old, new, ratio, regressed in rows:
+        flag = "❌ slower" if regressed else ("✅ faster" if ratio < 1 - args.threshold else "")
+        regressions += regressed
+        print(f"{stage:24s} n={size:<7d} {old:9.4f}s -> {new:9.4f}s  x{ratio:5.2f} {flag}")
+    raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start budgets (cumulative microseconds for the module's own import, as
+# reported by `python -X importtime`) and dependencies that must stay lazy.
+BUDGETS = {
+    "marketmind_v5_final": 100_000,
+    "data_cache": 50_000,
+}
+MUST_STAY_LAZY = ("yfinance", "pandas", "numpy", "textblob", "feedparser", "nltk")
+
+# `python marketmind_v5_final.py`: every import its __main__ block makes before
+# the symbol prompt (argument parsing, batch options, instrumentation)
+CLI_BUDGET = 150_000
+CLI_RUN = (
+    "import runpy, sys; sys.argv = ['marketmind_v5_final.py', '--help']; "
+    "runpy.run_path('marketmind_v5_final.py', run_name='__main__')"
+)
+
+# Streamlit first paint: the first run of app.py until every widget is on the
+# page (Streamlit's own import excluded). TextBlob/feedparser warm up on a
+# background thread, so they are not part of it.
+FIRST_PAINT_BUDGET = 1_000_000
+FIRST_PAINT = (
+    "import time; from streamlit.testing.v1 import AppTest; "
+    "app = AppTest.from_file('app.py', default_timeout=60); "
+    "start = time.perf_counter(); app.run(); "
+    "print(int((time.perf_counter() - start) * 1e6), len(app.exception))"
+)
+
+
+# ---------------- Measurement ----------------
+def import_profile(code):
+    # [(cumulative_us, self_us, name, top_level)] for a fresh interpreter running `code`
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip(), not name[1:].startswith(" ")))
+    return rows
+
+
+def check(module):
+    rows = import_profile(f"import {module}")
+    total = next(c for c, _, name, _ in reversed(rows) if name == module)
+    loaded = {name.split(".")[0] for _, _, name, _ in rows}
+    eager = sorted(set(MUST_STAY_LAZY) & loaded)
+    return total, eager, sorted(rows, reverse=True)[:10]
+
+
+def check_cli():
+    # Top-level imports of the CLI run, minus what the runpy harness costs anyway
+    harness = {name for _, _, name, _ in import_profile("import runpy, sys")}
+    rows = [row for row in import_profile(CLI_RUN) if row[2] not in harness]
+    total = sum(c for c, _, _, top in rows if top)
+    loaded = {name.split(".")[0] for _, _, name, _ in rows}
+    eager = sorted(set(MUST_STAY_LAZY) & loaded)
+    return total, eager, sorted(rows, reverse=True)[:10]
+
+
+def first_paint():
+    # (microseconds, exceptions) for app.py's first run, or None without Streamlit
+    proc = subprocess.run([sys.executable, "-c", FIRST_PAINT], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        if "No module named 'streamlit'" in proc.stderr:
+            return None
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    elapsed, exceptions = proc.stdout.split()[-2:]
+    return int(elapsed), int(exceptions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check cold-start import time against budgets.")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget, e.g. on slow CI")
+    args = parser.parse_args()
+
+    failed = False
+    checks = [(f"import {module}", budget, lambda module=module: check(module)) for module, budget in BUDGETS.items()]
+    checks.append(("CLI start (python marketmind_v5_final.py)", CLI_BUDGET, check_cli))
+    for label, budget, run in checks:
+        total, eager, slowest = run()
+        over = total > budget * args.scale
+        status = "❌" if over or eager else "✅"
+        print(f"{status} {label}: {total / 1000:.1f} ms (budget {budget * args.scale / 1000:.0f} ms)")
+        if eager:
+            print(f"   heavy dependencies imported eagerly: {', '.join(eager)}")
+        if over or eager:
+            for cumulative, _, name, _ in slowest:
+                print(f"   {cumulative / 1000:8.1f} ms  {name}")
+        failed |= over or bool(eager)
+
+    paint = first_paint()
+    if paint is None:
+        print("– Streamlit first paint: skipped (streamlit not installed)")
+    else:
+        elapsed, exceptions = paint
+        over = elapsed > FIRST_PAINT_BUDGET * args.scale
+        status = "❌" if over or exceptions else "✅"
+        print(f"{status} Streamlit first paint: {elapsed / 1000:.1f} ms "
+              f"(budget {FIRST_PAINT_BUDGET * args.scale / 1000:.0f} ms)")
+        if exceptions:
+            print(f"   app.py raised {exceptions} exception(s) on first run")
+        failed |= over or bool(exceptions)
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
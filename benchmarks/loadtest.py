@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+# N simulated users (threads, as Streamlit sessions are) each run the full
+# analysis flow against replayed cassettes: fetch_inputs -> analysis_report ->
+# Monte Carlo, the same work one click of Analyze does.
+
+
+def _configure(workdir, cassettes, latency):
+    # Every store the flow touches lives under workdir, so runs start cold and
+    # never read or write ~/.marketmind; must run before the modules are imported
+    os.environ["MARKETMIND_CACHE"] = os.path.join(workdir, "cache.sqlite")
+    os.environ["MARKETMIND_PRICE_STORE"] = os.path.join(workdir, "prices")
+    os.environ["MARKETMIND_NEWS_STORE"] = os.path.join(workdir, "news.sqlite")
+    os.environ["MARKETMIND_POLARITY_CACHE"] = os.path.join(workdir, "polarity.sqlite")
+    os.environ["MARKETMIND_PROVIDER"] = f"replay:{cassettes}"
+    os.environ["MARKETMIND_REPLAY_LATENCY"] = latency
+
+
+def _user(symbols, requests, think, seed, latencies, errors, lock):
+    from pipeline import fetch_inputs, analysis_report
+    from valuation import monte_carlo
+
+    rng = random.Random(seed)
+    for _ in range(requests):
+        symbol = rng.choice(symbols)
+        start = time.perf_counter()
+        try:
+            result = analysis_report(fetch_inputs(symbol))
+            valuation = result.get("valuation", {})
+            if valuation.get("sector_pe"):
+                monte_carlo(valuation["eps"], valuation["sector_pe"], valuation["current_price"])
+            failed = bool(result["errors"])
+        except Exception:
+            failed = True
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            errors[0] += failed
+        if think:
+            time.sleep(rng.uniform(0, 2 * think))
+
+
+def run_load(symbols, users, requests, think=0.0):
+    latencies, errors, lock = [], [0], threading.Lock()
+    threads = [
+        threading.Thread(target=_user, args=(symbols, requests, think, i, latencies, errors, lock))
+        for i in range(users)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    lat = np.array(latencies)
+    return {
+        "users": users,
+        "requests": len(lat),
+        "errors": errors[0],
+        "wall_s": wall,
+        "throughput_rps": len(lat) / wall if wall else None,
+        "p50_s": float(np.percentile(lat, 50)),
+        "p90_s": float(np.percentile(lat, 90)),
+        "p99_s": float(np.percentile(lat, 99)),
+        "max_s": float(lat.max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test on recorded data.")
+    parser.add_argument("--cassettes", help="cassette directory (default: synthesize one)")
+    parser.add_argument("--symbols", type=int, default=20, help="distinct symbols (synthesized or sampled)")
+    parser.add_argument("--users", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=5, help="analyses per user")
+    parser.add_argument("--think", type=float, default=0.0, help="mean seconds between a user's analyses")
+    parser.add_argument("--latency", default="info=0.3,history=0.4,feed=0.6",
+                        help="injected upstream latency, e.g. 'info=0.3,history=0.4,feed=0.6' or '0.2'")
+    parser.add_argument("--no-rate-limit", action="store_true", help="lift the gateway's upstream rate limits")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="marketmind-load-")
+    cassettes = args.cassettes or os.path.join(workdir, "cassettes")
+    _configure(workdir, cassettes, args.latency)
+
+    from providers import synthesize, get_provider
+    from gateway import get_gateway
+    from marketmind_v5_final import warm_up
+    from instrumentation import snapshot
+
+    if args.cassettes:
+        symbols = get_provider().symbols()[:args.symbols]
+    else:
+        symbols = synthesize(cassettes, args.symbols)
+    if args.no_rate_limit:
+        get_gateway().limits.update({name: (1e9, 1e9) for name in ("yahoo", "news")})
+    warm_up()
+
+    report = run_load(symbols, args.users, args.requests, args.think)
+    metrics = snapshot()
+    report["stages"] = {name: {"p50_s": s["p50_s"], "p99_s": s["p99_s"], "count": s["count"]}
+                        for name, s in metrics["stages"].items()}
+    report["counters"] = metrics["counters"]
+    report["gauges"] = metrics["gauges"]
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['users']} users, {report['requests']} analyses over {len(symbols)} symbols "
+          f"in {report['wall_s']:.2f}s -> {report['throughput_rps']:.1f} analyses/s, {report['errors']} with errors")
+    print(f"latency p50 {report['p50_s'] * 1000:.0f} ms | p90 {report['p90_s'] * 1000:.0f} ms | "
+          f"p99 {report['p99_s'] * 1000:.0f} ms | max {report['max_s'] * 1000:.0f} ms")
+    print("\nstage                      count     p50 ms     p99 ms")
+    for name, s in report["stages"].items():
+        print(f"{name:<25} {s['count']:>6} {s['p50_s'] * 1000:>10.1f} {s['p99_s'] * 1000:>10.1f}")
+    print()
+    for name, value in {**report["counters"], **report["gauges"]}.items():
+        print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+
+# Stages measure cold scoring: the polarity memo lives in memory for this run
+# only and never touches ~/.marketmind (set before polarity_cache is imported)
+os.environ["MARKETMIND_POLARITY_CACHE"] = ":memory:"
+
+from benchmarks import synthetic
+from marketmind_v5_final import (
+    Fundamentals,
+    extract_number,
+    determine_sector,
+    ai_summary_from_metrics,
+    sentiment_from_headlines,
+    market_psychology_from_history,
+    custom_sector_pe,
+    intrinsic_value,
+    marketmind_score,
+)
+from monitor import Monitor
+from polarity_cache import PolarityCache, bypassed
+from psychology import psychology_regimes
+from screener import fundamentals_frame, screen_universe
+from sector_index import SectorIndex
+from sentiment_batch import score_headlines
+from valuation import monte_carlo
+
+SIZES = (1, 1_000, 100_000)
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+# ---------------- Stages ----------------
+# Each stage takes a size and returns (items, call, calls): the synthetic inputs
+# are built outside the timed region and call(item) is timed once per item.
+def _per_item(build, call):
+    def stage(n):
+        items = build(n)
+        return items, call, len(items)
+    return stage
+
+
+def _whole(build, call):
+    def stage(n):
+        data = build(n)
+        return [data], call, 1
+    return stage
+
+
+def _uncached(call):
+    # TextBlob scoring inside the call really scores, even for titles an earlier
+    # stage or the memory pass already saw
+    def run(item):
+        with bypassed():
+            return call(item)
+    return run
+
+
+def _warm_polarity_cache(n):
+    # A memo already holding every title: what a repeat visit costs
+    from marketmind_v5_final import _textblob_polarities, polarity_version
+
+    titles = synthetic.headlines(n)
+    cache = PolarityCache(":memory:")
+    cache.polarities(titles, _textblob_polarities, polarity_version())
+    return cache, titles
+
+
+def _cached_polarities(args):
+    from marketmind_v5_final import _textblob_polarities, polarity_version
+
+    cache, titles = args
+    return cache.polarities(titles, _textblob_polarities, polarity_version())
+
+
+def _score_symbol(info):
+    report = Fundamentals.from_info(info)
+    score = report.score()
+    sector = determine_sector(info)
+    verdict = "N/A"
+    if report.eps is not None and report.price is not None:
+        _, intrinsic = intrinsic_value(report.eps, custom_sector_pe.get(sector, 15))
+        verdict = "✅ Undervalued" if intrinsic > report.price else "❌ Overvalued"
+    return marketmind_score(score, verdict, sector)
+
+
+def _screen_inputs(n):
+    # The synthetic universe plus peer tables built from it, as the live
+    # sector index would hold them
+    infos = synthetic.info_dicts(n)
+    index = SectorIndex()
+    for symbol, info in infos.items():
+        index.observe_info(symbol, info)
+    return fundamentals_frame(infos), index.screen_tables()
+
+
+def _monitor_ticks(n, ticks=30):
+    # A watchlist of n symbols with a window of history, then `ticks` live bars
+    rng = np.random.default_rng(0)
+    symbols = np.array(synthetic.symbols(n), dtype=object)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.02, (ticks * 2, n)), axis=0))
+    volume = rng.lognormal(13, 0.6, (ticks * 2, n))
+    monitor = Monitor(symbols)
+    for k in range(ticks):
+        monitor.update(k, symbols, close[k], volume[k])
+    return monitor, symbols, close[ticks:], volume[ticks:]
+
+
+def _replay(args):
+    monitor, symbols, close, volume = args
+    for k in range(len(close)):
+        monitor.update(k, symbols, close[k], volume[k])
+
+
+def _summary(info):
+    report = Fundamentals.from_info(info)
+    return ai_summary_from_metrics(report, report.score(), determine_sector(info))
+
+
+STAGES = {
+    "extract_number": _per_item(
+        lambda n: [v for r in synthetic.legacy_reports(synthetic.info_dicts(max(1, n // 6 + 1)))
+                   for v in r.values()][:n],
+        extract_number,
+    ),
+    "fundamentals_from_info": _per_item(lambda n: list(synthetic.info_dicts(n).values()), Fundamentals.from_info),
+    "ai_summary_from_metrics": _per_item(lambda n: list(synthetic.info_dicts(n).values()), _summary),
+    "score_symbol": _per_item(lambda n: list(synthetic.info_dicts(n).values()), _score_symbol),
+    "screen_universe": _whole(_screen_inputs, lambda inputs: screen_universe(inputs[0], **inputs[1])),
+    "headline_sentiment": _per_item(lambda n: [[h] for h in synthetic.headlines(n)], _uncached(sentiment_from_headlines)),
+    "headline_sentiment_batch": _whole(lambda n: synthetic.headlines(n), _uncached(score_headlines)),
+    "headline_sentiment_lexicon": _whole(lambda n: synthetic.headlines(n), lambda t: score_headlines(t, "lexicon")),
+    # Memo hits only (warmed outside the timed region); not comparable to the cold stages
+    "headline_polarity_cached": _whole(_warm_polarity_cache, _cached_polarities),
+    "market_psychology": _per_item(lambda n: synthetic.price_windows(n), market_psychology_from_history),
+    "psychology_regimes": _whole(lambda n: synthetic.ohlcv(days=max(n, 21)), psychology_regimes),
+    "monitor_ticks": _whole(_monitor_ticks, _replay),
+    "monte_carlo_batch": _whole(
+        lambda n: (np.linspace(1, 100, n), np.full(n, 20.0), np.linspace(100, 2000, n)),
+        lambda args: monte_carlo(*args, seed=0),
+    ),
+}
+
+
+# ---------------- Measurement ----------------
+def measure(stage, size, memory=True):
+    items, call, calls = STAGES[stage](size)
+
+    timings = np.empty(len(items))
+    start = time.perf_counter()
+    for i, item in enumerate(items):
+        t0 = time.perf_counter()
+        call(item)
+        timings[i] = time.perf_counter() - t0
+    total = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        for item in items:
+            call(item)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "stage": stage,
+        "size": size,
+        "calls": calls,
+        "total_s": total,
+        "per_call_us": {
+            "mean": float(timings.mean() * 1e6),
+            "p50": float(np.percentile(timings, 50) * 1e6),
+            "p99": float(np.percentile(timings, 99) * 1e6),
+        },
+        "throughput_per_s": size / total if total > 0 else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def _metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MarketMind analysis stages on synthetic data.")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated subset of stages")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in SIZES),
+                        help="symbols/headlines per stage, e.g. 1,1000,100000")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory pass")
+    parser.add_argument("--out", help="JSON output path (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    results = []
+    for stage in args.stages.split(","):
+        for size in (int(s) for s in args.sizes.split(",")):
+            row = measure(stage, size, memory=not args.no_memory)
+            results.append(row)
+            mem = "" if row["peak_memory_bytes"] is None else f"  peak {row['peak_memory_bytes'] / 1e6:8.2f} MB"
+            print(f"{stage:24s} n={size:<7d} total {row['total_s']:9.4f}s  "
+                  f"p50 {row['per_call_us']['p50']:10.1f}us  p99 {row['per_call_us']['p99']:10.1f}us{mem}")
+
+    out = args.out
+    if out is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        out = os.path.join(RESULTS_DIR, datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    with open(out, "w") as f:
+        json.dump({"meta": _metadata(), "results": results}, f, indent=2)
+    print(f"\nSaved {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+from marketmind_v5_final import sector_map
+
+# Deterministic stand-ins for yf.Ticker(...).info, .history() and the Google News
+# RSS titles, so every analysis stage can run without network access.
+RAW_SECTORS = list(sector_map) + ["Energy", "Basic Materials"]
+
+HEADLINE_TEMPLATES = [
+    "{name} posts record high quarterly profit",
+    "{name} shares drop after weak guidance",
+    "{name} announces new board appointments",
+    "Is {name} a buy after the recent rally?",
+    "{name} Q2 results: revenue growth beats estimates",
+    "Analysts cut {name} target price amid margin pressure",
+    "{name} to expand operations in southern India",
+    "{name} stock remains steady as markets await RBI policy",
+    "Brokerages remain bullish on {name}",
+    "{name} faces regulatory scrutiny over disclosures",
+]
+
+
+def symbols(n):
+    return [f"SYM{i:06d}.NS" for i in range(n)]
+
+
+def info_dicts(n, seed=0):
+    rng = np.random.default_rng(seed)
+    pe = rng.lognormal(3.0, 0.5, n)
+    pe[rng.random(n) < 0.05] *= -1
+    infos = {}
+    for i, symbol in enumerate(symbols(n)):
+        info = {
+            "trailingPE": float(pe[i]),
+            "returnOnEquity": float(rng.normal(0.14, 0.1)),
+            "profitMargins": float(rng.normal(0.12, 0.08)),
+            "priceToBook": float(rng.lognormal(1.0, 0.6)),
+            "trailingEps": float(rng.lognormal(3.0, 1.0)),
+            "currentPrice": float(rng.lognormal(6.5, 1.0)),
+            "sector": RAW_SECTORS[rng.integers(len(RAW_SECTORS))],
+        }
+        if rng.random() < 0.1:
+            info.pop("returnOnEquity")
+        infos[symbol] = info
+    return infos
+
+
+def legacy_reports(infos):
+    # The pre-Fundamentals string report, for extract_number benchmarks
+    reports = []
+    for info in infos.values():
+        reports.append({
+            "PE Ratio": str(info.get("trailingPE", "N/A")),
+            "ROE": str(info.get("returnOnEquity", 0) * 100) + "%" if info.get("returnOnEquity") else "N/A",
+            "EPS Growth": "N/A",
+            "Free Cash Flow": "N/A",
+            "Profit Margin": str(info.get("profitMargins", 0) * 100) + "%" if info.get("profitMargins") else "N/A",
+            "PB Ratio": str(info.get("priceToBook", "N/A")),
+        })
+    return reports
+
+
+def ohlcv(days=252, seed=0, start="2024-01-01"):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.02, days)))
+    spread = np.abs(rng.normal(0, 0.01, days)) * close
+    return pd.DataFrame({
+        "Open": close + rng.normal(0, 0.5, days),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.lognormal(13, 0.6, days),
+    }, index=pd.bdate_range(start, periods=days, tz="Asia/Kolkata"))
+
+
+def price_windows(n, days=21, seed=0):
+    # n (Close, Volume) windows cut from one long synthetic series
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.02, n + days)))
+    volume = rng.lognormal(13, 0.6, n + days)
+    return [{"Close": close[i:i + days], "Volume": volume[i:i + days]} for i in range(n)]
+
+
+def headlines(n, seed=0):
+    rng = np.random.default_rng(seed)
+    names = ["Infosys", "TCS", "Reliance", "HDFC Bank", "ONGC", "Wipro", "SBI", "Bajaj Finance"]
+    picks = rng.integers(len(HEADLINE_TEMPLATES), size=n)
+    who = rng.integers(len(names), size=n)
+    return [HEADLINE_TEMPLATES[p].format(name=names[w]) + f" ({i})" for i, (p, w) in enumerate(zip(picks, who))]
+
+
+# Lexicon-heavy pieces for headlines the templates never produce: negations,
+# intensifiers, stacked punctuation, line breaks and keywords split across lines
+VARIED_NAMES = ["Infosys", "TCS", "Reliance", "HDFC Bank", "ONGC", "Wipro", "SBI", "Bajaj Finance"]
+VARIED_SUBJECTS = ["outlook", "quarter", "guidance", "results", "management commentary", "order book", "demand"]
+VARIED_NEGATIONS = ["", "", "not ", "never ", "isn't ", "no longer ", "not a "]
+VARIED_INTENSIFIERS = ["", "", "very ", "really ", "extremely ", "slightly ", "quite ", "not very ", "so "]
+VARIED_ADJECTIVES = [
+    "good", "bad", "strong", "weak", "great", "poor", "terrible", "excellent", "disappointing",
+    "impressive", "stable", "uncertain", "solid", "awful", "positive", "negative", "happy", "worried",
+]
+VARIED_ENDINGS = ["", "", "!", "!!", "?", "...", " :(", "?!", ", analysts say", ", says CEO"]
+VARIED_KEYWORDS = ["", "", "", "profits", "record\nhigh", "down", "growth", "cut", "record high"]
+
+
+def varied_headlines(n, seed=0):
+    rng = np.random.default_rng(seed)
+
+    def pick(options):
+        return options[rng.integers(len(options))]
+
+    titles = []
+    for _ in range(n):
+        words = [pick(VARIED_NAMES), pick(VARIED_SUBJECTS)]
+        for _ in range(rng.integers(1, 3)):
+            words.append(f"{pick(VARIED_NEGATIONS)}{pick(VARIED_INTENSIFIERS)}{pick(VARIED_ADJECTIVES)}")
+        keyword = pick(VARIED_KEYWORDS)
+        if keyword:
+            words.insert(rng.integers(len(words) + 1), keyword)
+        title = " ".join(words) + pick(VARIED_ENDINGS)
+        if rng.random() < 0.2:
+            # Feeds wrap long titles; the break replaces a space
+            spaces = [i for i, c in enumerate(title) if c == " "]
+            cut = spaces[rng.integers(len(spaces))]
+            title = title[:cut] + "\n" + title[cut + 1:]
+        titles.append(title[0].upper() + title[1:])
+    return titles
@@ -0,0 +1,235 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from gateway import get_gateway
+from instrumentation import incr
+from providers import get_provider
+
+# ---------------- Cache Settings ----------------
+CACHE_PATH = os.environ.get(
+    "MARKETMIND_CACHE",
+    os.path.join(os.path.expanduser("~"), ".marketmind", "cache.sqlite"),
+)
+
+# Seconds before an entry is considered stale, per kind of data
+DEFAULT_TTLS = {
+    "info": 12 * 60 * 60,   # fundamentals move at most once a day
+    "daily": 15 * 60,       # daily bars: only today's bar changes
+    "intraday": 60,         # minute/hour bars
+}
+
+# Seconds past which a stale entry is no longer served while it refreshes in the
+# background: older entries are reloaded synchronously
+DEFAULT_MAX_STALE = {
+    "info": 3 * 24 * 60 * 60,
+    "daily": 24 * 60 * 60,
+    "intraday": 15 * 60,
+}
+
+MAX_ENTRIES = 5000
+MAX_BYTES = 256 * 1024 * 1024
+
+
+# ---------------- SQLite-backed LRU Cache ----------------
+class DataCache:
+    def __init__(self, path=CACHE_PATH, ttls=None, max_entries=MAX_ENTRIES,
+                 max_bytes=MAX_BYTES, stale_while_revalidate=True, max_stale=None):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_stale = dict(DEFAULT_MAX_STALE, **(max_stale or {}))
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_while_revalidate = stale_while_revalidate
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._listeners = {}
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, kind TEXT NOT NULL, value BLOB NOT NULL,"
+                " size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries(accessed_at)")
+            self._conn.commit()
+
+    def get(self, key):
+        # Returns (value, age_in_seconds) or None, and marks the entry as recently used
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return pickle.loads(row[0]), time.time() - row[1]
+
+    def set(self, key, kind, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, kind, value, size, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, blob, len(blob), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def entries(self, kind):
+        # (key, value) of every stored entry of one kind, however old
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM entries WHERE kind = ?", (kind,)).fetchall()
+        return [(key, pickle.loads(blob)) for key, blob in rows]
+
+    def subscribe(self, kind, callback):
+        # callback(key, value) after every fresh load of that kind is stored
+        self._listeners.setdefault(kind, []).append(callback)
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def _evict(self):
+        # Drop least recently used entries until both the count and byte limits hold
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                " SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            victims = []
+            for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC"):
+                victims.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    def fetch(self, key, kind, loader):
+        # Fresh hit -> cached value. Stale hit -> cached value now, refreshed in the
+        # background (or synchronously when stale-while-revalidate is off). Miss, or
+        # an entry older than max_stale -> load.
+        cached = self.get(key)
+        if cached is not None:
+            value, age = cached
+            if age <= self.ttls.get(kind, 0):
+                incr(f"cache.{kind}.hit")
+                return value
+            if age > self.max_stale.get(kind, 0):
+                incr(f"cache.{kind}.expired")
+                return self._load(key, kind, loader)
+            incr(f"cache.{kind}.stale")
+            if self.stale_while_revalidate:
+                self._refresh_in_background(key, kind, loader)
+                return value
+            try:
+                return self._load(key, kind, loader)
+            except Exception:
+                return value
+        incr(f"cache.{kind}.miss")
+        return self._load(key, kind, loader)
+
+    def _load(self, key, kind, loader):
+        value = loader()
+        if not _is_empty(value):
+            self.set(key, kind, value)
+            for callback in self._listeners.get(kind, ()):
+                try:
+                    callback(key, value)
+                except Exception:
+                    pass
+        return value
+
+    def _refresh_in_background(self, key, kind, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._load(key, kind, loader)
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+
+def _is_empty(value):
+    # Failed Yahoo lookups come back as empty dicts/frames; never cache those
+    if value is None:
+        return True
+    empty = getattr(value, "empty", None)
+    if isinstance(empty, bool):
+        return empty
+    try:
+        return len(value) == 0
+    except TypeError:
+        return False
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_cache():
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = DataCache()
+        return _default_cache
+
+
+# ---------------- Cached Yahoo Finance Calls ----------------
+def history_kind(interval):
+    return "intraday" if interval.endswith(("m", "h")) else "daily"
+
+
+def cached_info(symbol):
+    # Whatever is stored, however old, without touching Yahoo (deadline fallback)
+    cached = get_cache().get(f"info:{symbol}")
+    return None if cached is None else cached[0]
+
+
+# Cache misses go through the gateway: concurrent misses for the same key share
+# one Yahoo request, and all Yahoo traffic is rate limited and retried.
+def get_info(symbol):
+    key = f"info:{symbol}"
+    return get_cache().fetch(key, "info", lambda: get_gateway().call(
+        "yahoo", key, lambda: get_provider().info(symbol)
+    ))
+
+
+def get_history(symbol, period="1mo", interval="1d"):
+    key = f"history:{symbol}:{period}:{interval}"
+    return get_cache().fetch(key, history_kind(interval), lambda: get_gateway().call(
+        "yahoo", key, lambda: get_provider().history(symbol, period, interval)
+    ))
+
+
+def cached_history(symbol, period="1mo", interval="1d"):
+    cached = get_cache().get(f"history:{symbol}:{period}:{interval}")
+    return None if cached is None else cached[0]
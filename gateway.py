@@ -0,0 +1,175 @@
+import random
+import threading
+import time
+
+from instrumentation import register_collector, span
+
+# ---------------- Gateway Settings ----------------
+# (requests per second, burst) per upstream, shared by every session in the process
+UPSTREAM_LIMITS = {
+    "yahoo": (2.0, 10),
+    "news": (1.0, 5),
+}
+DEFAULT_LIMIT = (1.0, 5)
+RETRIES = 3
+BACKOFF_BASE = 0.5     # seconds; attempt n waits up to BACKOFF_BASE * 2**n
+BACKOFF_MAX = 8.0
+
+
+class UpstreamError(Exception):
+    # Raised by callers for responses worth retrying (throttling, 5xx, network failures)
+    pass
+
+
+# Bad input, a parsing bug or a symbol that does not exist will not go away on
+# retry. LookupError also covers a missing replay cassette. yfinance's own
+# exceptions are matched by name so the gateway does not import yfinance.
+NON_RETRYABLE = (LookupError, ValueError, TypeError, AttributeError)
+NON_RETRYABLE_NAMES = ("YFTickerMissingError", "YFTzMissingError", "YFPricesMissingError", "YFInvalidPeriodError")
+NON_RETRYABLE_STATUSES = (404, 410)
+
+
+def retryable(error):
+    if isinstance(error, NON_RETRYABLE) or type(error).__name__ in NON_RETRYABLE_NAMES:
+        return False
+    # HTTPError from requests / curl_cffi (yfinance) carries the response
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status not in NON_RETRYABLE_STATUSES
+
+
+# ---------------- Token Bucket ----------------
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        # Blocks until a token is available; callers queue instead of hammering
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+# ---------------- Fetch Gateway ----------------
+class Gateway:
+    def __init__(self, limits=None, retries=RETRIES, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+        self.limits = dict(UPSTREAM_LIMITS, **(limits or {}))
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._buckets = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.counters = {"calls": 0, "coalesced": 0, "upstream_calls": 0, "retries": 0, "failures": 0}
+
+    def call(self, upstream, key, fn):
+        # Single-flight: concurrent calls with the same key share one upstream
+        # request (and its retries) and all get its result or its exception.
+        with self._lock:
+            self.counters["calls"] += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.counters["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._attempt(upstream, fn)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def _attempt(self, upstream, fn):
+        bucket = self._bucket(upstream)
+        for attempt in range(self.retries + 1):
+            bucket.acquire()
+            with self._lock:
+                self.counters["upstream_calls"] += 1
+            try:
+                with span(f"upstream.{upstream}"):
+                    return fn()
+            except Exception as e:
+                if attempt == self.retries or not retryable(e):
+                    with self._lock:
+                        self.counters["failures"] += 1
+                    raise
+                with self._lock:
+                    self.counters["retries"] += 1
+                # Full jitter, so throttled sessions do not retry in lockstep
+                time.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+
+    def _bucket(self, upstream):
+        with self._lock:
+            bucket = self._buckets.get(upstream)
+            if bucket is None:
+                bucket = self._buckets[upstream] = TokenBucket(*self.limits.get(upstream, DEFAULT_LIMIT))
+            return bucket
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, inflight=len(self._inflight))
+
+
+_default_gateway = None
+_default_lock = threading.Lock()
+
+
+def get_gateway():
+    global _default_gateway
+    with _default_lock:
+        if _default_gateway is None:
+            _default_gateway = Gateway()
+            register_collector("gateway", _default_gateway.stats)
+        return _default_gateway
+
+
+# ---------------- Feeds ----------------
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_feed(url, etag=None, modified=None):
+    # feedparser.parse through the gateway; throttled or failing responses and
+    # network failures (a bozo feed with no HTTP status) are retried, anything
+    # else (including 304 Not Modified and 404) is returned as is
+    def fetch():
+        from providers import get_provider
+
+        feed = get_provider().feed(url, etag=etag, modified=modified)
+        if feed.get("status") in RETRY_STATUSES:
+            raise UpstreamError(f"{url} returned HTTP {feed.get('status')}")
+        if feed.get("bozo") and "status" not in feed:
+            raise UpstreamError(f"{url} unreachable: {feed.get('bozo_exception')}")
+        return feed
+
+    return get_gateway().call("news", f"feed:{url}:{etag}:{modified}", fetch)
@@ -0,0 +1,178 @@
+import contextvars
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# ---------------- Settings ----------------
+# Latency percentiles are computed over the most recent samples of each stage
+SAMPLES_PER_STAGE = 2048
+
+_lock = threading.Lock()
+_stages = {}        # name -> {"count", "total", "samples"}
+_counters = {}      # name -> int
+_collectors = {}    # name -> callable returning {metric: number}
+_trace = contextvars.ContextVar("marketmind_trace", default=None)
+
+
+# ---------------- Recording ----------------
+def record(name, seconds):
+    with _lock:
+        stage = _stages.get(name)
+        if stage is None:
+            stage = _stages[name] = {"count": 0, "total": 0.0, "samples": deque(maxlen=SAMPLES_PER_STAGE)}
+        stage["count"] += 1
+        stage["total"] += seconds
+        stage["samples"].append(seconds)
+    trace = _trace.get()
+    if trace is not None:
+        trace.append((name, seconds))
+
+
+@contextmanager
+def span(name):
+    # Times the block under `name`; failures are timed too and counted separately
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        incr(f"{name}.errors")
+        raise
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def timed(name):
+    def decorate(fn):
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        return wrapper
+    return decorate
+
+
+def incr(name, amount=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def register_collector(name, collect):
+    # collect() -> {metric: number}, read at export time (e.g. Gateway.stats)
+    with _lock:
+        _collectors[name] = collect
+
+
+# ---------------- Per-Analysis Traces ----------------
+@contextmanager
+def trace():
+    # Collects the spans recorded by this analysis (including work it hands to
+    # threads through in_context) as [(name, seconds)] in completion order
+    spans = []
+    token = _trace.set(spans)
+    try:
+        yield spans
+    finally:
+        _trace.reset(token)
+
+
+def in_context(fn):
+    # Executor threads do not inherit context variables; wrap submitted work so
+    # its spans land in the submitting analysis' trace
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
+
+
+# ---------------- Export ----------------
+def _percentile(ordered, q):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def snapshot():
+    with _lock:
+        stages = {name: (s["count"], s["total"], sorted(s["samples"])) for name, s in _stages.items()}
+        counters = dict(_counters)
+        collectors = dict(_collectors)
+
+    # Collector values are read as they are now (sizes, hit rates), so they are
+    # reported apart from the monotonic incr() counters
+    gauges = {}
+    for source, collect in collectors.items():
+        try:
+            for metric, value in collect().items():
+                if isinstance(value, (int, float)):
+                    gauges[f"{source}.{metric}"] = value
+        except Exception:
+            pass
+
+    return {
+        "stages": {
+            name: {
+                "count": count,
+                "total_s": total,
+                "mean_s": total / count if count else None,
+                "p50_s": _percentile(samples, 0.50),
+                "p99_s": _percentile(samples, 0.99),
+                "max_s": samples[-1] if samples else None,
+            }
+            for name, (count, total, samples) in sorted(stages.items())
+        },
+        "counters": dict(sorted(counters.items())),
+        "gauges": dict(sorted(gauges.items())),
+    }
+
+
+def to_json():
+    return json.dumps(snapshot(), indent=2)
+
+
+def _metric_name(name):
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+def prometheus_text():
+    # Prometheus text exposition format: per-stage summaries, incr() counters
+    # (with the conventional _total suffix) and collector gauges
+    data = snapshot()
+    lines = [
+        "# HELP marketmind_stage_seconds Latency of each analysis stage.",
+        "# TYPE marketmind_stage_seconds summary",
+    ]
+    for name, s in data["stages"].items():
+        label = f'stage="{name}"'
+        lines.append(f'marketmind_stage_seconds{{{label},quantile="0.5"}} {s["p50_s"]:.6f}')
+        lines.append(f'marketmind_stage_seconds{{{label},quantile="0.99"}} {s["p99_s"]:.6f}')
+        lines.append(f"marketmind_stage_seconds_sum{{{label}}} {s['total_s']:.6f}")
+        lines.append(f"marketmind_stage_seconds_count{{{label}}} {s['count']}")
+    for name, value in data["counters"].items():
+        metric = f"marketmind_{_metric_name(name)}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    for name, value in data["gauges"].items():
+        metric = f"marketmind_{_metric_name(name)}"
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def format_table(spans=None):
+    # Plain-text timing table: a trace's spans, or the process-wide percentiles
+    if spans is not None:
+        width = max((len(name) for name, _ in spans), default=10)
+        return "\n".join(f"{name:<{width}}  {seconds * 1000:9.1f} ms" for name, seconds in spans)
+    stages = snapshot()["stages"]
+    width = max((len(name) for name in stages), default=10)
+    rows = [f"{'stage':<{width}}  {'count':>6}  {'p50 ms':>9}  {'p99 ms':>9}"]
+    for name, s in stages.items():
+        rows.append(f"{name:<{width}}  {s['count']:>6}  {s['p50_s'] * 1000:9.1f}  {s['p99_s'] * 1000:9.1f}")
+    return "\n".join(rows)
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
@@ -1,82 +1,156 @@
+import math
+import os
 import re
-import yfinance as yf
+import threading
+# yfinance, pandas, numpy, feedparser and textblob are imported on first use so
+# the CLI prompt and the first Streamlit paint don't pay for them.
 # ---------------- Market Psychology ----------------
 def get_market_psychology(symbol):
     try:
-        data = yf.Ticker(symbol).history(period="1mo")
-        if data.empty:
-            return "⚠️ No price data available"
+        from price_store import sync_history, recent_windows
+
+        window_1mo, _ = recent_windows(symbol, sync_history(symbol))
+        return market_psychology_from_history(window_1mo)
+    except Exception as e:
+        return f"🧠 Market Psychology: ⚠️ Unable to analyze ({e})"
 
-        closing_prices = data["Close"]
-        volume = data["Volume"]
+psychology_messages = {
+    "fomo": "🧠 Market Psychology: 🚀 FOMO building (high volume & price surge)",
+    "panic": "🧠 Market Psychology: 😨 Panic selling detected",
+    "high_activity": "🧠 Market Psychology: 🔥 High activity, watch closely",
+    "sideways": "🧠 Market Psychology: 🟡 Sideways/neutral sentiment",
+    "insufficient_data": "🧠 Market Psychology: ⚠️ Insufficient price data to analyze",
+}
 
-        price_change = (closing_prices.iloc[-1] - closing_prices.iloc[0]) / closing_prices.iloc[0] * 100
-        avg_volume = volume.mean()
-        latest_volume = volume.iloc[-1]
-        volume_ratio = latest_volume / avg_volume if avg_volume > 0 else 1
+def market_psychology_from_history(data):
+    try:
+        # Accepts a history DataFrame or a dict of column arrays (price_store windows)
+        if data is None or len(data["Close"]) == 0:
+            return "⚠️ No price data available"
+        from psychology import latest_psychology
 
-        if price_change > 10 and volume_ratio > 1.5:
-            return "🧠 Market Psychology: 🚀 FOMO building (high volume & price surge)"
-        elif price_change < -10:
-            return "🧠 Market Psychology: 😨 Panic selling detected"
-        elif volume_ratio > 2:
-            return "🧠 Market Psychology: 🔥 High activity, watch closely"
-        else:
-            return "🧠 Market Psychology: 🟡 Sideways/neutral sentiment"
+        return psychology_messages[latest_psychology(data["Close"], data["Volume"])]
     except Exception as e:
         return f"🧠 Market Psychology: ⚠️ Unable to analyze ({e})"
 
 # --- News Sentiment Analysis ---
-import feedparser
-from textblob import TextBlob
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+def _sentiment_analyzer():
+    # One warmed PatternAnalyzer per process; the lexicon loads on the first call
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                from textblob.en.sentiments import PatternAnalyzer
+
+                analyzer = PatternAnalyzer()
+                analyzer.analyze("warm up")
+                _analyzer = analyzer
+    return _analyzer
+
+def _textblob_polarities(titles):
+    analyzer = _sentiment_analyzer()
+    return [analyzer.analyze(t).polarity for t in titles]
+
+_polarity_version = None
+
+def polarity_version():
+    # Cache key component: a TextBlob upgrade may change scores
+    global _polarity_version
+    if _polarity_version is None:
+        from importlib.metadata import version, PackageNotFoundError
+        try:
+            _polarity_version = f"textblob-{version('textblob')}"
+        except PackageNotFoundError:
+            _polarity_version = "textblob"
+    return _polarity_version
+
+def headline_polarities(titles):
+    # TextBlob polarity, memoised across symbols, sessions and processes
+    from polarity_cache import get_polarity_cache
+    return get_polarity_cache().polarities(titles, _textblob_polarities, polarity_version())
+
+def headline_polarity(title):
+    return headline_polarities([title])[0]
+
+def warm_up():
+    # Pull heavy dependencies in ahead of the first analysis (e.g. from a
+    # background thread while the user is still typing a symbol)
+    import feedparser
+    import pipeline
+    import valuation
+    _sentiment_analyzer()
 
 # ---------------- News Sentiment Function ----------------
+# Override with e.g. http://127.0.0.1:8000/{query}.xml to serve local RSS fixtures
+NEWS_URL = os.environ.get(
+    "MARKETMIND_NEWS_URL",
+    "https://news.google.com/rss/search?q={query}+stock&hl=en-IN&gl=IN&ceid=IN:en",
+)
+
+def news_url(symbol):
+    return NEWS_URL.format(query=symbol.replace(".NS", ""))
+
 def get_news_sentiment(symbol):
     try:
-        query = symbol.replace(".NS", "")
-        url = f"https://news.google.com/rss/search?q={query}+stock&hl=en-IN&gl=IN&ceid=IN:en"
-        feed = feedparser.parse(url)
-        entries = feed.entries[:5]
-        headlines = [entry.title for entry in entries]
+        from news_store import get_news_store
+
+        return get_news_store().sentiment(symbol)
+    except Exception as e:
+        return f"⚠️ Unable to fetch sentiment: {e}", []
+
+def fetch_headlines(symbol, limit=5):
+    from gateway import parse_feed
+
+    feed = parse_feed(news_url(symbol))
+    return [entry.title for entry in feed.entries[:limit]]
 
+negative_keywords = ["decline", "drop", "loss", "down", "plunge", "cut", "fall", "dip", "decrease"]
+positive_keywords = ["profit", "gain", "growth", "rise", "jump", "beat", "increase", "record high"]
+
+def score_headline(title):
+    # (polarity, weight) of a single headline
+    weight = 1.0
+    lowered = title.lower()
+
+    if "?" in title:
+        weight *= 0.5  # reduce impact of question headlines
+
+    if any(word in lowered for word in negative_keywords):
+        weight *= 1.2
+        polarity = -0.4
+    elif any(word in lowered for word in positive_keywords):
+        weight *= 1.2
+        polarity = 0.4
+    else:
+        polarity = headline_polarity(title)
+
+    return polarity, weight
+
+def sentiment_label(avg):
+    if avg > 0.1:
+        return "🟢 Positive sentiment"
+    elif avg < -0.1:
+        return "🔴 Negative sentiment"
+    return "🟡 Neutral sentiment"
+
+def sentiment_from_headlines(headlines):
+    try:
         if not headlines:
             return "🟡 Neutral (no major news found)", []
 
-        negative_keywords = ["decline", "drop", "loss", "down", "plunge", "cut", "fall", "dip", "decrease"]
-        positive_keywords = ["profit", "gain", "growth", "rise", "jump", "beat", "increase", "record high"]
-
         total_polarity = 0
         count = 0
 
         for title in headlines:
-            weight = 1.0
-            lowered = title.lower()
-
-            if "?" in title:
-                weight *= 0.5  # reduce impact of question headlines
-
-            if any(word in lowered for word in negative_keywords):
-                weight *= 1.2
-                polarity = -0.4
-            elif any(word in lowered for word in positive_keywords):
-                weight *= 1.2
-                polarity = 0.4
-            else:
-                polarity = TextBlob(title).sentiment.polarity
-
+            polarity, weight = score_headline(title)
             total_polarity += polarity * weight
             count += 1
 
         avg = total_polarity / count if count else 0
-
-        if avg > 0.1:
-            sentiment = "🟢 Positive sentiment"
-        elif avg < -0.1:
-            sentiment = "🔴 Negative sentiment"
-        else:
-            sentiment = "🟡 Neutral sentiment"
-
-        return sentiment, headlines
+        return sentiment_label(avg), headlines
     except Exception as e:
         return f"⚠️ Unable to fetch sentiment: {e}", []
 
@@ -91,20 +165,64 @@ sector_benchmarks = {
 }
 
 # ---------------- Sector Mapping ----------------
+sector_map = {
+    "Information Technology": "IT",
+    "Utilities": "Utilities",
+    "Banking": "Banking",
+    "Financial Services": "Banking",
+    "Consumer Defensive": "FMCG",
+    "Consumer Cyclical": "Auto",
+    "Auto": "Auto",
+    "Industrial": "Auto"
+}
+
 def determine_sector(info):
-    sector_map = {
-        "Information Technology": "IT",
-        "Utilities": "Utilities",
-        "Banking": "Banking",
-        "Financial Services": "Banking",
-        "Consumer Defensive": "FMCG",
-        "Consumer Cyclical": "Auto",
-        "Auto": "Auto",
-        "Industrial": "Auto"
-    }
     raw_sector = info.get("sector", "Default")
     return sector_map.get(raw_sector, "Default")
 
+# ---------------- Valuation & MarketMind Score ----------------
+# Exit P/E used by the intrinsic value model
+custom_sector_pe = {
+    "Power": 35,
+    "Infrastructure": 30,
+    "Renewable": 40,
+    "Default": 15
+}
+
+# Sector Outlook Multiplier
+sector_outlook_map = {
+    "Renewable": 15,
+    "EV": 10,
+    "IT": 5,
+    "Banking": 0,
+    "FMCG": 0,
+    "Oil": -15,
+    "Coal": -15,
+    "Industrial": -10,
+    "Default": 0
+}
+
+GROWTH_RATE = 0.15
+DISCOUNT_RATE = 0.10
+YEARS = 5
+
+def intrinsic_value(eps, sector_pe, growth_rate=GROWTH_RATE, discount_rate=DISCOUNT_RATE, years=YEARS):
+    # Works on scalars and NumPy arrays alike; returns (projected_eps, intrinsic)
+    projected_eps = eps * ((1 + growth_rate) ** years)
+    return projected_eps, (projected_eps * sector_pe) / ((1 + discount_rate) ** years)
+
+def marketmind_score(score, verdict, sector):
+    base_score = score * 15 + (25 if '✅ Undervalued' in verdict else 10)
+    adjusted_score = min(100, max(0, base_score + sector_outlook_map.get(sector, 0)))
+    return base_score, adjusted_score
+
+def final_verdict(adjusted_score):
+    if adjusted_score >= 80:
+        return "BUY"
+    elif adjusted_score >= 60:
+        return "WATCH"
+    return "AVOID"
+
 # ---------------- Helper ----------------
 def extract_number(value):
     try:
@@ -114,20 +232,83 @@ def extract_number(value):
     except:
         return None
 
+def _finite(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value) if math.isfinite(value) else None
+
+# ---------------- Fundamentals Record ----------------
+# (report label, attribute, unit) in display order
+REPORT_FIELDS = (
+    ("PE Ratio", "pe", ""),
+    ("ROE", "roe", "%"),
+    ("EPS Growth", "eps_growth", "%"),
+    ("Free Cash Flow", "fcf", " Cr"),
+    ("Profit Margin", "margin", "%"),
+    ("PB Ratio", "pb", ""),
+)
+
+class Fundamentals:
+    # Raw numbers only; None means "N/A". Percentages are stored already x100.
+    __slots__ = ("pe", "roe", "eps_growth", "fcf", "margin", "pb", "eps", "price")
+
+    def __init__(self, pe=None, roe=None, eps_growth=None, fcf=None, margin=None, pb=None, eps=None, price=None):
+        self.pe = pe
+        self.roe = roe
+        self.eps_growth = eps_growth
+        self.fcf = fcf
+        self.margin = margin
+        self.pb = pb
+        self.eps = eps
+        self.price = price
+
+    @classmethod
+    def from_info(cls, info):
+        roe = _finite(info.get("returnOnEquity"))
+        margin = _finite(info.get("profitMargins"))
+        return cls(
+            pe=_finite(info.get("trailingPE")),
+            roe=roe * 100 if roe else None,
+            margin=margin * 100 if margin else None,
+            pb=_finite(info.get("priceToBook")),
+            eps=_finite(info.get("trailingEps")),
+            price=_finite(info.get("currentPrice")),
+        )
+
+    @classmethod
+    def from_report(cls, report):
+        # Legacy string reports such as {"PE Ratio": "23.4", "ROE": "18.2%"}
+        return cls(**{attr: extract_number(report.get(label, "0")) for label, attr, _ in REPORT_FIELDS})
+
+    def score(self):
+        return sum(1 for _, attr, _ in REPORT_FIELDS if (getattr(self, attr) or 0) > 0)
+
+    def display_items(self):
+        # (label, formatted value, is_positive) for the fields that are available
+        for label, attr, unit in REPORT_FIELDS:
+            value = getattr(self, attr)
+            if value is not None:
+                yield label, f"{value:.2f}{unit}", value > 0
+
+    def as_dict(self):
+        return {attr: getattr(self, attr) for attr in self.__slots__}
+
 # ---------------- AI Summary ----------------
-def ai_summary_from_metrics(report, score, sector="Default"):
+def ai_summary_from_metrics(report, score, sector="Default", benchmarks=None):
+    # benchmarks: {"PE", "PB"} to compare against, e.g. the sector's current
+    # peers from sector_index.sector_benchmark; defaults to the static table
     strengths, weaknesses = [], []
     risk_level = "Moderate"
+    if benchmarks is None:
+        benchmarks = sector_benchmarks.get(sector, sector_benchmarks["Default"])
 
-    pe = extract_number(report.get("PE Ratio", "0"))
-    roe = extract_number(report.get("ROE", "0%"))
-    eps_growth = extract_number(report.get("EPS Growth", "0%"))
-    fcf = extract_number(report.get("Free Cash Flow", "0"))
-    margin = extract_number(report.get("Profit Margin", "0%"))
-    pb = extract_number(report.get("PB Ratio", "0"))
+    if not isinstance(report, Fundamentals):
+        report = Fundamentals.from_report(report)
+    pe, roe, eps_growth = report.pe, report.roe, report.eps_growth
+    fcf, margin, pb = report.fcf, report.margin, report.pb
 
     if pe is not None and pe > 0:
-        avg = sector_benchmarks.get(sector, sector_benchmarks["Default"])["PE"]
+        avg = round(benchmarks["PE"], 2)
         if pe < avg:
             strengths.append(f"valuation is low vs sector avg P/E ({pe} < {avg})")
         elif pe > avg:
@@ -165,7 +346,7 @@ def ai_summary_from_metrics(report, score, sector="Default"):
             weaknesses.append(f"profit margin is zero or negative ({margin}%)")
 
     if pb is not None:
-        avg = sector_benchmarks.get(sector, sector_benchmarks["Default"])["PB"]
+        avg = round(benchmarks["PB"], 2)
         if pb > 0 and pb < avg:
             strengths.append(f"book value is attractive (PB < sector avg {avg})")
         elif pb < 0 or pb > avg * 1.2:
@@ -190,7 +371,7 @@ def ai_summary_from_metrics(report, score, sector="Default"):
     return summary
 
 # ---------------- Advice & Scoring Function ----------------
-def print_advice_section(score, verdict, risk, horizon):
+def compute_buy_score(score, verdict, risk, horizon):
     score_components = []
 
     score_components.append(score * 5)  # Fundamentals (max 30)
@@ -213,7 +394,10 @@ def print_advice_section(score, verdict, risk, horizon):
     else:
         score_components.append(10)
 
-    buy_score = min(100, sum(score_components))
+    return min(100, sum(score_components))
+
+def print_advice_section(score, verdict, risk, horizon):
+    buy_score = compute_buy_score(score, verdict, risk, horizon)
 
     print(f"\n🎯 Investor Profile: {risk} Risk | {horizon}")
     print(f"\n✅ Buy Score: {buy_score}/100")
@@ -231,92 +415,113 @@ def print_advice_section(score, verdict, risk, horizon):
 
 # ---------------- Main Execution ----------------
 if __name__ == "__main__":
-    symbol = input("Enter Indian stock symbol (e.g., INFY.NS): ").strip().upper()
-
-    try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
-
-        report = {
-            "PE Ratio": str(info.get("trailingPE", "N/A")),
-            "ROE": str(info.get("returnOnEquity", 0) * 100) + "%" if info.get("returnOnEquity") else "N/A",
-            "EPS Growth": "N/A",
-            "Free Cash Flow": "N/A",
-            "Profit Margin": str(info.get("profitMargins", 0) * 100) + "%" if info.get("profitMargins") else "N/A",
-            "PB Ratio": str(info.get("priceToBook", "N/A")),
-        }
-
-        score = sum(
-            1 for v in report.values()
-            if v != "N/A" and extract_number(v) is not None and extract_number(v) > 0
-        )
-        sector = determine_sector(info)
-
-        print("\n📊 Fundamental Report")
-        print("---------------------")
-        for k, v in report.items():
-            if v == "N/A":
-                continue
-            icon = "✅" if ("%" in v and "-" not in v) or ("Cr" in v and "-" not in v) or extract_number(v) > 0 else "❌"
-            print(f"{k}: {v} {icon}")
-
-        print(f"\nFinal Score: {score}/6")
-
-        print("\n🧠 AI Summary:")
-        print(ai_summary_from_metrics(report, score, sector))
-
-        # -------- Valuation --------
-        print("\n💰 Valuation Analysis")
-        verdict = "Valuation Verdict: N/A"
+    import argparse
+    import sys
+
+    from batch import add_arguments as add_batch_arguments, run_cli as run_batch_cli
+    from instrumentation import span, trace, format_table, snapshot
+
+    parser = argparse.ArgumentParser(description="MarketMind analysis of one NSE/BSE stock.")
+    parser.add_argument("symbol", nargs="?", help="e.g. INFY.NS (asked for when omitted)")
+    parser.add_argument("--profile", action="store_true", help="print per-stage timings after the analysis")
+    parser.add_argument("--batch", metavar="FILE", help="analyze every symbol in FILE (one per line) in parallel")
+    batch_options = parser.add_argument_group("batch options")
+    add_batch_arguments(batch_options)
+    args = parser.parse_args()
+    if args.batch:
+        sys.exit(run_batch_cli(args.batch, args))
+    symbol = (args.symbol or input("Enter Indian stock symbol (e.g., INFY.NS): ")).strip().upper()
+
+    with trace() as spans:
         try:
-            eps = info.get("trailingEps")
-            current_price = info.get("currentPrice")
-            est_growth_rate = 0.15
-            years = 5
-            discount_rate = 0.10
-
-            if eps and current_price:
-                sector_pe = sector_benchmarks.get(sector, sector_benchmarks["Default"])["PE"]
-                projected_eps = eps * ((1 + est_growth_rate) ** years)
-                intrinsic = (projected_eps * sector_pe) / ((1 + discount_rate) ** years)
-
-                verdict = "✅ Undervalued" if intrinsic > current_price else "❌ Overvalued"
-                print(f"Projected EPS (5yr @ 15%): ₹{projected_eps:.2f}")
-                print(f"Intrinsic Value (discounted): ₹{intrinsic:.2f}")
-                print(f"Current Price: ₹{current_price}")
-                print(f"Valuation Verdict: {verdict}")
-            else:
-                print("Valuation Verdict: N/A (missing EPS or price)")
-
-        except Exception as ve:
-            print(f"[ERROR] Valuation failed: {ve}")
-
-
-        # ---- Market Psychology ----
-        print("\n" + get_market_psychology(symbol))
-
-        # -------- News Sentiment --------
-        print("\n📰 News Sentiment Analysis")
-        sentiment, headlines = get_news_sentiment(symbol)
-        print(f"Sentiment: {sentiment}")
-        if headlines:
-            print("Recent headlines:")
-            for h in headlines:
-                print(f"- {h}")
-
-    except Exception as e:
-        print(f"[ERROR] Failed to fetch or process data: {e}")
-
-
-    # -------- Final Recommendation --------
-    print("\n📊 Buy Recommendation")
-    if score >= 5 and '✅ Undervalued' in verdict and "🟢 Positive sentiment" in sentiment:
-        print("✅ Strong Buy: Undervalued with solid fundamentals and positive sentiment.")
-    elif score >= 4 and '✅ Undervalued' in verdict:
-        print("✅ Likely Buy: Good fundamentals, undervaluation detected.")
-    elif score >= 3 and '🟡 Neutral sentiment' in sentiment:
-        print("⚠️ Watch: Fundamentals are average. Wait for better signal.")
-    elif score < 3 or '❌ Overvalued' in verdict:
-        print("❌ Avoid: Weak fundamentals or overvaluation.")
-    else:
-        print("⚠️ Neutral: Mixed signals. More analysis needed.")
\ No newline at end of file
+            from pipeline import fetch_inputs, psychology_from_inputs, sentiment_from_inputs
+
+            inputs = fetch_inputs(symbol)
+            if "info" in inputs["errors"]:
+                raise inputs["errors"]["info"]
+            info = inputs["info"]
+
+            with span("analysis.fundamentals"):
+                report = Fundamentals.from_info(info)
+                score = report.score()
+                sector = determine_sector(info)
+
+            print("\n📊 Fundamental Report")
+            print("---------------------")
+            for k, v, positive in report.display_items():
+                icon = "✅" if positive else "❌"
+                print(f"{k}: {v} {icon}")
+
+            print(f"\nFinal Score: {score}/6")
+
+            print("\n🧠 AI Summary:")
+            from sector_index import sector_benchmark
+            print(ai_summary_from_metrics(report, score, sector, sector_benchmark(sector)))
+
+            # -------- Valuation --------
+            print("\n💰 Valuation Analysis")
+            verdict = "Valuation Verdict: N/A"
+            try:
+                eps = report.eps
+                current_price = report.price
+
+                if eps is not None and current_price is not None:
+                    from sector_index import valuation_pe
+                    sector_pe = valuation_pe(sector)
+                    projected_eps, intrinsic = intrinsic_value(eps, sector_pe)
+
+                    verdict = "✅ Undervalued" if intrinsic > current_price else "❌ Overvalued"
+                    print(f"Projected EPS ({YEARS}yr @ {GROWTH_RATE:.0%}): ₹{projected_eps:.2f}")
+                    print(f"Intrinsic Value (discounted): ₹{intrinsic:.2f}")
+                    print(f"Current Price: ₹{current_price}")
+                    print(f"Valuation Verdict: {verdict}")
+
+                    from valuation import monte_carlo, DRAWS
+                    with span("analysis.monte_carlo"):
+                        mc = monte_carlo(eps, sector_pe, current_price).iloc[0]
+                    print(f"Monte Carlo ({DRAWS:,} scenarios): P5 ₹{mc['p5']:.2f} | P50 ₹{mc['p50']:.2f} | P95 ₹{mc['p95']:.2f}")
+                    print(f"Probability Undervalued: {mc['prob_undervalued'] * 100:.1f}%")
+                else:
+                    print("Valuation Verdict: N/A (missing EPS or price)")
+
+            except Exception as ve:
+                print(f"[ERROR] Valuation failed: {ve}")
+
+
+            # ---- Market Psychology ----
+            with span("analysis.psychology"):
+                psychology = psychology_from_inputs(inputs)
+            print("\n" + psychology)
+
+            # -------- News Sentiment --------
+            print("\n📰 News Sentiment Analysis")
+            sentiment, headlines = sentiment_from_inputs(inputs)
+            print(f"Sentiment: {sentiment}")
+            if headlines:
+                print("Recent headlines:")
+                for h in headlines:
+                    print(f"- {h}")
+
+        except Exception as e:
+            print(f"[ERROR] Failed to fetch or process data: {e}")
+
+
+        # -------- Final Recommendation --------
+        print("\n📊 Buy Recommendation")
+        if score >= 5 and '✅ Undervalued' in verdict and "🟢 Positive sentiment" in sentiment:
+            print("✅ Strong Buy: Undervalued with solid fundamentals and positive sentiment.")
+        elif score >= 4 and '✅ Undervalued' in verdict:
+            print("✅ Likely Buy: Good fundamentals, undervaluation detected.")
+        elif score >= 3 and '🟡 Neutral sentiment' in sentiment:
+            print("⚠️ Watch: Fundamentals are average. Wait for better signal.")
+        elif score < 3 or '❌ Overvalued' in verdict:
+            print("❌ Avoid: Weak fundamentals or overvaluation.")
+        else:
+            print("⚠️ Neutral: Mixed signals. More analysis needed.")
+
+    if args.profile:
+        print("\n⏱️ Profile")
+        print(format_table(spans))
+        metrics = snapshot()
+        for name, value in {**metrics["counters"], **metrics["gauges"]}.items():
+            print(f"{name}: {value}")
@@ -0,0 +1,228 @@
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from psychology import PSYCHOLOGY_WINDOW, ALERT_WINDOW, classify_alert, classify_psychology
+
+# Bar sources yield ticks: (timestamp, symbols, closes, volumes), one tick per
+# bar timestamp with at most one bar per symbol, in time order.
+CHUNK_ROWS = 200_000
+
+
+# ---------------- Ring-Buffer Rolling State ----------------
+class RingWindow:
+    # Last `window` closes and volumes of every symbol in fixed ring buffers,
+    # plus a running volume sum. Pushing a bar is O(1) per symbol and a tick
+    # updates all of its symbols with a handful of array operations.
+    def __init__(self, n, window):
+        self.window = window
+        self.closes = np.full((n, window), np.nan)
+        self.volumes = np.zeros((n, window))
+        self.volume_sum = np.zeros(n)
+        self.pos = np.zeros(n, dtype=np.int64)
+        self.count = np.zeros(n, dtype=np.int64)
+
+    def grow(self, n):
+        extra = n - len(self.pos)
+        if extra > 0:
+            self.closes = np.vstack([self.closes, np.full((extra, self.window), np.nan)])
+            self.volumes = np.vstack([self.volumes, np.zeros((extra, self.window))])
+            self.volume_sum = np.concatenate([self.volume_sum, np.zeros(extra)])
+            self.pos = np.concatenate([self.pos, np.zeros(extra, dtype=np.int64)])
+            self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+
+    def push(self, idx, close, volume):
+        # idx: unique symbol rows. Returns the rolling_stats values of the new bar:
+        # (% change from the window's first close, mean volume, bar volume)
+        slot = self.pos[idx]
+        self.volume_sum[idx] += volume - self.volumes[idx, slot]
+        self.closes[idx, slot] = close
+        self.volumes[idx, slot] = volume
+        self.pos[idx] = (slot + 1) % self.window
+        self.count[idx] = np.minimum(self.count[idx] + 1, self.window)
+
+        # Re-sum once per lap so the running sum never drifts
+        lap = idx[self.pos[idx] == 0]
+        if len(lap):
+            self.volume_sum[lap] = self.volumes[lap].sum(axis=1)
+
+        full = self.count[idx] == self.window
+        start = np.where(full, self.closes[idx, self.pos[idx]], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price_change = (close - start) / start * 100
+        avg_volume = np.where(full, self.volume_sum[idx] / self.window, np.nan)
+        return price_change, avg_volume, volume
+
+
+# ---------------- Watchlist Monitor ----------------
+class Monitor:
+    # The 7-day Behavioral Alert and the 1-month market psychology regime of every
+    # watched symbol, updated bar by bar. Only changes are reported.
+    def __init__(self, symbols=(), alert_window=ALERT_WINDOW, psychology_window=PSYCHOLOGY_WINDOW):
+        self.index = {}
+        self.alert = RingWindow(0, alert_window)
+        self.psychology = RingWindow(0, psychology_window)
+        self.alert_state = np.empty(0, dtype=object)
+        self.regime_state = np.empty(0, dtype=object)
+        self.watch(symbols)
+
+    def watch(self, symbols):
+        for symbol in symbols:
+            self.index.setdefault(symbol, len(self.index))
+        n = len(self.index)
+        self.alert.grow(n)
+        self.psychology.grow(n)
+        self.alert_state = np.concatenate([self.alert_state, np.full(n - len(self.alert_state), None)])
+        self.regime_state = np.concatenate([self.regime_state, np.full(n - len(self.regime_state), None)])
+
+    def update(self, when, symbols, closes, volumes, watched_only=False):
+        # One tick of bars -> list of change events
+        symbols = list(symbols)
+        if not watched_only:
+            self.watch(s for s in symbols if s not in self.index)
+        rows = np.array([self.index.get(s, -1) for s in symbols], dtype=np.int64)
+        keep = rows >= 0
+        rows = rows[keep]
+        if not len(rows):
+            return []
+        closes = np.asarray(closes, dtype=float)[keep]
+        volumes = np.asarray(volumes, dtype=float)[keep]
+        names = np.asarray(symbols, dtype=object)[keep]
+
+        events = []
+        change, avg_volume, latest = self.alert.push(rows, closes, volumes)
+        alert = classify_alert(change, avg_volume, latest)
+        events += self._changes(when, names, rows, "alert", alert, change, self.alert_state)
+
+        change, avg_volume, latest = self.psychology.push(rows, closes, volumes)
+        regime, _ = classify_psychology(change, avg_volume, latest)
+        events += self._changes(when, names, rows, "psychology", regime, change, self.regime_state)
+        return events
+
+    def push(self, when, symbol, close, volume):
+        return self.update(when, [symbol], [close], [volume])
+
+    def _changes(self, when, names, rows, kind, labels, change, state):
+        changed = np.flatnonzero(labels != state[rows])
+        previous = state[rows[changed]]
+        state[rows[changed]] = labels[changed]
+        return [
+            {
+                "time": str(when),
+                "symbol": names[i],
+                "kind": kind,
+                "state": labels[i],
+                "previous": before,
+                "price_change": None if np.isnan(change[i]) else round(float(change[i]), 4),
+            }
+            for i, before in zip(changed, previous)
+        ]
+
+    def states(self):
+        symbols = list(self.index)
+        return pd.DataFrame({"alert": self.alert_state, "psychology": self.regime_state}, index=symbols)
+
+
+# ---------------- Bar Sources ----------------
+def csv_bars(path, chunksize=CHUNK_ROWS):
+    # Long-format CSV (Date, Symbol, Close, Volume, ...) sorted by Date; read in
+    # chunks so a multi-year, thousand-symbol replay never sits in memory at once
+    carry = None
+    for chunk in pd.read_csv(path, usecols=["Date", "Symbol", "Close", "Volume"], chunksize=chunksize):
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        # The last timestamp may continue in the next chunk
+        last = chunk["Date"].iloc[-1]
+        carry = chunk[chunk["Date"] == last]
+        yield from _ticks(chunk[chunk["Date"] != last])
+    if carry is not None:
+        yield from _ticks(carry)
+
+
+def _ticks(frame):
+    for when, group in frame.groupby("Date", sort=False):
+        yield when, group["Symbol"].to_numpy(), group["Close"].to_numpy(float), group["Volume"].to_numpy(float)
+
+
+def store_bars(store, symbols, start=None):
+    # Replays the memory-mapped price store in timestamp order
+    windows = {s: store.window(s, start) for s in symbols}
+    windows = {s: w for s, w in windows.items() if w is not None and len(w["Date"])}
+    if not windows:
+        return
+    names = np.concatenate([np.full(len(w["Date"]), s, dtype=object) for s, w in windows.items()])
+    dates = np.concatenate([w["Date"] for w in windows.values()])
+    closes = np.concatenate([w["Close"] for w in windows.values()])
+    volumes = np.concatenate([w["Volume"] for w in windows.values()])
+    order = np.argsort(dates, kind="stable")
+    dates, names, closes, volumes = dates[order], names[order], closes[order], volumes[order]
+    bounds = np.flatnonzero(np.diff(dates.view("i8"))) + 1
+    for lo, hi in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(dates)]))):
+        yield pd.Timestamp(dates[lo], tz="UTC"), names[lo:hi], closes[lo:hi], volumes[lo:hi]
+
+
+def write_bars_csv(path, frames):
+    # {symbol: OHLCV frame} -> long-format replay file for csv_bars
+    rows = []
+    for symbol, frame in frames.items():
+        rows.append(pd.DataFrame({
+            "Date": frame.index, "Symbol": symbol, "Close": frame["Close"].to_numpy(), "Volume": frame["Volume"].to_numpy(),
+        }))
+    pd.concat(rows).sort_values("Date", kind="stable").to_csv(path, index=False)
+
+
+# ---------------- Replay Loop ----------------
+def run(monitor, ticks, speed=0.0, out=sys.stdout, watched_only=False):
+    # speed > 0 sleeps that many seconds between ticks to mimic a live feed
+    stats = {"ticks": 0, "bars": 0, "events": 0}
+    start = time.perf_counter()
+    for when, symbols, closes, volumes in ticks:
+        for event in monitor.update(when, symbols, closes, volumes, watched_only):
+            out.write(json.dumps(event, ensure_ascii=False) + "\n")
+            stats["events"] += 1
+        stats["ticks"] += 1
+        stats["bars"] += len(symbols)
+        if speed:
+            time.sleep(speed)
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream behavioral alert changes for a watchlist.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--bars", help="long-format CSV of bars: Date, Symbol, Close, Volume")
+    source.add_argument("--store", action="store_true", help="replay the local memory-mapped price store")
+    parser.add_argument("--watchlist", help="file with one symbol per line (default: every symbol in the source)")
+    parser.add_argument("--speed", type=float, default=0.0, help="seconds to wait between ticks")
+    parser.add_argument("--alert-window", type=int, default=ALERT_WINDOW)
+    parser.add_argument("--psychology-window", type=int, default=PSYCHOLOGY_WINDOW)
+    args = parser.parse_args()
+
+    watchlist = []
+    if args.watchlist:
+        with open(args.watchlist) as f:
+            watchlist = [line.strip().upper() for line in f if line.strip()]
+    monitor = Monitor(watchlist, args.alert_window, args.psychology_window)
+
+    if args.store:
+        from price_store import get_price_store
+
+        store = get_price_store()
+        ticks = store_bars(store, watchlist or store.symbols())
+    else:
+        ticks = csv_bars(args.bars)
+
+    stats = run(monitor, ticks, args.speed, watched_only=bool(watchlist))
+    print(
+        f"{stats['ticks']} ticks, {stats['bars']} bars, {stats['events']} changes in {stats['seconds']:.2f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import calendar
+import os
+import sqlite3
+import threading
+import time
+
+from gateway import UpstreamError, parse_feed
+from instrumentation import incr, span
+from marketmind_v5_final import news_url, sentiment_label
+
+# ---------------- Store Settings ----------------
+NEWS_STORE_PATH = os.environ.get(
+    "MARKETMIND_NEWS_STORE",
+    os.path.join(os.path.expanduser("~"), ".marketmind", "news.sqlite"),
+)
+REFRESH_INTERVAL = 5 * 60      # seconds between conditional GETs per symbol
+WINDOW_DAYS = 14               # sentiment aggregates headlines published in this window
+RETENTION_DAYS = 90            # older headlines are deleted at ingest (and never stored)
+DISPLAY_LIMIT = 5
+
+
+# ---------------- Incremental News Store ----------------
+class NewsStore:
+    def __init__(self, path=NEWS_STORE_PATH, refresh_interval=REFRESH_INTERVAL,
+                 retention_days=RETENTION_DAYS, url_for=news_url):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.retention_days = retention_days
+        self.url_for = url_for
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS feeds ("
+                " symbol TEXT PRIMARY KEY, etag TEXT, modified TEXT, checked_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS headlines ("
+                " symbol TEXT NOT NULL, guid TEXT NOT NULL, title TEXT NOT NULL, link TEXT,"
+                " published REAL NOT NULL, polarity REAL NOT NULL, weight REAL NOT NULL,"
+                " PRIMARY KEY (symbol, guid))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS headlines_recent ON headlines(symbol, published)")
+            self._conn.commit()
+
+    def refresh(self, symbol, force=False):
+        # Conditional GET of the symbol's feed; only unseen GUIDs are scored and
+        # stored. Returns the number of new headlines.
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, modified, checked_at FROM feeds WHERE symbol = ?", (symbol,)
+            ).fetchone()
+        etag, modified, checked_at = row if row else (None, None, 0)
+        if not force and time.time() - checked_at < self.refresh_interval:
+            return 0
+
+        feed = parse_feed(self.url_for(symbol), etag=etag, modified=modified)
+        now = time.time()
+        if feed.get("status") == 304:
+            incr("news.not_modified")
+            self._mark_checked(symbol, etag, modified, now)
+            return 0
+
+        entries = {}
+        for entry in feed.entries:
+            title = entry.get("title")
+            if not title:
+                continue
+            guid = entry.get("id") or entry.get("link") or title
+            entries.setdefault(guid, entry)
+
+        with self._lock:
+            known = set()
+            guids = list(entries)
+            for i in range(0, len(guids), 500):
+                chunk = guids[i:i + 500]
+                known.update(g for (g,) in self._conn.execute(
+                    f"SELECT guid FROM headlines WHERE symbol = ? AND guid IN ({','.join('?' * len(chunk))})",
+                    [symbol, *chunk],
+                ))
+
+        from sentiment_batch import score_headlines
+
+        # Entries past the retention horizon would only be pruned again
+        cutoff = now - self.retention_days * 86400
+        unseen = [
+            (guid, entry) for guid, entry in entries.items()
+            if guid not in known and _published(entry, now) >= cutoff
+        ]
+        with span("sentiment.score"):
+            polarities, weights = score_headlines([entry.title for _, entry in unseen])
+        fresh = []
+        for (guid, entry), polarity, weight in zip(unseen, polarities.tolist(), weights.tolist()):
+            fresh.append((symbol, guid, entry.title, entry.get("link"), _published(entry, now), polarity, weight))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO headlines (symbol, guid, title, link, published, polarity, weight)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                fresh,
+            )
+            pruned = self._conn.execute("DELETE FROM headlines WHERE published < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        if pruned:
+            incr("news.pruned", pruned)
+        self._mark_checked(symbol, feed.get("etag", etag), feed.get("modified", modified), now)
+        return len(fresh)
+
+    def _mark_checked(self, symbol, etag, modified, when):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feeds (symbol, etag, modified, checked_at) VALUES (?, ?, ?, ?)",
+                (symbol, etag, modified, when),
+            )
+            self._conn.commit()
+
+    def recent(self, symbol, days=WINDOW_DAYS, limit=None):
+        # [(title, link, published, polarity, weight)] newest first
+        query = ("SELECT title, link, published, polarity, weight FROM headlines"
+                 " WHERE symbol = ? AND published >= ? ORDER BY published DESC")
+        params = [symbol, time.time() - days * 86400]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    def aggregate(self, symbol, days=WINDOW_DAYS):
+        # (weighted polarity sum, headline count) over the window, computed in SQLite
+        with self._lock:
+            total, count = self._conn.execute(
+                "SELECT COALESCE(SUM(polarity * weight), 0), COUNT(*) FROM headlines"
+                " WHERE symbol = ? AND published >= ?",
+                (symbol, time.time() - days * 86400),
+            ).fetchone()
+        return total, count
+
+    def sentiment(self, symbol, days=WINDOW_DAYS, refresh=True):
+        # Same labels as sentiment_from_headlines, over every headline in the window
+        if refresh:
+            try:
+                self.refresh(symbol)
+            except UpstreamError:
+                # Feed still unreachable after the gateway's retries: answer from
+                # the stored headlines if there are any
+                incr("news.refresh_failed")
+                if not self.recent(symbol, days=365 * 100, limit=1):
+                    raise
+        total, count = self.aggregate(symbol, days)
+        if count:
+            headlines = [row[0] for row in self.recent(symbol, days, DISPLAY_LIMIT)]
+            return sentiment_label(total / count), headlines
+
+        # Nothing inside the window: fall back to the newest stored headlines
+        rows = self.recent(symbol, days=365 * 100, limit=DISPLAY_LIMIT)
+        if not rows:
+            return "🟡 Neutral (no major news found)", []
+        avg = sum(polarity * weight for _, _, _, polarity, weight in rows) / len(rows)
+        return sentiment_label(avg), [row[0] for row in rows]
+
+
+def _published(entry, default):
+    published = entry.get("published_parsed")
+    return calendar.timegm(published) if published else default
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_news_store():
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = NewsStore()
+        return _default_store
+
+
+def news_sentiment(symbol):
+    return get_news_store().sentiment(symbol)
+
+
+def cached_news_sentiment(symbol):
+    # Sentiment of the stored headlines without refreshing the feed, or None when
+    # nothing was ever stored for the symbol (deadline fallback)
+    store = get_news_store()
+    if not store.recent(symbol, days=365 * 100, limit=1):
+        return None
+    return store.sentiment(symbol, refresh=False)
@@ -0,0 +1,186 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed
+
+from instrumentation import incr, span, timed, in_context
+
+from data_cache import get_info, cached_info, cached_history
+from price_store import sync_history, recent_windows
+from news_store import news_sentiment, cached_news_sentiment
+from marketmind_v5_final import (
+    Fundamentals,
+    determine_sector,
+    intrinsic_value,
+    marketmind_score,
+    final_verdict,
+    ai_summary_from_metrics,
+    market_psychology_from_history,
+)
+from psychology import latest_alert
+from sector_index import sector_benchmark, valuation_pe
+
+# Shared by every analysis in the process (Streamlit sessions run as threads).
+# Sized so a full comparison (3 sources x MAX_COMPARE symbols) is in flight at
+# once; the gateway still caps what actually reaches Yahoo.
+MAX_COMPARE = 20
+_executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix="marketmind-fetch")
+_analysis_executor = ThreadPoolExecutor(max_workers=MAX_COMPARE, thread_name_prefix="marketmind-analysis")
+
+# Seconds an interactive page waits in total and per source before it renders
+# with whatever is available (see fetch_inputs)
+PAGE_BUDGET = 6.0
+SOURCE_DEADLINES = {"info": 5.0, "history": 4.0, "news": 3.0}
+
+# Per-source state in inputs["status"]
+FRESH, STALE, PENDING, FAILED = "fresh", "stale", "pending", "error"
+
+
+def normalize_symbol(symbol):
+    # Same rule as the Streamlit input: bare tickers are NSE listings
+    symbol = symbol.strip().upper()
+    return symbol if symbol.endswith((".NS", ".BSE")) else symbol + ".NS"
+
+
+# ---------------- Concurrent Fetch ----------------
+def fetch_inputs(symbol, budget=None, deadlines=None):
+    # Fundamentals, one month of bars and the news feed are requested at the same
+    # time, so an analysis waits for the slowest source rather than the sum of all.
+    # With a budget, no source is waited on past its deadline (or the budget):
+    # late or failed sources fall back to the last cached value ("stale") or are
+    # left "pending" while their fetch finishes in the background and warms the
+    # caches for the next run. Without a budget every source is awaited.
+    deadlines = dict(SOURCE_DEADLINES, **(deadlines or {})) if budget is not None else {}
+    with span("fetch_inputs"):
+        start = time.monotonic()
+        futures = {
+            name: _executor.submit(in_context(timed(f"fetch.{name}")(fetch)), symbol)
+            for name, fetch in (("info", get_info), ("history", sync_history), ("news", news_sentiment))
+        }
+
+        inputs = {"symbol": symbol, "errors": {}, "status": {}}
+        for name, future in futures.items():
+            timeout = None
+            if budget is not None:
+                timeout = max(0.0, start + min(budget, deadlines.get(name, budget)) - time.monotonic())
+            try:
+                inputs[name] = future.result(timeout=timeout)
+                inputs["status"][name] = FRESH
+            except FutureTimeout:
+                incr(f"deadline.{name}.missed")
+                _fall_back(inputs, name, PENDING, TimeoutError(f"{name} is still loading"))
+            except Exception as e:
+                _fall_back(inputs, name, FAILED, e)
+
+        inputs["window_1mo"], inputs["window_7d"] = recent_windows(symbol, inputs["history"])
+        if inputs["status"]["history"] != FRESH and "history" in inputs["errors"] and inputs["window_1mo"] is not None:
+            # Bars already in the local price store stand in for the late fetch
+            inputs["status"]["history"] = STALE
+            inputs.setdefault("stale_reasons", {})["history"] = inputs["errors"].pop("history")
+    return inputs
+
+
+_CACHED = {"info": cached_info, "history": cached_history, "news": cached_news_sentiment}
+
+
+def _fall_back(inputs, name, state, error):
+    try:
+        value = _CACHED[name](inputs["symbol"])
+    except Exception:
+        value = None
+    if value is not None:
+        inputs[name] = value
+        inputs["status"][name] = STALE
+        inputs.setdefault("stale_reasons", {})[name] = error
+    else:
+        inputs[name] = None
+        inputs["status"][name] = state
+        inputs["errors"][name] = error
+
+
+# ---------------- Derived Sections ----------------
+def psychology_from_inputs(inputs):
+    if "history" in inputs["errors"]:
+        return f"🧠 Market Psychology: ⚠️ Unable to analyze ({inputs['errors']['history']})"
+    return market_psychology_from_history(inputs["window_1mo"])
+
+
+def alert_from_inputs(inputs):
+    # (behavioral alert, 7-day % change) of the latest bar; (None, None) without bars
+    history = inputs.get("window_7d")
+    if "history" in inputs["errors"] or history is None or not len(history["Close"]):
+        return None, None
+    alert, price_change = latest_alert(history["Close"], history["Volume"])
+    return alert, None if price_change != price_change else float(price_change)
+
+
+def sentiment_from_inputs(inputs):
+    if "news" in inputs["errors"]:
+        return f"⚠️ Unable to fetch sentiment: {inputs['errors']['news']}", []
+    return inputs["news"]
+
+
+# ---------------- Full Analysis ----------------
+def analysis_report(inputs):
+    # Everything the Overview/Valuation/Sentiment/Recommendation tabs show, as
+    # plain JSON-serialisable values
+    errors = {name: str(e) for name, e in inputs["errors"].items()}
+    result = {"symbol": inputs["symbol"], "errors": errors, "status": dict(inputs.get("status", {}))}
+    if "info" in errors:
+        return result
+
+    info = inputs["info"]
+    with span("analysis.fundamentals"):
+        sector = determine_sector(info)
+        report = Fundamentals.from_info(info)
+        score = report.score()
+        summary = ai_summary_from_metrics(report, score, sector, sector_benchmark(sector))
+
+    valuation = {"eps": report.eps, "current_price": report.price, "verdict": "N/A"}
+    if report.eps is not None and report.price is not None:
+        with span("analysis.valuation"):
+            sector_pe = valuation_pe(sector)
+            projected_eps, intrinsic = intrinsic_value(report.eps, sector_pe)
+            valuation.update(
+                sector_pe=sector_pe,
+                projected_eps=projected_eps,
+                intrinsic_value=intrinsic,
+                verdict="✅ Undervalued" if intrinsic > report.price else "❌ Overvalued",
+            )
+    base_score, adjusted_score = marketmind_score(score, valuation["verdict"], sector)
+    sentiment, headlines = sentiment_from_inputs(inputs)
+    with span("analysis.psychology"):
+        psychology = psychology_from_inputs(inputs)
+        alert, alert_change = alert_from_inputs(inputs)
+
+    result.update(
+        sector=sector,
+        fundamentals=report.as_dict(),
+        score=score,
+        summary=summary,
+        valuation=valuation,
+        base_score=base_score,
+        adjusted_score=adjusted_score,
+        final_verdict=final_verdict(adjusted_score),
+        psychology=psychology,
+        alert=alert,
+        alert_change=alert_change,
+        sentiment=sentiment,
+        headlines=headlines,
+    )
+    return result
+
+
+# ---------------- Many Symbols ----------------
+def _analyze(symbol, budget):
+    try:
+        return analysis_report(fetch_inputs(symbol, budget=budget))
+    except Exception as e:
+        return {"symbol": symbol, "errors": {"analysis": str(e)}, "status": {}}
+
+
+def analyze_many(symbols, budget=None):
+    # Analyzes every symbol at the same time and yields each analysis_report as
+    # soon as it is ready, so the first result arrives after about one symbol's
+    # latency and the last after about the slowest one's
+    futures = [_analysis_executor.submit(in_context(_analyze), symbol, budget) for symbol in symbols]
+    for future in as_completed(futures):
+        yield future.result()
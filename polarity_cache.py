@@ -0,0 +1,208 @@
+import contextvars
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from instrumentation import register_collector
+
+# ---------------- Cache Settings ----------------
+# The same headline shows up in several symbols' feeds and in every session that
+# looks at them; its polarity only depends on the text and the scorer, so it is
+# memoised per process (LRU) and on disk for every process on the host.
+POLARITY_CACHE_PATH = os.environ.get(
+    "MARKETMIND_POLARITY_CACHE",
+    os.path.join(os.path.expanduser("~"), ".marketmind", "polarity.sqlite"),
+)
+MEMORY_ENTRIES = 20_000
+DISK_ENTRIES = 200_000
+
+
+def normalize(title):
+    # TextBlob's pattern analyzer lowercases and re-tokenizes, so case and
+    # whitespace runs never change the score
+    return " ".join(title.lower().split())
+
+
+_bypass = contextvars.ContextVar("polarity_cache_bypass", default=False)
+
+
+@contextmanager
+def bypassed():
+    # Every polarity requested inside is computed, not cached; only the calling
+    # thread/context is affected, so concurrent sessions keep using the cache
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def headline_key(title, version):
+    return hashlib.blake2b(f"{version}\n{normalize(title)}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ---------------- Two-tier Polarity Cache ----------------
+class PolarityCache:
+    def __init__(self, path=POLARITY_CACHE_PATH, memory_entries=MEMORY_ENTRIES, disk_entries=DISK_ENTRIES):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.enabled = True
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+        self._conn = None
+        try:
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            with self._lock:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS polarity ("
+                    " key TEXT PRIMARY KEY, polarity REAL NOT NULL, accessed_at REAL NOT NULL)"
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS polarity_lru ON polarity(accessed_at)")
+                self._conn.commit()
+        except sqlite3.Error:
+            self._conn = None  # memory tier only (e.g. read-only home directory)
+
+    def polarities(self, titles, compute, version):
+        # Polarity for every title; compute(list_of_titles) -> list of polarities is
+        # called once with only the titles neither tier has seen.
+        if not self.enabled or _bypass.get():
+            return [float(v) for v in compute(list(titles))]
+        keys = [headline_key(t, version) for t in titles]
+        result = [None] * len(titles)
+        missing = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    result[i] = self._memory[key]
+                    self.hits_memory += 1
+                else:
+                    missing.setdefault(key, []).append(i)
+
+        if missing:
+            found = self._disk_get(list(missing))
+            with self._lock:
+                for key, value in found.items():
+                    for i in missing.pop(key):
+                        result[i] = value
+                        self.hits_disk += 1
+                    self._remember(key, value)
+
+        if missing:
+            # Identical headlines within one batch are scored once
+            pending = list(missing)
+            values = compute([titles[missing[key][0]] for key in pending])
+            computed = dict(zip(pending, (float(v) for v in values)))
+            with self._lock:
+                for key, value in computed.items():
+                    for i in missing[key]:
+                        result[i] = value
+                    self.misses += 1
+                    self.hits_memory += len(missing[key]) - 1
+                    self._remember(key, value)
+            self._disk_set(computed)
+        return result
+
+    def polarity(self, title, compute, version):
+        return self.polarities([title], lambda ts: [compute(t) for t in ts], version)[0]
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, keys):
+        if self._conn is None:
+            return {}
+        found = {}
+        try:
+            with self._lock:
+                for i in range(0, len(keys), 500):
+                    chunk = keys[i:i + 500]
+                    found.update(self._conn.execute(
+                        f"SELECT key, polarity FROM polarity WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    ))
+                if found:
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE polarity SET accessed_at = ? WHERE key = ?", [(now, k) for k in found]
+                    )
+                    self._conn.commit()
+        except sqlite3.Error:
+            return {}  # another process holds the write lock; treat as a miss
+        return found
+
+    def _disk_set(self, values):
+        if self._conn is None or not values:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO polarity (key, polarity, accessed_at) VALUES (?, ?, ?)",
+                    [(k, v, now) for k, v in values.items()],
+                )
+                self._evict()
+                self._conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM polarity").fetchone()[0]
+        if count > self.disk_entries:
+            # Trim a tenth below the limit so eviction does not run on every insert
+            excess = count - int(self.disk_entries * 0.9)
+            self._conn.execute(
+                "DELETE FROM polarity WHERE key IN ("
+                " SELECT key FROM polarity ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def stats(self):
+        with self._lock:
+            hits = self.hits_memory + self.hits_disk
+            lookups = hits + self.misses
+            return {
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self.hits_memory = self.hits_disk = self.misses = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM polarity")
+                self._conn.commit()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_polarity_cache():
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = PolarityCache()
+            register_collector("polarity_cache", _default_cache.stats)
+        return _default_cache
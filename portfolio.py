@@ -0,0 +1,365 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from price_store import get_price_store, sync_history
+
+# ---------------- Portfolio Settings ----------------
+TRADING_DAYS = 252
+LOOKBACK = pd.DateOffset(years=1)     # returns window behind volatility and correlation
+REFRESH_PERIOD = "1y"                 # what --refresh fetches into the price store
+CHUNK_SYMBOLS = 64                    # holdings copied into the matrix per pass
+MIN_OVERLAP = 20                      # common return days needed for a correlation
+REFRESH_WORKERS = 8
+
+QUANTITY_COLUMNS = ("quantity", "qty", "shares", "units")
+WEIGHT_COLUMNS = ("weight", "allocation")
+
+
+# ---------------- Holdings ----------------
+def read_holdings(path):
+    # CSV with a symbol column and either quantities or weights; repeated
+    # symbols (several lots) are added up
+    from pipeline import normalize_symbol
+
+    frame = pd.read_csv(path)
+    frame.columns = [str(c).strip().lower() for c in frame.columns]
+    symbol_column = next((c for c in ("symbol", "ticker") if c in frame), None)
+    if symbol_column is None:
+        raise ValueError("holdings file needs a 'symbol' column")
+    amount_column = next((c for c in QUANTITY_COLUMNS + WEIGHT_COLUMNS if c in frame), None)
+    if amount_column is None:
+        raise ValueError(f"holdings file needs one of: {', '.join(QUANTITY_COLUMNS + WEIGHT_COLUMNS)}")
+
+    amounts = pd.to_numeric(frame[amount_column], errors="coerce")
+    holdings = pd.DataFrame({
+        "symbol": frame[symbol_column].astype(str).map(normalize_symbol),
+        "amount": amounts,
+    }).dropna()
+    holdings = holdings.groupby("symbol", sort=False)["amount"].sum()
+    kind = "weight" if amount_column in WEIGHT_COLUMNS else "quantity"
+    return holdings[holdings > 0].rename(kind)
+
+
+def refresh_prices(symbols, period=REFRESH_PERIOD, workers=REFRESH_WORKERS):
+    # Folds `period` of daily bars for every holding into the price store
+    # (through the cache and gateway); returns {symbol: error} for the failures
+    def sync(symbol):
+        try:
+            sync_history(symbol, period)
+            return symbol, None
+        except Exception as e:
+            return symbol, e
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return {symbol: e for symbol, e in pool.map(sync, symbols) if e is not None}
+
+
+# ---------------- Aligned Price Matrix ----------------
+def price_matrix(symbols, start=None, store=None, chunk=CHUNK_SYMBOLS):
+    # (dates, closes, volumes): one row per bar timestamp any holding traded,
+    # one column per holding, NaN where a holding has no bar. Holdings are read
+    # `chunk` at a time, each window once: the chunk's bar timestamps are merged
+    # into the calendar so far, then its columns are copied in, so besides the
+    # result only one chunk of memory-mapped windows is held at once.
+    store = store or get_price_store()
+    calendar = np.empty(0, dtype="datetime64[ns]")
+    closes = np.empty((0, len(symbols)))
+    volumes = np.empty((0, len(symbols)))
+    for lo in range(0, len(symbols), chunk):
+        windows = {}
+        for j in range(lo, min(lo + chunk, len(symbols))):
+            window = store.window(symbols[j], start)
+            if window is not None and len(window["Date"]):
+                windows[j] = window
+        if not windows:
+            continue
+        dates = np.unique(np.concatenate([calendar] + [w["Date"] for w in windows.values()]))
+        if len(dates) > len(calendar):
+            # New timestamps (rare once the first chunk set the trading calendar)
+            rows = np.searchsorted(dates, calendar)
+            closes, volumes = _widen(closes, rows, len(dates)), _widen(volumes, rows, len(dates))
+            calendar = dates
+        for j, window in windows.items():
+            rows = np.searchsorted(calendar, window["Date"])
+            closes[rows, j] = window["Close"]
+            volumes[rows, j] = window["Volume"]
+    return calendar, closes, volumes
+
+
+def _widen(matrix, rows, length):
+    # matrix re-laid onto a longer calendar: its rows land at `rows`, the rest NaN
+    out = np.full((length, matrix.shape[1]), np.nan)
+    out[rows] = matrix
+    return out
+
+
+def last_valid(matrix):
+    # Row index of each column's last non-NaN value (-1 for an empty column)
+    valid = ~np.isnan(matrix)
+    if not len(matrix):
+        return np.full(matrix.shape[1], -1)
+    last = len(matrix) - 1 - np.argmax(valid[::-1], axis=0)
+    return np.where(valid.any(axis=0), last, -1)
+
+
+# ---------------- Return & Risk Matrices ----------------
+def returns_matrix(closes):
+    # Daily simple returns; NaN wherever either close is missing
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return closes[1:] / closes[:-1] - 1
+
+
+def pairwise_moments(returns, min_overlap=MIN_OVERLAP):
+    # Covariance and correlation of every pair over the days both have a return
+    # (pairwise-complete, like DataFrame.corr), from a handful of matrix products
+    observed = (~np.isnan(returns)).astype(float)
+    x = np.nan_to_num(returns)
+    n = observed.T @ observed                      # common days
+    sx = x.T @ observed                            # sum of i's returns on days j also traded
+    sxx = (x * x).T @ observed
+    sxy = x.T @ x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (sxy - sx * sx.T / n) / (n - 1)
+        var_i = (sxx - sx * sx / n) / (n - 1)
+        corr = cov / np.sqrt(var_i * var_i.T)
+    too_few = n < min_overlap
+    cov[too_few] = np.nan
+    corr[too_few] = np.nan
+    np.fill_diagonal(corr, np.where(np.diag(n) >= min_overlap, 1.0, np.nan))
+    return cov, np.clip(corr, -1.0, 1.0)
+
+
+# ---------------- Market Psychology ----------------
+def window_signals(calendar, closes, volumes, offset):
+    # For every holding, the get_market_psychology measurements over the bars
+    # after (its last bar - offset): % change from the window's first close,
+    # mean volume and the last bar's volume
+    n = closes.shape[1]
+    change = np.full(n, np.nan)
+    avg_volume = np.full(n, np.nan)
+    latest_volume = np.full(n, np.nan)
+    last = last_valid(closes)
+    has = last >= 0
+    if not has.any() or not len(calendar):
+        return change, avg_volume, latest_volume
+
+    cutoffs = pd.DatetimeIndex(calendar[last[has]]) - offset
+    starts = np.full(n, len(calendar))
+    starts[has] = np.searchsorted(calendar, cutoffs.to_numpy(dtype="datetime64[ns]"), side="right")
+    rows = np.arange(len(calendar))[:, None]
+    valid = (rows >= starts) & (rows <= last) & ~np.isnan(closes)
+    count = valid.sum(axis=0)
+    ok = count > 0
+    cols = np.flatnonzero(ok)
+    first = np.argmax(valid, axis=0)
+
+    first_close = closes[first[cols], cols]
+    last_close = closes[last[cols], cols]
+    change[cols] = (last_close - first_close) / first_close * 100
+    avg_volume[cols] = np.where(valid, np.nan_to_num(volumes), 0.0).sum(axis=0)[cols] / count[cols]
+    latest_volume[cols] = volumes[last[cols], cols]
+    return change, avg_volume, latest_volume
+
+
+def psychology_flags(calendar, closes, volumes):
+    # 1-month regime and 7-day behavioral alert per holding, as get_market_psychology
+    # and the app's Behavioral Alert compute them one symbol at a time
+    from psychology import classify_psychology, classify_alert
+
+    regime, _ = classify_psychology(*window_signals(calendar, closes, volumes, pd.DateOffset(months=1)))
+    alert_change, alert_avg, alert_latest = window_signals(calendar, closes, volumes, pd.Timedelta(days=7))
+    alert = classify_alert(alert_change, alert_avg, alert_latest)
+    return regime, alert, alert_change
+
+
+# ---------------- Portfolio Report ----------------
+def fundamentals_for(symbols, refresh=False):
+    # Cached Yahoo info per holding ({} when never fetched); refresh loads misses
+    from data_cache import cached_info, get_info
+
+    infos = {}
+    for symbol in symbols:
+        info = cached_info(symbol)
+        if info is None and refresh:
+            try:
+                info = get_info(symbol)
+            except Exception:
+                info = None
+        infos[symbol] = info or {}
+    return infos
+
+
+def analyze_portfolio(holdings, refresh=False, lookback=LOOKBACK):
+    # holdings: Series of quantities (name "quantity") or weights (name "weight")
+    # indexed by symbol. Returns {"summary", "holdings", "sectors", "correlation"}.
+    from screener import fundamentals_frame, screen_universe
+    from sector_index import screen_tables
+
+    symbols = list(holdings.index)
+    if not symbols:
+        raise ValueError("no holdings with a positive quantity or weight")
+    errors = refresh_prices(symbols) if refresh else {}
+
+    calendar, closes, volumes = price_matrix(symbols)
+    last = last_valid(closes)
+    last_close = np.full(len(symbols), np.nan)
+    priced = np.flatnonzero(last >= 0)
+    last_close[priced] = closes[last[priced], priced]
+
+    # Weights: given directly, or market value at the last close
+    amounts = holdings.to_numpy(dtype=float)
+    value = amounts * last_close if holdings.name == "quantity" else np.full(len(symbols), np.nan)
+    base = np.nan_to_num(value) if holdings.name == "quantity" else amounts
+    weights = base / base.sum() if base.sum() > 0 else np.zeros(len(symbols))
+
+    # Returns over the lookback window only
+    start_row = 0
+    if len(calendar):
+        cutoff = pd.Timestamp(calendar[-1]) - lookback
+        start_row = int(np.searchsorted(calendar, cutoff.to_datetime64(), side="right"))
+    returns = returns_matrix(closes[start_row:])
+    cov, corr = pairwise_moments(returns)
+    # The diagonal is each holding's own variance over all of its return days
+    volatility = np.sqrt(np.diag(cov) * TRADING_DAYS)
+    # Pairs without enough common history add no covariance
+    annual_cov = np.nan_to_num(cov) * TRADING_DAYS
+    portfolio_vol = float(np.sqrt(max(weights @ annual_cov @ weights, 0.0)))
+
+    regime, alert, week_change = psychology_flags(calendar, closes, volumes)
+    scored = screen_universe(fundamentals_frame(fundamentals_for(symbols, refresh)).reindex(symbols), **screen_tables())
+    has_fundamentals = ~np.isnan(scored["pe"].to_numpy()) | ~np.isnan(scored["pb"].to_numpy())
+
+    table = pd.DataFrame({
+        "weight": weights,
+        "last_close": last_close,
+        "value": value,
+        "sector": scored["sector"].to_numpy(),
+        "score": np.where(has_fundamentals, scored["score"].to_numpy(), np.nan),
+        "adjusted_score": np.where(has_fundamentals, scored["adjusted_score"].to_numpy(), np.nan),
+        "final_verdict": np.where(has_fundamentals, scored["final_verdict"].to_numpy(), None),
+        "volatility": volatility,
+        "psychology": regime,
+        "alert": alert,
+        "week_change": week_change,
+    }, index=pd.Index(symbols, name="symbol"))
+    flagged = np.isin(regime, ["panic", "fomo"]) | np.isin(alert, ["panic", "fomo"])
+    panic = (regime == "panic") | (alert == "panic")
+    table["flag"] = np.where(panic, "panic", np.where(flagged, "fomo", None))
+    table["error"] = [str(errors[s]) if s in errors else None for s in symbols]
+
+    scores = table["adjusted_score"].to_numpy(dtype=float)
+    scored_weight = weights[~np.isnan(scores)].sum()
+    weighted_score = float(np.nansum(weights * scores) / scored_weight) if scored_weight > 0 else None
+
+    upper = np.triu_indices(len(symbols), k=1)
+    pair_weights = (weights[:, None] * weights[None, :])[upper]
+    pair_corr = corr[upper]
+    known = ~np.isnan(pair_corr)
+    avg_corr = float(np.average(pair_corr[known], weights=pair_weights[known])) \
+        if known.any() and pair_weights[known].sum() > 0 else None
+
+    hhi = float((weights ** 2).sum())
+    summary = {
+        "holdings": len(symbols),
+        "with_prices": int((last >= 0).sum()),
+        "with_fundamentals": int(has_fundamentals.sum()),
+        "total_value": float(np.nansum(value)) if holdings.name == "quantity" else None,
+        "weighted_score": weighted_score,
+        "weighted_verdict": _verdict(weighted_score),
+        "portfolio_volatility": portfolio_vol,
+        "weighted_avg_correlation": avg_corr,
+        "hhi": hhi,
+        "effective_holdings": 1 / hhi if hhi else None,
+        "top10_weight": float(np.sort(weights)[::-1][:10].sum()),
+        "flagged_panic": int((table["flag"] == "panic").sum()),
+        "flagged_fomo": int((table["flag"] == "fomo").sum()),
+        "as_of": str(pd.Timestamp(calendar[-1], tz="UTC").tz_convert("Asia/Kolkata").date()) if len(calendar) else None,
+    }
+    sectors = table.groupby("sector")["weight"].sum().sort_values(ascending=False)
+    return {
+        "summary": summary,
+        "holdings": table,
+        "sectors": sectors,
+        "correlation": pd.DataFrame(corr, index=symbols, columns=symbols),
+    }
+
+
+def _verdict(score):
+    from marketmind_v5_final import final_verdict
+
+    return None if score is None else final_verdict(score)
+
+
+def top_pairs(correlation, n=10):
+    # Most correlated distinct pairs as (a, b, correlation)
+    values = correlation.to_numpy()
+    upper = np.triu_indices(len(values), k=1)
+    pairs = values[upper]
+    order = np.argsort(np.nan_to_num(pairs, nan=-np.inf))[::-1][:n]
+    names = correlation.index
+    return [(names[upper[0][k]], names[upper[1][k]], float(pairs[k])) for k in order if not np.isnan(pairs[k])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MarketMind analytics for a whole portfolio.")
+    parser.add_argument("holdings", help="CSV with symbol and quantity (or weight) columns")
+    parser.add_argument("--refresh", action="store_true", help=f"fetch {REFRESH_PERIOD} of prices and missing fundamentals first")
+    parser.add_argument("--correlations", help="write the correlation matrix to this CSV")
+    parser.add_argument("--json", action="store_true", help="print the summary and holdings as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = analyze_portfolio(read_holdings(args.holdings), refresh=args.refresh)
+    elapsed = time.perf_counter() - start
+    summary, table = result["summary"], result["holdings"]
+    if args.correlations:
+        result["correlation"].to_csv(args.correlations)
+
+    if args.json:
+        out = {"summary": summary, "holdings": json.loads(table.to_json(orient="index")),
+               "sectors": result["sectors"].to_dict()}
+        print(json.dumps(out, indent=2, ensure_ascii=False))
+        return 0
+
+    def pct(value):
+        return f"{value * 100:.1f}%" if value is not None else "N/A"
+
+    print(f"\n💼 Portfolio ({summary['holdings']} holdings, prices for {summary['with_prices']}, "
+          f"fundamentals for {summary['with_fundamentals']}; as of {summary['as_of']})")
+    if summary["total_value"] is not None:
+        print(f"Value: ₹{summary['total_value']:,.0f}")
+    score = summary["weighted_score"]
+    print(f"Weighted MarketMind Score: {score:.1f}/100 → {summary['weighted_verdict']}" if score is not None
+          else "Weighted MarketMind Score: N/A (no cached fundamentals)")
+    print(f"Volatility (annualized): {pct(summary['portfolio_volatility'])}")
+    corr = summary["weighted_avg_correlation"]
+    print(f"Average pairwise correlation: {corr:.2f}" if corr is not None else "Average pairwise correlation: N/A")
+    print(f"Concentration: HHI {summary['hhi']:.4f} (≈{summary['effective_holdings']:.1f} equal-weight names), "
+          f"top 10 = {pct(summary['top10_weight'])}")
+
+    print("\n🏭 Sector weights")
+    for sector, weight in result["sectors"].items():
+        print(f"  {sector:<12} {pct(weight)}")
+
+    flagged = table[table["flag"].notna()].sort_values("weight", ascending=False)
+    print(f"\n🚨 Panic/FOMO holdings: {len(flagged)}")
+    for symbol, row in flagged.iterrows():
+        icon = "😨" if row["flag"] == "panic" else "🚀"
+        change = f"{row['week_change']:+.1f}% this week" if not np.isnan(row["week_change"]) else ""
+        print(f"  {icon} {symbol:<14} {pct(row['weight']):>7}  {row['psychology']}/{row['alert']} {change}")
+
+    print("\n🔗 Most correlated pairs")
+    for a, b, value in top_pairs(result["correlation"], 5):
+        print(f"  {a} ~ {b}: {value:.2f}")
+    print(f"\nanalyzed in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
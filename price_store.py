@@ -0,0 +1,225 @@
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from data_cache import get_history
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within one process
+    fcntl = None
+
+# ---------------- Store Layout ----------------
+# <root>/<SYMBOL>/Date.i8 holds bar timestamps (UTC ns); every other column is a
+# raw float64 file of the same length. Files are appended in place and read back
+# through np.memmap, so every process on the host shares the OS page cache and
+# window slices are views rather than copies.
+PRICE_STORE_PATH = os.environ.get(
+    "MARKETMIND_PRICE_STORE",
+    os.path.join(os.path.expanduser("~"), ".marketmind", "prices"),
+)
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+DATE_COLUMN = "Date"
+LOCK_FILE = ".lock"
+
+
+class PriceStore:
+    def __init__(self, root=PRICE_STORE_PATH):
+        self.root = root
+        self._maps = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def _path(self, symbol, column):
+        suffix = ".i8" if column == DATE_COLUMN else ".f8"
+        return os.path.join(self.root, symbol, column + suffix)
+
+    def has(self, symbol):
+        path = self._path(symbol, DATE_COLUMN)
+        return os.path.exists(path) and os.path.getsize(path) > 0
+
+    def symbols(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(s for s in os.listdir(self.root) if self.has(s))
+
+    # ---------------- Reading ----------------
+    def columns(self, symbol):
+        # Memory-mapped arrays for a symbol, remapped only when the files grew
+        date_path = self._path(symbol, DATE_COLUMN)
+        if not self.has(symbol):
+            return None
+        size = os.path.getsize(date_path)
+        with self._lock:
+            cached = self._maps.get(symbol)
+            if cached is not None and cached[0] == size:
+                return cached[1]
+            maps = {DATE_COLUMN: np.memmap(date_path, dtype="<i8", mode="r").view("datetime64[ns]")}
+            for column in COLUMNS:
+                maps[column] = np.memmap(self._path(symbol, column), dtype="<f8", mode="r")
+            # A reader may race an append; only expose rows every column has
+            length = min(len(m) for m in maps.values())
+            maps = {k: v[:length] for k, v in maps.items()}
+            self._maps[symbol] = (size, maps)
+            return maps
+
+    def window(self, symbol, start=None, end=None):
+        # Zero-copy slice of every column for start <= Date <= end
+        maps = self.columns(symbol)
+        if maps is None:
+            return None
+        dates = maps[DATE_COLUMN]
+        lo = 0 if start is None else np.searchsorted(dates, _ns(start), side="left")
+        hi = len(dates) if end is None else np.searchsorted(dates, _ns(end), side="right")
+        return {k: v[lo:hi] for k, v in maps.items()}
+
+    def since(self, symbol, offset):
+        # Bars strictly after (last bar - offset), e.g. offset=pd.DateOffset(months=1)
+        maps = self.columns(symbol)
+        if maps is None or len(maps[DATE_COLUMN]) == 0:
+            return None
+        dates = maps[DATE_COLUMN]
+        cutoff = pd.Timestamp(dates[-1]) - offset
+        lo = np.searchsorted(dates, _ns(cutoff), side="right")
+        return {k: v[lo:] for k, v in maps.items()}
+
+    def tail(self, symbol, n):
+        maps = self.columns(symbol)
+        return None if maps is None else {k: v[-n:] for k, v in maps.items()}
+
+    def last_date(self, symbol):
+        maps = self.columns(symbol)
+        if maps is None or len(maps[DATE_COLUMN]) == 0:
+            return None
+        return pd.Timestamp(maps[DATE_COLUMN][-1], tz="UTC")
+
+    def frame(self, symbol, start=None, end=None):
+        # Convenience copy as a DataFrame (index in UTC)
+        cols = self.window(symbol, start, end)
+        if cols is None:
+            return None
+        index = pd.DatetimeIndex(np.array(cols[DATE_COLUMN]), tz="UTC", name=DATE_COLUMN)
+        return pd.DataFrame({c: np.array(cols[c]) for c in COLUMNS}, index=index)
+
+    # ---------------- Writing ----------------
+    def append(self, symbol, history):
+        # Adds bars newer than the last stored one; a bar with the same timestamp as
+        # the last stored bar (today's, still forming) overwrites it in place.
+        if history is None or history.empty:
+            return 0
+        index = pd.DatetimeIndex(history.index)
+        if index.tz is None:
+            index = index.tz_localize("UTC")
+        stamps = index.tz_convert("UTC").as_unit("ns").asi8
+        order = np.argsort(stamps, kind="stable")
+        stamps = stamps[order]
+        values = {c: np.asarray(history[c], dtype="<f8")[order] if c in history else np.full(len(stamps), np.nan)
+                  for c in COLUMNS}
+
+        with self._write_lock, self._symbol_lock(symbol):
+            self._repair(symbol)
+            return self._append(symbol, stamps, values)
+
+    @contextmanager
+    def _symbol_lock(self, symbol):
+        # Streamlit processes and batch workers share the store: the read-tail /
+        # append sequence for a symbol runs under an exclusive flock on its lockfile
+        directory = os.path.join(self.root, symbol)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, LOCK_FILE), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _repair(self, symbol):
+        # A writer that died mid-append leaves some columns longer than others (or a
+        # partial row); cut every file back to the rows all of them hold
+        paths = [self._path(symbol, c) for c in (DATE_COLUMN,) + COLUMNS]
+        sizes = [os.path.getsize(p) if os.path.exists(p) else 0 for p in paths]
+        rows = min(sizes) // 8
+        for path, size in zip(paths, sizes):
+            if size > rows * 8:
+                os.truncate(path, rows * 8)
+
+    def _append(self, symbol, stamps, values):
+        last = self.last_date(symbol)
+        last_ns = None if last is None else last.value
+        written = 0
+
+        if last_ns is not None:
+            same = np.flatnonzero(stamps == last_ns)
+            if len(same):
+                i = same[-1]
+                row = len(self.columns(symbol)[DATE_COLUMN]) - 1
+                for c in COLUMNS:
+                    with open(self._path(symbol, c), "r+b") as f:
+                        f.seek(row * 8)
+                        f.write(values[c][i:i + 1].tobytes())
+            keep = stamps > last_ns
+            stamps = stamps[keep]
+            values = {c: v[keep] for c, v in values.items()}
+
+        if len(stamps):
+            # Value columns first, dates last: readers trim to the shortest column
+            for c in COLUMNS:
+                with open(self._path(symbol, c), "ab") as f:
+                    f.write(values[c].tobytes())
+            with open(self._path(symbol, DATE_COLUMN), "ab") as f:
+                f.write(stamps.astype("<i8").tobytes())
+            written = len(stamps)
+        return written
+
+
+def _ns(value):
+    stamp = pd.Timestamp(value)
+    if stamp.tz is not None:
+        stamp = stamp.tz_convert("UTC").tz_localize(None)
+    return np.datetime64(stamp.as_unit("ns"))
+
+
+_default_store = None
+
+
+def get_price_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = PriceStore()
+    return _default_store
+
+
+# ---------------- Analysis Windows ----------------
+def sync_history(symbol, period="1mo"):
+    # Fetch (through the cache) and fold the new bars into the store
+    history = get_history(symbol, period)
+    try:
+        get_price_store().append(symbol, history)
+    except (OSError, ValueError):
+        pass  # the store is an accelerator; analysis still works from the frame
+    return history
+
+
+def recent_windows(symbol, history=None):
+    # (1-month, 7-day) windows as zero-copy slices of the memory-mapped store,
+    # falling back to slices of the fetched frame when the store is unavailable
+    store = get_price_store()
+    try:
+        if store.has(symbol):
+            return store.since(symbol, pd.DateOffset(months=1)), store.since(symbol, pd.Timedelta(days=7))
+    except (OSError, ValueError):
+        pass
+    return history, last_days(history, 7)
+
+
+def last_days(history, days):
+    # Same window yfinance returns for period=f"{days}d", cut from a longer frame
+    if history is None or history.empty:
+        return history
+    return history[history.index > history.index[-1] - pd.Timedelta(days=days)]
@@ -0,0 +1,242 @@
+import argparse
+import hashlib
+import os
+import pickle
+import random
+import threading
+import time
+
+# ---------------- Provider Selection ----------------
+# MARKETMIND_PROVIDER=live (default), record:<dir> or replay:<dir>.
+# MARKETMIND_REPLAY_LATENCY="info=0.3,history=0.5,feed=0.8" injects per-call delays.
+PROVIDER = os.environ.get("MARKETMIND_PROVIDER", "live")
+REPLAY_LATENCY = os.environ.get("MARKETMIND_REPLAY_LATENCY", "")
+KINDS = ("info", "history", "feed")
+
+
+class CassetteMissing(LookupError):
+    pass
+
+
+# ---------------- Live ----------------
+class LiveProvider:
+    # The raw upstream calls everything else is built on: yf.Ticker(...).info,
+    # yf.Ticker(...).history(...) and feedparser.parse(...)
+    def info(self, symbol):
+        import yfinance as yf
+
+        return yf.Ticker(symbol).info
+
+    def history(self, symbol, period="1mo", interval="1d"):
+        import yfinance as yf
+
+        return yf.Ticker(symbol).history(period=period, interval=interval)
+
+    def feed(self, url, etag=None, modified=None):
+        import feedparser
+
+        return feedparser.parse(url, etag=etag, modified=modified)
+
+
+# ---------------- Cassettes ----------------
+# One pickle per recorded response: <dir>/<kind>/<hash of the call>.pkl
+def cassette_path(directory, kind, *args):
+    digest = hashlib.blake2b(repr(args).encode("utf-8"), digest_size=12).hexdigest()
+    return os.path.join(directory, kind, digest + ".pkl")
+
+
+def save_cassette(directory, kind, args, value):
+    path = cassette_path(directory, kind, *args)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump({"kind": kind, "args": args, "value": value, "recorded_at": time.time()}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def load_cassette(directory, kind, args):
+    try:
+        with open(cassette_path(directory, kind, *args), "rb") as f:
+            return pickle.load(f)["value"]
+    except FileNotFoundError:
+        raise CassetteMissing(f"no {kind} cassette for {args!r} in {directory}")
+
+
+class RecordingProvider:
+    # Passes calls through to `inner` and saves every successful response.
+    # Feeds are recorded without validators so replays always have a full body.
+    def __init__(self, directory, inner=None):
+        self.directory = directory
+        self.inner = inner or LiveProvider()
+
+    def info(self, symbol):
+        value = self.inner.info(symbol)
+        save_cassette(self.directory, "info", (symbol,), value)
+        return value
+
+    def history(self, symbol, period="1mo", interval="1d"):
+        value = self.inner.history(symbol, period, interval)
+        save_cassette(self.directory, "history", (symbol, period, interval), value)
+        return value
+
+    def feed(self, url, etag=None, modified=None):
+        value = self.inner.feed(url)
+        save_cassette(self.directory, "feed", (url,), value)
+        if etag and etag == value.get("etag"):
+            return _not_modified(value)
+        return value
+
+
+class ReplayProvider:
+    # Serves recorded responses after an injected delay of latency[kind] seconds
+    # (+/- jitter as a fraction), so load tests see realistic overlap.
+    def __init__(self, directory, latency=None, jitter=0.2, seed=None):
+        self.directory = directory
+        self.latency = dict(latency or {})
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _wait(self, kind):
+        delay = self.latency.get(kind, 0.0)
+        if delay:
+            with self._lock:
+                delay *= 1 + self._rng.uniform(-self.jitter, self.jitter)
+            time.sleep(max(0.0, delay))
+
+    def info(self, symbol):
+        self._wait("info")
+        return load_cassette(self.directory, "info", (symbol,))
+
+    def history(self, symbol, period="1mo", interval="1d"):
+        self._wait("history")
+        return load_cassette(self.directory, "history", (symbol, period, interval)).copy()
+
+    def feed(self, url, etag=None, modified=None):
+        self._wait("feed")
+        value = load_cassette(self.directory, "feed", (url,))
+        # Honour conditional GETs the way the real feed does
+        if etag and etag == value.get("etag"):
+            return _not_modified(value)
+        return value
+
+    def symbols(self):
+        # Symbols with a recorded info response
+        found = []
+        folder = os.path.join(self.directory, "info")
+        for name in os.listdir(folder) if os.path.isdir(folder) else []:
+            with open(os.path.join(folder, name), "rb") as f:
+                found.append(pickle.load(f)["args"][0])
+        return sorted(found)
+
+
+def _not_modified(feed):
+    from feedparser import FeedParserDict
+
+    return FeedParserDict(status=304, entries=[], etag=feed.get("etag"), modified=feed.get("modified"))
+
+
+def parse_latency(spec):
+    # "info=0.3,history=0.5,feed=0.8" -> {"info": 0.3, ...}; a bare number applies to every kind
+    spec = (spec or "").strip()
+    if not spec:
+        return {}
+    if "=" not in spec:
+        return {kind: float(spec) for kind in KINDS}
+    latency = {}
+    for part in spec.split(","):
+        kind, _, value = part.partition("=")
+        latency[kind.strip()] = float(value)
+    return latency
+
+
+def provider_from_spec(spec, latency=None):
+    mode, _, directory = spec.partition(":")
+    if mode == "live":
+        return LiveProvider()
+    if mode == "record":
+        return RecordingProvider(directory)
+    if mode == "replay":
+        return ReplayProvider(directory, latency if latency is not None else parse_latency(REPLAY_LATENCY))
+    raise ValueError(f"unknown provider {spec!r} (use live, record:<dir> or replay:<dir>)")
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider():
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = provider_from_spec(PROVIDER)
+        return _provider
+
+
+def set_provider(provider):
+    global _provider
+    with _provider_lock:
+        _provider = provider
+
+
+# ---------------- Cassette Tools ----------------
+def record(directory, symbols, periods=("1mo",)):
+    # Records everything one analysis of each symbol fetches
+    from marketmind_v5_final import news_url
+
+    recorder = RecordingProvider(directory)
+    for symbol in symbols:
+        recorder.info(symbol)
+        for period in periods:
+            recorder.history(symbol, period)
+        recorder.feed(news_url(symbol))
+        print(f"recorded {symbol}")
+
+
+def synthesize(directory, n, periods=("1mo",)):
+    # Offline cassettes from benchmarks.synthetic, for load tests without network
+    import feedparser
+    import pandas as pd
+
+    from benchmarks import synthetic
+    from marketmind_v5_final import news_url
+
+    infos = synthetic.info_dicts(n)
+    today = pd.Timestamp.now(tz="Asia/Kolkata").normalize()
+    for i, (symbol, info) in enumerate(infos.items()):
+        save_cassette(directory, "info", (symbol,), info)
+        bars = synthetic.ohlcv(days=23, seed=i)
+        bars.index = pd.bdate_range(end=today, periods=len(bars), tz="Asia/Kolkata")
+        for period in periods:
+            save_cassette(directory, "history", (symbol, period, "1d"), bars)
+        published = time.gmtime()
+        entries = [
+            feedparser.FeedParserDict(title=title, id=f"{symbol}-{i}-{k}", link="", published_parsed=published)
+            for k, title in enumerate(synthetic.headlines(8, seed=i))
+        ]
+        save_cassette(directory, "feed", (news_url(symbol),),
+                      feedparser.FeedParserDict(status=200, etag=f'"{symbol}-v1"', entries=entries))
+    return list(infos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or synthesize data-provider cassettes.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="record live responses for the given symbols")
+    rec.add_argument("--dir", required=True)
+    rec.add_argument("symbols", nargs="+")
+    syn = sub.add_parser("synth", help="write synthetic cassettes (no network needed)")
+    syn.add_argument("--dir", required=True)
+    syn.add_argument("-n", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.dir, [s.strip().upper() for s in args.symbols])
+    else:
+        symbols = synthesize(args.dir, args.n)
+        print(f"wrote cassettes for {len(symbols)} symbols to {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Trading sessions in the windows behind period="1mo" and period="7d"
+PSYCHOLOGY_WINDOW = 21
+ALERT_WINDOW = 5
+
+PSYCHOLOGY_REGIMES = ("fomo", "panic", "high_activity", "sideways")
+ALERT_LEVELS = ("fomo", "panic", "volume_spike", "calm")
+INSUFFICIENT_DATA = "insufficient_data"
+
+
+# ---------------- Rolling Window Statistics ----------------
+def rolling_stats(close, volume, window):
+    # Per bar: % change from the first close of the window, mean volume of the
+    # window and the bar's own volume. The first window-1 bars are NaN.
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    n = len(close)
+    price_change = np.full(n, np.nan)
+    avg_volume = np.full(n, np.nan)
+    if 0 < window <= n:
+        start = close[: n - window + 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price_change[window - 1:] = (close[window - 1:] - start) / start * 100
+        avg_volume[window - 1:] = sliding_window_view(volume, window).mean(axis=1)
+    return price_change, avg_volume, volume
+
+
+# ---------------- Classification Rules ----------------
+def classify_psychology(price_change, avg_volume, latest_volume):
+    # Same thresholds as get_market_psychology, applied element-wise
+    price_change = np.asarray(price_change, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume_ratio = np.where(avg_volume > 0, latest_volume / avg_volume, 1.0)
+        regime = np.select(
+            [(price_change > 10) & (volume_ratio > 1.5), price_change < -10, volume_ratio > 2],
+            ["fomo", "panic", "high_activity"],
+            default="sideways",
+        ).astype(object)
+    regime[np.isnan(price_change)] = None
+    return regime, volume_ratio
+
+
+def classify_alert(price_change, avg_volume, latest_volume):
+    # Same thresholds as the 7-day Behavioral Alert in app.py
+    price_change = np.asarray(price_change, dtype=float)
+    with np.errstate(invalid="ignore"):
+        alert = np.select(
+            [price_change > 7, price_change < -7, latest_volume > 1.5 * avg_volume],
+            ["fomo", "panic", "volume_spike"],
+            default="calm",
+        ).astype(object)
+    alert[np.isnan(price_change)] = None
+    return alert
+
+
+# ---------------- Full-History Series ----------------
+def psychology_regimes(history, window=PSYCHOLOGY_WINDOW):
+    # Regime label for every bar of an OHLCV frame in one pass
+    price_change, avg_volume, latest_volume = rolling_stats(history["Close"], history["Volume"], window)
+    regime, volume_ratio = classify_psychology(price_change, avg_volume, latest_volume)
+    return pd.DataFrame({
+        "price_change": price_change,
+        "volume_ratio": volume_ratio,
+        "regime": regime,
+    }, index=history.index)
+
+
+def behavioral_alerts(history, window=ALERT_WINDOW):
+    price_change, avg_volume, latest_volume = rolling_stats(history["Close"], history["Volume"], window)
+    alert = classify_alert(price_change, avg_volume, latest_volume)
+    return pd.DataFrame({
+        "price_change": price_change,
+        "avg_volume": avg_volume,
+        "alert": alert,
+    }, index=history.index)
+
+
+# ---------------- Latest-Window Views ----------------
+def latest_psychology(close, volume):
+    # The whole frame is one window, exactly as get_market_psychology measures it
+    price_change, avg_volume, latest_volume = rolling_stats(close, volume, len(close))
+    regime, _ = classify_psychology(price_change[-1:], avg_volume[-1:], latest_volume[-1:])
+    # A NaN change (missing or zero first close) has no regime to report
+    return regime[0] if regime[0] is not None else INSUFFICIENT_DATA
+
+
+def latest_alert(close, volume):
+    price_change, avg_volume, latest_volume = rolling_stats(close, volume, len(close))
+    return classify_alert(price_change[-1:], avg_volume[-1:], latest_volume[-1:])[0], price_change[-1]
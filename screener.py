@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+from marketmind_v5_final import (
+    sector_map,
+    sector_benchmarks,
+    custom_sector_pe,
+    sector_outlook_map,
+    GROWTH_RATE,
+    DISCOUNT_RATE,
+    YEARS,
+    intrinsic_value,
+)
+
+# Yahoo info keys the screener reads; missing columns are treated as N/A
+INFO_COLUMNS = ["trailingPE", "returnOnEquity", "profitMargins", "priceToBook",
+                "trailingEps", "currentPrice", "sector"]
+
+
+# ---------------- Input Frame ----------------
+def fundamentals_frame(infos):
+    # {symbol: yf.Ticker(symbol).info} -> one row per symbol. Symbols with an
+    # empty (or None) info dict keep their row as all N/A instead of vanishing.
+    frame = pd.DataFrame.from_dict({symbol: info or {} for symbol, info in infos.items()}, orient="index")
+    return frame.reindex(index=list(infos), columns=INFO_COLUMNS)
+
+
+def _numeric(frame, column):
+    if column not in frame:
+        return np.full(len(frame), np.nan)
+    values = np.array(pd.to_numeric(frame[column], errors="coerce"), dtype=float)
+    values[~np.isfinite(values)] = np.nan
+    return values
+
+
+def _lookup(keys, table, default):
+    return keys.map(table).fillna(default).to_numpy(dtype=float)
+
+
+# ---------------- Vectorized Scoring ----------------
+def screen_universe(fundamentals, growth_rate=GROWTH_RATE, discount_rate=DISCOUNT_RATE, years=YEARS,
+                    benchmarks=None, valuation_pes=None):
+    # Columnar equivalent of the per-symbol flow in app.py: Fundamentals.score,
+    # the ai_summary_from_metrics sector comparisons, intrinsic value, verdict and
+    # the sector-outlook adjusted MarketMind score. benchmarks ({sector: {"PE",
+    # "PB"}}) and valuation_pes ({sector: exit P/E}) default to the static
+    # tables; pass sector_index.screen_tables() to score against the same
+    # current peers as the per-symbol path.
+    benchmarks = sector_benchmarks if benchmarks is None else benchmarks
+    valuation_pes = custom_sector_pe if valuation_pes is None else valuation_pes
+    index = fundamentals.index
+    pe = _numeric(fundamentals, "trailingPE")
+    roe = _numeric(fundamentals, "returnOnEquity") * 100
+    margin = _numeric(fundamentals, "profitMargins") * 100
+    pb = _numeric(fundamentals, "priceToBook")
+    eps = _numeric(fundamentals, "trailingEps")
+    price = _numeric(fundamentals, "currentPrice")
+
+    # A zero ROE or margin is reported as N/A
+    roe[roe == 0] = np.nan
+    margin[margin == 0] = np.nan
+
+    raw_sector = fundamentals["sector"] if "sector" in fundamentals else pd.Series("Default", index=index)
+    sector = raw_sector.map(sector_map).fillna("Default")
+
+    with np.errstate(invalid="ignore"):
+        score = (pe > 0).astype(int) + (roe > 0) + (margin > 0) + (pb > 0)
+
+    default = benchmarks.get("Default", sector_benchmarks["Default"])
+    sector_pe_avg = _lookup(sector, {k: v["PE"] for k, v in benchmarks.items()}, default["PE"])
+    sector_pb_avg = _lookup(sector, {k: v["PB"] for k, v in benchmarks.items()}, default["PB"])
+
+    with np.errstate(invalid="ignore"):
+        pe_vs_sector = np.select(
+            [pe <= 0, (pe > 0) & (pe < sector_pe_avg), (pe > 0) & (pe > sector_pe_avg)],
+            ["invalid", "low", "high"],
+            default="inline",
+        ).astype(object)
+        pe_vs_sector[np.isnan(pe)] = None
+        pb_vs_sector = np.select(
+            [(pb > 0) & (pb < sector_pb_avg), (pb < 0) | (pb > sector_pb_avg * 1.2)],
+            ["attractive", "high_or_negative"],
+            default="inline",
+        ).astype(object)
+        pb_vs_sector[np.isnan(pb)] = None
+
+    risk_level = np.select([score >= 5, score >= 3], ["Low", "Moderate"], default="High")
+
+    valuation_pe = _lookup(sector, valuation_pes, valuation_pes.get("Default", 15))
+    projected_eps, intrinsic = intrinsic_value(eps, valuation_pe, growth_rate, discount_rate, years)
+    valued = ~np.isnan(intrinsic) & ~np.isnan(price)
+    with np.errstate(invalid="ignore"):
+        undervalued = valued & (intrinsic > price)
+    verdict = np.where(valued, np.where(undervalued, "✅ Undervalued", "❌ Overvalued"), "N/A")
+
+    base_score = score * 15 + np.where(undervalued, 25, 10)
+    sector_outlook = sector.map(sector_outlook_map).fillna(0).to_numpy(dtype=int)
+    adjusted_score = np.clip(base_score + sector_outlook, 0, 100)
+    final = np.select([adjusted_score >= 80, adjusted_score >= 60], ["BUY", "WATCH"], default="AVOID")
+
+    return pd.DataFrame({
+        "sector": sector.to_numpy(),
+        "pe": pe,
+        "roe": roe,
+        "profit_margin": margin,
+        "pb": pb,
+        "score": score,
+        "sector_pe_avg": sector_pe_avg,
+        "sector_pb_avg": sector_pb_avg,
+        "pe_vs_sector": pe_vs_sector,
+        "pb_vs_sector": pb_vs_sector,
+        "risk_level": risk_level,
+        "valuation_pe": valuation_pe,
+        "projected_eps": projected_eps,
+        "intrinsic_value": intrinsic,
+        "current_price": price,
+        "verdict": verdict,
+        "base_score": base_score,
+        "adjusted_score": adjusted_score,
+        "final_verdict": final,
+    }, index=index)
+
+
+# ---------------- Advice Buy Score ----------------
+def buy_scores(score, verdict, risk, horizon):
+    # Vectorized compute_buy_score; risk and horizon describe the investor profile
+    score = np.asarray(score)
+    verdict = np.asarray(verdict, dtype=object)
+    valuation = np.where(verdict == "✅ Undervalued", 25, np.where(verdict == "❌ Overvalued", 10, 0))
+    if risk == "Low":
+        risk_points = np.where(score >= 5, 20, 10)
+    elif risk == "Medium":
+        risk_points = np.where(score >= 3, 15, 10)
+    else:
+        risk_points = np.full(score.shape, 10)
+    if horizon == "3+ Years":
+        horizon_points = np.where(score >= 5, 20, 10)
+    else:
+        horizon_points = np.full(score.shape, 15 if horizon == "1 Year" else 10)
+    return np.minimum(100, score * 5 + valuation + risk_points + horizon_points)
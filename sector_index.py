@@ -0,0 +1,196 @@
+import argparse
+import bisect
+import math
+import threading
+
+from marketmind_v5_final import sector_benchmarks, custom_sector_pe, sector_map, determine_sector, _finite
+
+# ---------------- Index Settings ----------------
+# Sector P/E and P/B benchmarks from the peers in the local fundamentals cache.
+# Each (sector, metric) keeps its values in a sorted list, so a refreshed symbol
+# moves its own values in O(log n) searches and the medians/percentiles are
+# read off by position. Sectors with fewer than MIN_PEERS values fall back to
+# the static sector_benchmarks / custom_sector_pe.
+MIN_PEERS = 5
+METRICS = {"PE": "trailingPE", "PB": "priceToBook"}
+QUANTILES = {"p25": 0.25, "median": 0.50, "p75": 0.75}
+DEFAULT_VALUATION_PE = 15
+
+
+def _quantile(ordered, q):
+    # Linear interpolation between closest ranks (numpy's default)
+    pos = q * (len(ordered) - 1)
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def peer_values(info):
+    # Only positive, finite multiples say anything about what peers trade at
+    values = {}
+    for metric, key in METRICS.items():
+        value = _finite(info.get(key))
+        values[metric] = value if value is not None and value > 0 else None
+    return values
+
+
+# ---------------- Sector Index ----------------
+class SectorIndex:
+    def __init__(self, min_peers=MIN_PEERS):
+        self.min_peers = min_peers
+        self._lock = threading.Lock()
+        self._members = {}      # symbol -> (sector, {metric: value or None})
+        self._sorted = {}       # (sector, metric) -> sorted values
+        self._table = {}        # sector -> precomputed row (see _row)
+        self._dirty = set()
+
+    def __len__(self):
+        return len(self._members)
+
+    def observe(self, symbol, sector, values):
+        with self._lock:
+            previous = self._members.get(symbol)
+            if previous == (sector, values):
+                return
+            if previous is not None:
+                self._discard(*previous)
+            self._members[symbol] = (sector, dict(values))
+            for metric, value in values.items():
+                if value is not None:
+                    bisect.insort(self._sorted.setdefault((sector, metric), []), value)
+            self._dirty.add(sector)
+
+    def observe_info(self, symbol, info):
+        self.observe(symbol, determine_sector(info), peer_values(info))
+
+    def remove(self, symbol):
+        with self._lock:
+            previous = self._members.pop(symbol, None)
+            if previous is not None:
+                self._discard(*previous)
+
+    def _discard(self, sector, values):
+        for metric, value in values.items():
+            if value is not None:
+                ordered = self._sorted[(sector, metric)]
+                del ordered[bisect.bisect_left(ordered, value)]
+        self._dirty.add(sector)
+
+    def _row(self, sector):
+        row = {}
+        for metric in METRICS:
+            ordered = self._sorted.get((sector, metric), [])
+            row[f"{metric}_peers"] = len(ordered)
+            for name, q in QUANTILES.items():
+                row[f"{metric}_{name}"] = _quantile(ordered, q) if ordered else None
+        return row
+
+    def table(self):
+        # {sector: {"PE_peers", "PE_p25", "PE_median", "PE_p75", "PB_...": ...}},
+        # recomputed only for sectors that changed since the last lookup
+        with self._lock:
+            for sector in self._dirty:
+                self._table[sector] = self._row(sector)
+            self._dirty.clear()
+            return dict(self._table)
+
+    def benchmark(self, sector):
+        # {"PE", "PB"} to compare a stock against: peer medians where there are
+        # enough peers, the static benchmark otherwise
+        row = self.table().get(sector, {})
+        static = sector_benchmarks.get(sector, sector_benchmarks["Default"])
+        return {
+            metric: row[f"{metric}_median"] if row.get(f"{metric}_peers", 0) >= self.min_peers else static[metric]
+            for metric in METRICS
+        }
+
+    def valuation_pe(self, sector):
+        # Exit P/E of the intrinsic value model: an explicit custom_sector_pe
+        # entry wins, then the peer median, then the default. "Default" is one
+        # of those entries: unmapped stocks are no peer group, so they keep the
+        # fixed exit P/E of 15.
+        if sector in custom_sector_pe:
+            return custom_sector_pe[sector]
+        row = self.table().get(sector, {})
+        if row.get("PE_peers", 0) >= self.min_peers:
+            return row["PE_median"]
+        return custom_sector_pe.get("Default", DEFAULT_VALUATION_PE)
+
+    def screen_tables(self):
+        # benchmark / valuation_pe for every sector, as the benchmarks and
+        # valuation_pes tables of screener.screen_universe
+        sectors = set(self.table()) | set(sector_map.values()) | set(sector_benchmarks) | set(custom_sector_pe)
+        return {
+            "benchmarks": {sector: self.benchmark(sector) for sector in sectors},
+            "valuation_pes": {sector: self.valuation_pe(sector) for sector in sectors},
+        }
+
+    def percentile_rank(self, sector, metric, value):
+        # Share of the sector's peers with a lower value (0-100), None with too few peers
+        with self._lock:
+            ordered = self._sorted.get((sector, metric), [])
+            if value is None or len(ordered) < self.min_peers:
+                return None
+            return 100.0 * bisect.bisect_left(ordered, value) / len(ordered)
+
+    def stats(self):
+        with self._lock:
+            return {"symbols": len(self._members), "sectors": len({s for s, _ in self._members.values()})}
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_sector_index():
+    # Seeded once from every cached fundamentals entry, then kept current by the
+    # cache: each fresh get_info load moves that symbol's values
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            from data_cache import get_cache
+            from instrumentation import register_collector
+
+            index = SectorIndex()
+            cache = get_cache()
+            for key, info in cache.entries("info"):
+                index.observe_info(key.split(":", 1)[1], info)
+            cache.subscribe("info", lambda key, info: index.observe_info(key.split(":", 1)[1], info))
+            register_collector("sector_index", index.stats)
+            _default_index = index
+        return _default_index
+
+
+def sector_benchmark(sector):
+    return get_sector_index().benchmark(sector)
+
+
+def valuation_pe(sector):
+    return get_sector_index().valuation_pe(sector)
+
+
+def screen_tables():
+    return get_sector_index().screen_tables()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the sector benchmarks derived from cached fundamentals.")
+    parser.parse_args()
+
+    index = get_sector_index()
+    print(f"{len(index)} symbols in the fundamentals cache\n")
+    print(f"{'sector':<12} {'PE peers':>8} {'PE p25':>8} {'PE med':>8} {'PE p75':>8} "
+          f"{'PB peers':>8} {'PB p25':>8} {'PB med':>8} {'PB p75':>8}  used (PE/PB, exit PE)")
+
+    def fmt(value):
+        return f"{value:8.2f}" if value is not None else f"{'-':>8}"
+
+    for sector, row in sorted(index.table().items()):
+        used = index.benchmark(sector)
+        print(f"{sector:<12} {row['PE_peers']:>8} {fmt(row['PE_p25'])} {fmt(row['PE_median'])} {fmt(row['PE_p75'])} "
+              f"{row['PB_peers']:>8} {fmt(row['PB_p25'])} {fmt(row['PB_median'])} {fmt(row['PB_p75'])}  "
+              f"{used['PE']:.1f}/{used['PB']:.1f}, {index.valuation_pe(sector):.1f}")
+
+
+if __name__ == "__main__":
+    main()
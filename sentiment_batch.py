@@ -0,0 +1,281 @@
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+
+from marketmind_v5_final import (
+    negative_keywords,
+    positive_keywords,
+    headline_polarities,
+    polarity_version,
+    score_headline,
+    sentiment_label,
+    _textblob_polarities,
+)
+from polarity_cache import PolarityCache, bypassed
+
+# "textblob" keeps TextBlob polarity for headlines without a keyword (exact parity
+# with score_headline); "lexicon" uses the vectorized lexicon scorer below, which
+# only approximates TextBlob (see parity_report).
+SCORER = os.environ.get("MARKETMIND_SENTIMENT_SCORER", "textblob")
+
+# One pass finds every keyword occurrence and question mark in the whole batch.
+# The lookahead makes matches zero-width, so overlapping keywords are all seen,
+# matching the substring semantics of `word in lowered`.
+KEYWORD_PATTERN = re.compile(
+    "(?=(?:(?P<neg>{})|(?P<pos>{})|(?P<question>\\?)))".format(
+        "|".join(map(re.escape, negative_keywords)),
+        "|".join(map(re.escape, positive_keywords)),
+    )
+)
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?|n't|!")
+SEPARATOR = "\n"
+
+
+# ---------------- Keyword Pass ----------------
+def _joined(titles):
+    # Lowercased batch as one string plus the start offset of each headline. No
+    # keyword contains the separator, so no match can span two headlines, and
+    # line breaks inside a title stay as score_headline sees them ("record\nhigh"
+    # is not "record high").
+    texts = [t.lower() for t in titles]
+    lengths = np.fromiter((len(t) + 1 for t in texts), dtype=np.int64, count=len(texts))
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    return SEPARATOR.join(texts), offsets
+
+
+def keyword_flags(titles):
+    # (has_negative, has_positive, has_question) boolean arrays for the batch
+    text, offsets = _joined(titles)
+    n = len(titles)
+    starts, kinds = [], []
+    for match in KEYWORD_PATTERN.finditer(text):
+        starts.append(match.start())
+        kinds.append(match.lastindex)
+    starts = np.asarray(starts, dtype=np.int64)
+    kinds = np.asarray(kinds, dtype=np.int64)
+    doc = np.searchsorted(offsets, starts, side="right") - 1
+    # lastindex: 1 = neg, 2 = pos, 3 = question
+    flags = [np.bincount(doc[kinds == k], minlength=n) > 0 for k in (1, 2, 3)]
+    return flags[0], flags[1], flags[2]
+
+
+# ---------------- Lexicon Pass ----------------
+_lexicon = None
+
+
+def _load_lexicon():
+    # Vocabulary arrays from TextBlob's pattern lexicon: polarity, intensity and
+    # whether the word acts as a modifier ("very", "really") or a negation.
+    global _lexicon
+    if _lexicon is None:
+        from textblob.en import sentiment
+
+        sentiment.load()
+        words = sorted(sentiment.keys())
+        entries = [sentiment[w].get(None) or next(iter(sentiment[w].values())) for w in words]
+        modifiers = set(sentiment.modifiers)
+        _lexicon = {
+            "index": {w: i for i, w in enumerate(words)},
+            "polarity": np.array([e[0] for e in entries], dtype=float),
+            "intensity": np.array([e[2] for e in entries], dtype=float),
+            "modifier": np.array([any(p in modifiers for p in sentiment[w]) for w in words]),
+            "negations": set(sentiment.negations),
+        }
+    return _lexicon
+
+
+def _shift(values, by, fill):
+    # values[i - by] aligned to position i
+    out = np.full(len(values), fill, dtype=values.dtype)
+    if by < len(values):
+        out[by:] = values[:len(values) - by]
+    return out
+
+
+def lexicon_polarity(titles):
+    # Mean polarity of lexicon words per headline, applying the pattern rules that
+    # can be expressed as shifts over the token stream: a modifier scales the next
+    # word ("very good"), a negation flips it to x -0.5 ("not good", "not a good",
+    # "really not bad", "not very good") and each "!" boosts the preceding
+    # assessment by 1.25. Longer-range rules are approximated, so on free text
+    # this agrees with TextBlob on sign far more often than on exact value.
+    lex = _load_lexicon()
+    text, offsets = _joined(titles)
+    n = len(titles)
+    tokens, starts = [], []
+    for match in TOKEN_PATTERN.finditer(text):
+        tokens.append(match.group())
+        starts.append(match.start())
+    if not tokens:
+        return np.zeros(n)
+
+    tokens = np.asarray(tokens)
+    doc = np.searchsorted(offsets, np.asarray(starts, dtype=np.int64), side="right") - 1
+    vocab, inverse = np.unique(tokens, return_inverse=True)
+    vocab_ids = np.array([lex["index"].get(w, -1) for w in vocab])
+    vocab_neg = np.array([w in lex["negations"] for w in vocab])
+    ids = vocab_ids[inverse]
+    known = ids >= 0
+    safe = np.where(known, ids, 0)
+    polarity = np.where(known, lex["polarity"][safe], 0.0)
+    intensity = np.where(known, lex["intensity"][safe], 1.0)
+    modifier = known & lex["modifier"][safe]
+    negation = vocab_neg[inverse] & ~known
+    short = ~known & (np.char.str_len(np.char.strip(tokens, "'")) <= 1)
+    bang = tokens == "!"
+
+    same1 = _shift(doc, 1, -1) == doc
+    same2 = _shift(doc, 2, -1) == doc
+    neg1 = _shift(negation, 1, False) & same1
+    neg_gap = _shift(short, 1, False) & _shift(negation, 2, False) & same2
+    mod1 = _shift(modifier, 1, False) & same1
+    mod_neg = neg1 & _shift(modifier, 2, False) & same2
+    # A negated modifier dampens instead of amplifying ("not very good")
+    neg_mod = mod1 & _shift(negation, 2, False) & same2
+    scale = np.where(mod1, _shift(intensity, 1, 1.0), np.where(mod_neg, _shift(intensity, 2, 1.0), 1.0))
+    scale = np.where(neg_mod, 1.0 / scale, scale)
+
+    scored = np.where(known, np.clip(polarity * scale, -1, 1), 0.0)
+    scored = np.where(known & (neg1 | neg_gap | neg_mod), scored * -0.5, scored)
+
+    # A modifier followed by a known word (directly or across a negation) is
+    # folded into that word's assessment
+    next_known = np.zeros(len(tokens), dtype=bool)
+    next_known[:-1] = known[1:] & (doc[1:] == doc[:-1])
+    next2_known = np.zeros(len(tokens), dtype=bool)
+    next2_known[:-2] = known[2:] & negation[1:-1] & (doc[2:] == doc[:-2])
+    assessed = known & ~(modifier & (next_known | next2_known))
+
+    # Each "!" boosts the nearest preceding assessment of the same headline
+    positions = np.flatnonzero(assessed)
+    boosts = np.zeros(len(tokens))
+    if len(positions):
+        bang_at = np.flatnonzero(bang)
+        target = np.searchsorted(positions, bang_at, side="right") - 1
+        valid = (target >= 0)
+        valid[valid] &= doc[positions[target[valid]]] == doc[bang_at[valid]]
+        np.add.at(boosts, positions[target[valid]], 1)
+    scored = np.clip(scored * 1.25 ** boosts, -1, 1)
+
+    totals = np.bincount(doc, weights=np.where(assessed, scored, 0.0), minlength=n)
+    counts = np.bincount(doc, weights=assessed.astype(float), minlength=n)
+    return np.divide(totals, counts, out=np.zeros(n), where=counts > 0)
+
+
+# ---------------- Batch Scorer ----------------
+def score_headlines(titles, scorer=None):
+    # Vectorized score_headline: (polarity, weight) arrays for the whole batch
+    scorer = scorer or SCORER
+    titles = list(titles)
+    has_negative, has_positive, has_question = keyword_flags(titles)
+    keyword = has_negative | has_positive
+
+    weight = np.where(has_question, 0.5, 1.0) * np.where(keyword, 1.2, 1.0)
+    polarity = np.where(has_negative, -0.4, np.where(has_positive, 0.4, 0.0))
+
+    rest = np.flatnonzero(~keyword)
+    if len(rest):
+        others = [titles[i] for i in rest]
+        if scorer == "lexicon":
+            polarity[rest] = lexicon_polarity(others)
+        else:
+            polarity[rest] = headline_polarities(others)
+    return polarity, weight
+
+
+def batch_sentiment(titles, scorer=None):
+    # Same result shape as sentiment_from_headlines
+    if not titles:
+        return "🟡 Neutral (no major news found)", []
+    polarity, weight = score_headlines(titles, scorer)
+    return sentiment_label(float((polarity * weight).mean())), list(titles)
+
+
+# ---------------- Parity Harness ----------------
+def parity_report(titles, group=5):
+    # Compares the batch scorer with score_headline (TextBlob) headline by headline;
+    # both analyzers are loaded first so warm-up is not counted as scoring time,
+    # and the polarity memo is off so every path really scores.
+    score_headline("warm up")
+    _load_lexicon()
+    with bypassed():
+        start = time.perf_counter()
+        reference = np.array([score_headline(t) for t in titles])
+        reference_s = time.perf_counter() - start
+        report = _scorer_parity(titles, reference, reference_s, group)
+    report["memo"] = _memo_report(titles, reference_s)
+    return report
+
+
+def _scorer_parity(titles, reference, reference_s, group):
+    report = {"headlines": len(titles), "reference_s": reference_s}
+    for scorer in ("textblob", "lexicon"):
+        start = time.perf_counter()
+        polarity, weight = score_headlines(titles, scorer)
+        elapsed = time.perf_counter() - start
+
+        groups = range(0, len(titles), group)
+        ref_labels = [sentiment_label((reference[i:i + group, 0] * reference[i:i + group, 1]).mean()) for i in groups]
+        labels = [sentiment_label((polarity[i:i + group] * weight[i:i + group]).mean()) for i in groups]
+        report[scorer] = {
+            "seconds": elapsed,
+            "speedup": reference_s / elapsed if elapsed else None,
+            "weight_match": float(np.mean(np.isclose(weight, reference[:, 1]))),
+            "polarity_exact": float(np.mean(np.isclose(polarity, reference[:, 0], rtol=0, atol=1e-9))),
+            "polarity_mae": float(np.mean(np.abs(polarity - reference[:, 0]))),
+            "polarity_sign_match": float(np.mean(np.sign(polarity) == np.sign(reference[:, 0]))),
+            f"label_match_per_{group}": float(np.mean(np.array(labels) == np.array(ref_labels))),
+        }
+    return report
+
+
+def _memo_report(titles, reference_s):
+    # TextBlob work saved by the polarity memo: a cold pass, then a warm one
+    cache = PolarityCache(":memory:")
+    version = polarity_version()
+    start = time.perf_counter()
+    cache.polarities(titles, _textblob_polarities, version)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    cache.polarities(titles, _textblob_polarities, version)
+    warm = time.perf_counter() - start
+    stats = cache.stats()
+    return {
+        "cold_seconds": cold,
+        "warm_seconds": warm,
+        "warm_speedup": reference_s / warm if warm else None,
+        "unique_headlines": stats["misses"],
+        "hit_rate": stats["hit_rate"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parity and speed of the batch headline scorer vs TextBlob.")
+    parser.add_argument("--headlines", help="text file with one headline per line (default: synthetic set)")
+    parser.add_argument("-n", type=int, default=5000, help="number of synthetic headlines")
+    parser.add_argument("--synthetic", choices=("varied", "templates"), default="varied",
+                        help="varied: negations, intensifiers, punctuation and line breaks; "
+                             "templates: the ten benchmark headline templates")
+    args = parser.parse_args()
+
+    if args.headlines:
+        with open(args.headlines, encoding="utf-8") as f:
+            titles = [line.strip() for line in f if line.strip()]
+    else:
+        from benchmarks.synthetic import headlines, varied_headlines
+
+        titles = (varied_headlines if args.synthetic == "varied" else headlines)(args.n)
+
+    report = parity_report(titles)
+    print(f"Headlines: {report['headlines']}  (TextBlob path: {report['reference_s']:.3f}s)")
+    for scorer in ("textblob", "lexicon", "memo"):
+        print(f"\n[{scorer}]")
+        for key, value in report[scorer].items():
+            print(f"  {key:22s} {value:.4f}" if isinstance(value, float) else f"  {key:22s} {value}")
+
+
+if __name__ == "__main__":
+    main()
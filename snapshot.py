@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# ---------------- Snapshot Settings ----------------
+# A snapshot is one Parquet file with a row per symbol holding everything the
+# app's tabs show, built offline (e.g. nightly) by running the full analysis over
+# a universe. The app serves covered symbols from it and analyzes live only the
+# ones that are missing or older than SNAPSHOT_MAX_AGE.
+SNAPSHOT_PATH = os.environ.get(
+    "MARKETMIND_SNAPSHOT",
+    os.path.join(os.path.expanduser("~"), ".marketmind", "snapshot.parquet"),
+)
+SNAPSHOT_MAX_AGE = float(os.environ.get("MARKETMIND_SNAPSHOT_MAX_AGE", 24 * 60 * 60))
+BUILT_AT_KEY = b"marketmind.built_at"
+
+DEFAULT_UNIVERSE = [
+    "INFY.NS", "TCS.NS", "RELIANCE.NS", "HDFCBANK.NS", "ICICIBANK.NS",
+    "ONGC.NS", "SBIN.NS", "WIPRO.NS", "HINDUNILVR.NS", "BAJFINANCE.NS",
+]
+
+FUNDAMENTAL_COLUMNS = ("pe", "roe", "eps_growth", "fcf", "margin", "pb", "eps", "price")
+VALUATION_COLUMNS = ("sector_pe", "projected_eps", "intrinsic_value")
+REPORT_COLUMNS = (
+    "sector", "score", "summary", "base_score", "adjusted_score", "final_verdict", "buy_score",
+    "psychology", "alert", "alert_change", "sentiment", "headlines",
+)
+SNAPSHOT_COLUMNS = (
+    ("symbol", "analyzed_at")
+    + tuple(f"f_{name}" for name in FUNDAMENTAL_COLUMNS)
+    + VALUATION_COLUMNS
+    + ("verdict",)
+    + REPORT_COLUMNS
+)
+
+
+# ---------------- Rows ----------------
+def snapshot_row(result):
+    # One analysis_report (as written by batch.py) -> one flat snapshot row
+    valuation = result["valuation"]
+    row = {"symbol": result["symbol"], "analyzed_at": result["analyzed_at"]}
+    row.update({f"f_{name}": result["fundamentals"].get(name) for name in FUNDAMENTAL_COLUMNS})
+    row.update({name: valuation.get(name) for name in VALUATION_COLUMNS})
+    row.update(verdict=valuation["verdict"], **{key: result.get(key) for key in REPORT_COLUMNS})
+    return row
+
+
+def _value(value):
+    # Parquet nulls come back as NaN/None and lists as arrays; the app wants
+    # None and plain Python values
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return value
+
+
+# ---------------- Snapshot ----------------
+class Snapshot:
+    def __init__(self, frame=None, built_at=None, path=None):
+        import pandas as pd
+
+        self.frame = frame if frame is not None else pd.DataFrame()
+        self.built_at = built_at
+        self.path = path
+        # Symbol index: symbol -> row position, and analysis times as epoch seconds
+        self.index = {symbol: i for i, symbol in enumerate(self.frame.get("symbol", []))}
+        self.analyzed_at = (
+            (pd.to_datetime(self.frame["analyzed_at"], utc=True) - pd.Timestamp(0, tz="UTC")).dt.total_seconds().to_numpy()
+            if len(self.frame) else None
+        )
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def age(self, symbol, now=None):
+        i = self.index.get(symbol)
+        return None if i is None else (now or time.time()) - float(self.analyzed_at[i])
+
+    def stale(self, max_age=SNAPSHOT_MAX_AGE, now=None):
+        now = now or time.time()
+        return [symbol for symbol, i in self.index.items() if now - self.analyzed_at[i] > max_age]
+
+    def lookup(self, symbol, max_age=SNAPSHOT_MAX_AGE, now=None):
+        # analysis_report-shaped dict for a covered, fresh symbol; None otherwise
+        age = self.age(symbol, now)
+        if age is None or age > max_age:
+            return None
+        row = {name: _value(value) for name, value in self.frame.iloc[self.index[symbol]].items()}
+        return {
+            "symbol": symbol,
+            "errors": {},
+            "analyzed_at": row["analyzed_at"],
+            "age_s": age,
+            "sector": row["sector"],
+            "fundamentals": {name: row[f"f_{name}"] for name in FUNDAMENTAL_COLUMNS},
+            "score": row["score"],
+            "summary": row["summary"],
+            "valuation": {
+                "eps": row["f_eps"],
+                "current_price": row["f_price"],
+                "verdict": row["verdict"],
+                **{name: row[name] for name in VALUATION_COLUMNS if row[name] is not None},
+            },
+            "base_score": row["base_score"],
+            "adjusted_score": row["adjusted_score"],
+            "final_verdict": row["final_verdict"],
+            "buy_score": row["buy_score"],
+            "psychology": row["psychology"],
+            "alert": row["alert"],
+            "alert_change": row["alert_change"],
+            "sentiment": row["sentiment"],
+            "headlines": row["headlines"] or [],
+        }
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    # An empty snapshot when none has been built yet, so callers just fall back
+    if not os.path.exists(path):
+        return Snapshot(path=path)
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path)
+    built_at = (table.schema.metadata or {}).get(BUILT_AT_KEY)
+    return Snapshot(table.to_pandas(), float(built_at) if built_at else None, path)
+
+
+def write_snapshot(results, path=SNAPSHOT_PATH, built_at=None):
+    # Symbols with any failed source are left out: the app analyzes them live
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Explicit columns keep the schema when every symbol failed (an empty snapshot)
+    rows = [snapshot_row(r) for r in results if not r.get("errors") and "score" in r]
+    frame = pd.DataFrame(rows, columns=list(SNAPSHOT_COLUMNS)).drop_duplicates("symbol", keep="last").sort_values("symbol", ignore_index=True)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[BUILT_AT_KEY] = str(built_at or time.time()).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, path)
+    return len(frame)
+
+
+# ---------------- Builder ----------------
+def build(symbols, path=SNAPSHOT_PATH, workers=None, progress=None):
+    # Runs the batch analysis into <path>.partial.jsonl, which doubles as the
+    # checkpoint of an interrupted build, then writes the Parquet file atomically
+    from batch import completed, run_batch
+
+    partial = path + ".partial.jsonl"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    done = completed(partial, "jsonl")
+    todo = [s for s in symbols if s not in done]
+    with open(partial, "a", encoding="utf-8") as out:
+        run_batch(todo, out, "jsonl", workers, progress=progress)
+
+    wanted = set(symbols)
+    with open(partial, encoding="utf-8") as f:
+        results = [r for r in map(json.loads, f) if r["symbol"] in wanted]
+    count = write_snapshot(results, path)
+    os.remove(partial)
+    return count, len(results) - count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect the precomputed analysis snapshot.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    b = sub.add_parser("build", help="analyze a universe and write the snapshot")
+    b.add_argument("universe", nargs="?", help="file with one symbol per line (default: the app's shortlist)")
+    b.add_argument("--output", default=SNAPSHOT_PATH)
+    b.add_argument("--workers", type=int, default=None)
+    i = sub.add_parser("info", help="show what a snapshot covers")
+    i.add_argument("--path", default=SNAPSHOT_PATH)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from batch import read_symbols
+
+        symbols = read_symbols(args.universe) if args.universe else DEFAULT_UNIVERSE
+        start = time.perf_counter()
+        try:
+            count, skipped = build(symbols, args.output, args.workers, progress=sys.stderr)
+        except KeyboardInterrupt:
+            print("\ninterrupted; rerun the same command to resume", file=sys.stderr)
+            return 130
+        print(f"wrote {count} symbols to {args.output} in {time.perf_counter() - start:.1f}s "
+              f"({skipped} left out after errors)")
+        return 0
+
+    snapshot = load_snapshot(args.path)
+    if snapshot.built_at is None:
+        print(f"no snapshot at {args.path}")
+        return 1
+    built = time.strftime("%Y-%m-%d %H:%M", time.localtime(snapshot.built_at))
+    print(f"{args.path}: {len(snapshot)} symbols, built {built}, "
+          f"{len(snapshot.stale())} older than {SNAPSHOT_MAX_AGE / 3600:g}h")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_cache import DataCache
+
+
+class Loader:
+    # Counts calls and returns "v1", "v2", ...; `gate` holds a call until set
+    def __init__(self, gate=None):
+        self.calls = 0
+        self.gate = gate
+        self.done = threading.Event()
+
+    def __call__(self):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.calls += 1
+        self.done.set()
+        return f"v{self.calls}"
+
+
+def cache(tmp_path, **kwargs):
+    return DataCache(str(tmp_path / "cache.sqlite"), **kwargs)
+
+
+def test_miss_loads_and_stores(tmp_path):
+    c = cache(tmp_path)
+    load = Loader()
+    assert c.fetch("k", "daily", load) == "v1"
+    assert load.calls == 1
+    assert c.get("k")[0] == "v1"
+
+
+def test_fresh_hit_skips_the_loader(tmp_path):
+    c = cache(tmp_path)
+    c.set("k", "daily", "cached")
+    load = Loader()
+    assert c.fetch("k", "daily", load) == "cached"
+    assert load.calls == 0
+
+
+def test_stale_entry_is_served_and_refreshed_in_background(tmp_path):
+    c = cache(tmp_path, ttls={"daily": 0})
+    c.set("k", "daily", "cached")
+    gate = threading.Event()
+    load = Loader(gate)
+
+    # Returned before the loader is even allowed to run
+    assert c.fetch("k", "daily", load) == "cached"
+    assert load.calls == 0
+    gate.set()
+    assert load.done.wait(5)
+    for _ in range(100):
+        if c.get("k")[0] == "v1":
+            break
+        threading.Event().wait(0.01)
+    assert c.get("k")[0] == "v1"
+
+
+def test_entry_past_max_stale_is_reloaded_synchronously(tmp_path):
+    c = cache(tmp_path, ttls={"daily": 0}, max_stale={"daily": 0})
+    c.set("k", "daily", "cached")
+    load = Loader()
+    assert c.fetch("k", "daily", load) == "v1"
+    assert load.calls == 1
+    assert c.get("k")[0] == "v1"
+
+
+def test_stale_without_revalidate_falls_back_when_the_load_fails(tmp_path):
+    c = cache(tmp_path, ttls={"daily": 0}, stale_while_revalidate=False)
+    c.set("k", "daily", "cached")
+
+    def fail():
+        raise ConnectionError("upstream down")
+
+    assert c.fetch("k", "daily", fail) == "cached"
+
+
+def test_empty_results_are_not_cached(tmp_path):
+    c = cache(tmp_path)
+    assert c.fetch("k", "info", lambda: {}) == {}
+    assert c.get("k") is None
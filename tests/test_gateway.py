@@ -0,0 +1,93 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gateway
+import providers
+from gateway import Gateway, UpstreamError
+
+
+class FeedProvider:
+    # Serves the given feed dicts in order, repeating the last one
+    def __init__(self, *feeds):
+        self.feeds = list(feeds)
+        self.calls = 0
+
+    def feed(self, url, etag=None, modified=None):
+        self.calls += 1
+        return self.feeds[min(self.calls, len(self.feeds)) - 1]
+
+
+class Failing:
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        raise self.error
+
+
+class YFTickerMissingError(Exception):
+    # Stand-in with the name yfinance uses for a delisted / unknown symbol
+    pass
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = type("Response", (), {"status_code": status_code})()
+
+
+@pytest.fixture
+def quick(monkeypatch):
+    fast = Gateway(retries=2, backoff_base=0, limits={"news": (1e9, 1e9), "yahoo": (1e9, 1e9)})
+    monkeypatch.setattr(gateway, "_default_gateway", fast)
+    previous = providers.get_provider()
+    yield fast
+    providers.set_provider(previous)
+
+
+NETWORK_DOWN = {"bozo": 1, "bozo_exception": OSError("connection refused"), "entries": []}
+OK = {"bozo": 0, "status": 200, "entries": [{"title": "Infosys wins deal"}]}
+
+
+def test_network_failure_is_retried(quick):
+    provider = FeedProvider(NETWORK_DOWN, OK)
+    providers.set_provider(provider)
+    assert gateway.parse_feed("http://feed.example/INFY")["status"] == 200
+    assert provider.calls == 2 and quick.stats()["retries"] == 1
+
+
+def test_network_failure_raises_after_retries(quick):
+    provider = FeedProvider(NETWORK_DOWN)
+    providers.set_provider(provider)
+    with pytest.raises(UpstreamError):
+        gateway.parse_feed("http://feed.example/INFY")
+    assert provider.calls == 3
+
+
+def test_not_found_feed_is_returned_without_retry(quick):
+    provider = FeedProvider({"bozo": 1, "status": 404, "entries": []})
+    providers.set_provider(provider)
+    assert gateway.parse_feed("http://feed.example/NOPE")["status"] == 404
+    assert provider.calls == 1
+
+
+@pytest.mark.parametrize("error", [YFTickerMissingError("NOPE.NS"), HTTPError(404), LookupError("no cassette")])
+def test_missing_symbol_is_not_retried(quick, error):
+    fn = Failing(error)
+    with pytest.raises(type(error)):
+        quick.call("yahoo", "info:NOPE.NS", fn)
+    assert fn.calls == 1 and quick.stats()["failures"] == 1
+
+
+@pytest.mark.parametrize("error", [UpstreamError("throttled"), HTTPError(503), ConnectionError("reset")])
+def test_transient_errors_are_retried(quick, error):
+    fn = Failing(error)
+    with pytest.raises(type(error)):
+        quick.call("yahoo", "info:INFY.NS", fn)
+    assert fn.calls == 3
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import import_time
+
+# Same knob as `python -m benchmarks.import_time --scale`, for slow CI runners
+SCALE = float(os.environ.get("MARKETMIND_BUDGET_SCALE", "1"))
+
+# Streamlit pulls in pandas/numpy itself, so app.py is only held to the rest
+APP_MUST_STAY_LAZY = ("yfinance", "textblob", "feedparser", "nltk")
+
+
+def loaded_after(code, modules):
+    # Which of `modules` a fresh interpreter has in sys.modules after running `code`
+    proc = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys; print(' '.join(m for m in {modules!r} if m in sys.modules))"],
+        cwd=import_time.ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.split()
+
+
+@pytest.mark.parametrize("module", sorted(import_time.BUDGETS))
+def test_module_import_within_budget(module):
+    total, eager, slowest = import_time.check(module)
+    assert eager == []
+    assert total <= import_time.BUDGETS[module] * SCALE, slowest
+
+
+def test_cli_start_within_budget():
+    total, eager, slowest = import_time.check_cli()
+    assert eager == []
+    assert total <= import_time.CLI_BUDGET * SCALE, slowest
+
+
+def test_marketmind_import_keeps_heavy_modules_out():
+    modules = import_time.MUST_STAY_LAZY + ("streamlit",)
+    assert loaded_after("import marketmind_v5_final", modules) == []
+
+
+def test_app_import_keeps_heavy_modules_out():
+    pytest.importorskip("streamlit")
+    # The warm-up thread imports them on purpose after the first paint; stub it
+    # so only what the script itself imports is counted
+    code = "import marketmind_v5_final; marketmind_v5_final.warm_up = lambda: None; import app"
+    assert loaded_after(code, APP_MUST_STAY_LAZY) == []
+
+
+def test_first_paint_within_budget():
+    paint = import_time.first_paint()
+    if paint is None:
+        pytest.skip("streamlit not installed")
+    elapsed, exceptions = paint
+    assert exceptions == 0
+    assert elapsed <= import_time.FIRST_PAINT_BUDGET * SCALE
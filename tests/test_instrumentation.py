@@ -0,0 +1,31 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import instrumentation
+
+
+def test_prometheus_types(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_counters", {})
+    monkeypatch.setattr(instrumentation, "_collectors", {})
+    instrumentation.incr("news.not_modified", 3)
+    instrumentation.register_collector("polarity_cache", lambda: {"entries": 42, "hit_rate": 0.5, "path": "x"})
+
+    lines = instrumentation.prometheus_text().splitlines()
+    assert "# TYPE marketmind_news_not_modified_total counter" in lines
+    assert "marketmind_news_not_modified_total 3" in lines
+    assert "# TYPE marketmind_polarity_cache_entries gauge" in lines
+    assert "marketmind_polarity_cache_hit_rate 0.5" in lines
+    assert not any("polarity_cache" in line and "_total" in line for line in lines)
+    assert not any(line.startswith("marketmind_news_not_modified ") for line in lines)
+
+
+def test_snapshot_keeps_counters_and_gauges_apart(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_counters", {})
+    monkeypatch.setattr(instrumentation, "_collectors", {})
+    instrumentation.incr("analyses")
+    instrumentation.register_collector("sector_index", lambda: {"symbols": 7})
+    data = instrumentation.snapshot()
+    assert data["counters"] == {"analyses": 1}
+    assert data["gauges"] == {"sector_index.symbols": 7}
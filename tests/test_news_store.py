@@ -0,0 +1,145 @@
+import os
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("feedparser")
+
+import providers
+from news_store import NewsStore
+
+# ---------------- RSS Fixtures ----------------
+ITEM = "<item><title>{title}</title><link>https://news.example/{guid}</link><guid>{guid}</guid><pubDate>{date}</pubDate></item>"
+RSS = '<?xml version="1.0"?><rss version="2.0"><channel><title>fixture</title>{items}</channel></rss>'
+
+
+def rss(*items):
+    return RSS.format(items="".join(
+        ITEM.format(title=title, guid=guid, date=formatdate(time.time() - age_days * 86400, usegmt=True))
+        for guid, title, age_days in items
+    ))
+
+
+class FeedServer:
+    # Serves one RSS document per path with an ETag, answering 304 to a
+    # matching If-None-Match, and records every request it sees
+    def __init__(self):
+        self.feeds = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body, etag = server.feeds[self.path]
+                server.requests.append((self.path, self.headers.get("If-None-Match")))
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def publish(self, symbol, body, etag):
+        self.feeds[f"/{symbol}"] = (body, etag)
+
+
+@pytest.fixture
+def server():
+    previous = providers.get_provider()
+    providers.set_provider(providers.LiveProvider())
+    feeds = FeedServer()
+    yield feeds
+    feeds.httpd.shutdown()
+    providers.set_provider(previous)
+
+
+@pytest.fixture
+def store(tmp_path, server):
+    return NewsStore(str(tmp_path / "news.sqlite"), url_for=lambda symbol: f"{server.url}/{symbol}")
+
+
+# ---------------- Tests ----------------
+def test_conditional_get_returns_not_modified(store, server):
+    server.publish("INFY.NS", rss(("a", "Infosys profit jumps", 1), ("b", "Infosys wins deal", 2)), '"v1"')
+
+    assert store.refresh("INFY.NS", force=True) == 2
+    assert store.refresh("INFY.NS", force=True) == 0
+    assert server.requests == [("/INFY.NS", None), ("/INFY.NS", '"v1"')]
+    assert len(store.recent("INFY.NS")) == 2
+
+
+def test_refresh_interval_skips_the_request(store, server):
+    server.publish("INFY.NS", rss(("a", "Infosys profit jumps", 1)), '"v1"')
+
+    store.refresh("INFY.NS")
+    store.refresh("INFY.NS")
+    assert len(server.requests) == 1
+
+
+def test_only_unseen_guids_are_scored(store, server, monkeypatch):
+    import sentiment_batch
+
+    scored = []
+    score = sentiment_batch.score_headlines
+    monkeypatch.setattr(sentiment_batch, "score_headlines", lambda titles: scored.append(list(titles)) or score(titles))
+
+    server.publish("TCS.NS", rss(("a", "TCS wins deal", 1), ("b", "TCS shares fall", 1)), '"v1"')
+    assert store.refresh("TCS.NS", force=True) == 2
+
+    # Same GUIDs again (one retitled, one listed twice) plus one new item
+    server.publish("TCS.NS", rss(
+        ("a", "TCS wins big deal", 1), ("b", "TCS shares fall", 1), ("b", "TCS shares fall", 1),
+        ("c", "TCS hikes dividend", 0),
+    ), '"v2"')
+    assert store.refresh("TCS.NS", force=True) == 1
+
+    assert scored == [["TCS wins deal", "TCS shares fall"], ["TCS hikes dividend"]]
+    assert sorted(row[0] for row in store.recent("TCS.NS")) == ["TCS hikes dividend", "TCS shares fall", "TCS wins deal"]
+
+
+def test_headlines_past_retention_are_pruned(tmp_path, server):
+    store = NewsStore(str(tmp_path / "news.sqlite"), retention_days=30,
+                      url_for=lambda symbol: f"{server.url}/{symbol}")
+    server.publish("SBIN.NS", rss(("old", "SBI old news", 20), ("new", "SBI new news", 1)), '"v1"')
+    assert store.refresh("SBIN.NS", force=True) == 2
+
+    store.retention_days = 10
+    server.publish("SBIN.NS", rss(("new", "SBI new news", 1), ("older", "SBI older news", 40)), '"v2"')
+    assert store.refresh("SBIN.NS", force=True) == 0
+
+    assert [row[0] for row in store.recent("SBIN.NS", days=365)] == ["SBI new news"]
+
+
+def test_unreachable_feed_falls_back_to_stored_headlines(store, server, monkeypatch):
+    import gateway
+
+    monkeypatch.setattr(gateway, "_default_gateway", gateway.Gateway(backoff_base=0, limits={"news": (1e9, 1e9)}))
+    server.publish("WIPRO.NS", rss(("a", "Wipro profit jumps", 1)), '"v1"')
+    assert store.refresh("WIPRO.NS", force=True) == 1
+
+    server.httpd.shutdown()
+    server.httpd.server_close()
+    store.refresh_interval = 0
+    label, headlines = store.sentiment("WIPRO.NS")
+    assert headlines == ["Wipro profit jumps"]
+    with pytest.raises(gateway.UpstreamError):
+        store.sentiment("TCS.NS")
@@ -0,0 +1,34 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from marketmind_v5_final import market_psychology_from_history, psychology_messages
+from psychology import INSUFFICIENT_DATA, PSYCHOLOGY_REGIMES, latest_psychology
+
+
+def history(close, volume=None):
+    volume = [1000.0] * len(close) if volume is None else volume
+    return pd.DataFrame({"Close": close, "Volume": volume})
+
+
+def test_every_label_has_a_message():
+    for label in PSYCHOLOGY_REGIMES + (INSUFFICIENT_DATA,):
+        assert label in psychology_messages
+
+
+def test_nan_price_change_is_insufficient_data():
+    for close in ([np.nan], [np.nan, 101.0, 102.0], [100.0, 101.0, np.nan], [0.0, 0.0]):
+        assert latest_psychology(close, [1000.0] * len(close)) == INSUFFICIENT_DATA
+        assert market_psychology_from_history(history(close)) == psychology_messages[INSUFFICIENT_DATA]
+
+
+def test_single_row_is_sideways():
+    assert market_psychology_from_history(history([100.0])) == psychology_messages["sideways"]
+
+
+def test_empty_history():
+    assert market_psychology_from_history(history([])) == "⚠️ No price data available"
@@ -0,0 +1,95 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import synthetic
+from marketmind_v5_final import (
+    Fundamentals,
+    custom_sector_pe,
+    determine_sector,
+    final_verdict,
+    intrinsic_value,
+    marketmind_score,
+)
+from screener import fundamentals_frame, screen_universe
+from sector_index import SectorIndex
+
+EDGE_CASES = {
+    "EMPTY.NS": {},
+    "INFPE.NS": {"trailingPE": "Infinity", "priceToBook": 2.0, "returnOnEquity": 0.2, "profitMargins": 0.1,
+                 "trailingEps": 10.0, "currentPrice": 150.0, "sector": "Technology"},
+    "FLOATINF.NS": {"trailingPE": float("inf"), "trailingEps": 5.0, "currentPrice": 90.0},
+    "NEGPB.NS": {"trailingPE": 12.0, "priceToBook": -1.5, "returnOnEquity": 0.1, "profitMargins": 0.05,
+                 "trailingEps": 3.0, "currentPrice": 40.0, "sector": "Utilities"},
+    "ZERO.NS": {"trailingPE": 18.0, "priceToBook": 3.0, "returnOnEquity": 0.0, "profitMargins": 0.0,
+                "trailingEps": 7.0, "currentPrice": 80.0, "sector": "Financial Services"},
+    "NOPRICE.NS": {"trailingPE": 25.0, "trailingEps": 4.0, "sector": "Consumer Defensive"},
+    "NEGEPS.NS": {"trailingPE": -8.0, "trailingEps": -2.0, "currentPrice": 30.0, "sector": "Energy"},
+}
+
+
+def per_symbol(info, valuation_pe):
+    # The single-symbol flow of pipeline.analysis_report / app.py
+    report = Fundamentals.from_info(info)
+    score = report.score()
+    sector = determine_sector(info)
+    verdict, intrinsic = "N/A", None
+    if report.eps is not None and report.price is not None:
+        _, intrinsic = intrinsic_value(report.eps, valuation_pe(sector))
+        verdict = "✅ Undervalued" if intrinsic > report.price else "❌ Overvalued"
+    base_score, adjusted_score = marketmind_score(score, verdict, sector)
+    return {
+        "sector": sector,
+        "score": score,
+        "intrinsic_value": intrinsic,
+        "verdict": verdict,
+        "base_score": base_score,
+        "adjusted_score": adjusted_score,
+        "final_verdict": final_verdict(adjusted_score),
+    }
+
+
+def assert_matches(infos, scored, valuation_pe):
+    assert list(scored.index) == list(infos)
+    for symbol, info in infos.items():
+        expected = per_symbol(info, valuation_pe)
+        row = scored.loc[symbol]
+        for key in ("sector", "score", "verdict", "base_score", "adjusted_score", "final_verdict"):
+            assert row[key] == expected[key], (symbol, key, row[key], expected[key])
+        # Without a price the screener still shows the intrinsic value; the
+        # per-symbol flow skips the valuation, and both say "N/A"
+        if expected["intrinsic_value"] is not None:
+            assert row["intrinsic_value"] == pytest.approx(expected["intrinsic_value"]), symbol
+
+
+@pytest.fixture(scope="module")
+def infos():
+    return {**synthetic.info_dicts(2000, seed=7), **EDGE_CASES}
+
+
+def test_static_tables_match_the_per_symbol_flow(infos):
+    scored = screen_universe(fundamentals_frame(infos))
+    assert_matches(infos, scored, lambda sector: custom_sector_pe.get(sector, 15))
+
+
+def test_peer_tables_match_the_per_symbol_flow(infos):
+    index = SectorIndex()
+    for symbol, info in infos.items():
+        index.observe_info(symbol, info)
+    scored = screen_universe(fundamentals_frame(infos), **index.screen_tables())
+    assert_matches(infos, scored, index.valuation_pe)
+
+
+def test_edge_cases_are_reported_not_dropped():
+    scored = screen_universe(fundamentals_frame(EDGE_CASES))
+    empty = scored.loc["EMPTY.NS"]
+    assert empty["score"] == 0 and empty["verdict"] == "N/A" and empty["sector"] == "Default"
+    assert np.isnan(scored.loc["INFPE.NS", "pe"]) and pd.isna(scored.loc["INFPE.NS", "pe_vs_sector"])
+    assert scored.loc["NEGPB.NS", "pb_vs_sector"] == "high_or_negative"
+    assert np.isnan(scored.loc["ZERO.NS", "roe"]) and np.isnan(scored.loc["ZERO.NS", "profit_margin"])
+    assert scored.loc["NOPRICE.NS", "verdict"] == "N/A"
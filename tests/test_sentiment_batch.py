@@ -0,0 +1,74 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("textblob")
+
+from benchmarks.synthetic import varied_headlines
+from marketmind_v5_final import negative_keywords, positive_keywords, score_headline
+from polarity_cache import bypassed
+from sentiment_batch import keyword_flags, score_headlines
+
+EDGE_CASES = [
+    "",
+    "?",
+    "Will TCS shares fall?",
+    "Is growth back? Analysts split?",
+    "record\nhigh",
+    "Record\nhigh for Infosys",
+    "RECORD HIGH for Infosys",
+    "Nifty at record highs",
+    "Profit drop despite record high",
+    "Jumprofit",
+    "Falloss widens",
+    "Downturn deepens",
+    "Enterprise surprise",
+    "Not a good quarter",
+    "İNFY posts gain",
+    "Very strong results!!",
+    "Line one\n\nline two",
+]
+
+
+def expected_flags(title):
+    lowered = title.lower()
+    return (
+        any(word in lowered for word in negative_keywords),
+        any(word in lowered for word in positive_keywords),
+        "?" in title,
+    )
+
+
+@pytest.fixture(scope="module")
+def titles():
+    return varied_headlines(2000, seed=3) + EDGE_CASES
+
+
+def test_keyword_flags_match_substring_semantics(titles):
+    flags = list(zip(*keyword_flags(titles)))
+    for title, got in zip(titles, flags):
+        assert tuple(bool(f) for f in got) == expected_flags(title), repr(title)
+
+
+def test_textblob_scorer_matches_score_headline(titles):
+    # The memo is off so both paths really score instead of sharing cached values
+    with bypassed():
+        polarity, weight = score_headlines(titles, scorer="textblob")
+        for i, title in enumerate(titles):
+            assert (polarity[i], weight[i]) == score_headline(title), repr(title)
+
+
+def test_each_edge_case_scored_alone():
+    # Offsets of a one-headline batch, including the empty title
+    with bypassed():
+        for title in EDGE_CASES:
+            polarity, weight = score_headlines([title], scorer="textblob")
+            assert (polarity[0], weight[0]) == score_headline(title), repr(title)
+
+
+def test_empty_batch():
+    polarity, weight = score_headlines([], scorer="textblob")
+    assert len(polarity) == 0 and len(weight) == 0
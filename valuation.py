@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from marketmind_v5_final import GROWTH_RATE, DISCOUNT_RATE, YEARS, intrinsic_value
+
+# ---------------- Scenario Settings ----------------
+GROWTH_RATES = np.round(np.arange(0.05, 0.30001, 0.025), 4)
+DISCOUNT_RATES = np.round(np.arange(0.08, 0.16001, 0.01), 4)
+PE_MULTIPLIERS = np.array([0.8, 0.9, 1.0, 1.1, 1.2])
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Monte Carlo assumptions: growth and discount are normal around the model defaults,
+# the exit P/E is the sector P/E scaled by a lognormal factor.
+GROWTH_STD = 0.05
+DISCOUNT_STD = 0.015
+PE_SIGMA = 0.2
+DRAWS = 100_000
+
+
+# ---------------- Sensitivity Grid ----------------
+def sensitivity_grid(eps, sector_pe, growth_rates=GROWTH_RATES, discount_rates=DISCOUNT_RATES,
+                     pe_multipliers=PE_MULTIPLIERS, years=YEARS):
+    # Intrinsic value for every (symbol, growth, discount, exit P/E) combination
+    # through broadcasting; eps/sector_pe may be scalars or one value per symbol.
+    eps = np.atleast_1d(np.asarray(eps, dtype=float))[:, None, None, None]
+    sector_pe = np.atleast_1d(np.asarray(sector_pe, dtype=float))[:, None, None, None]
+    growth = np.asarray(growth_rates, dtype=float)[None, :, None, None]
+    discount = np.asarray(discount_rates, dtype=float)[None, None, :, None]
+    exit_pe = sector_pe * np.asarray(pe_multipliers, dtype=float)[None, None, None, :]
+    return intrinsic_value(eps, exit_pe, growth, discount, years)[1]
+
+
+def sensitivity_frame(eps, sector_pe, growth_rates=GROWTH_RATES, discount_rates=DISCOUNT_RATES, years=YEARS):
+    # Growth x discount table at the sector P/E, for a single symbol
+    grid = sensitivity_grid(eps, sector_pe, growth_rates, discount_rates, (1.0,), years)[0, :, :, 0]
+    return pd.DataFrame(
+        grid,
+        index=pd.Index(np.asarray(growth_rates) * 100, name="Growth Rate (%)"),
+        columns=pd.Index(np.asarray(discount_rates) * 100, name="Discount Rate (%)"),
+    )
+
+
+# ---------------- Monte Carlo ----------------
+def scenario_factors(draws=DRAWS, growth_rate=GROWTH_RATE, discount_rate=DISCOUNT_RATE,
+                     years=YEARS, seed=None):
+    # Intrinsic value = eps * sector_pe * factor, so one sorted vector of factors
+    # serves every symbol in a batch.
+    rng = np.random.default_rng(seed)
+    growth = np.clip(rng.normal(growth_rate, GROWTH_STD, draws), -0.5, 1.0)
+    discount = np.clip(rng.normal(discount_rate, DISCOUNT_STD, draws), 0.01, 0.5)
+    pe_factor = rng.lognormal(0.0, PE_SIGMA, draws)
+    factors = pe_factor * ((1 + growth) / (1 + discount)) ** years
+    factors.sort()
+    return factors
+
+
+def monte_carlo(eps, sector_pe, current_price=None, draws=DRAWS, percentiles=PERCENTILES,
+                seed=None, factors=None):
+    # Percentiles, mean and probability of undervaluation per symbol. The scale
+    # eps * sector_pe is monotonic in the shared factors, so percentiles come from
+    # one np.percentile call and P(intrinsic > price) from one searchsorted.
+    if factors is None:
+        factors = scenario_factors(draws, seed=seed)
+    scale = np.atleast_1d(np.asarray(eps, dtype=float) * np.asarray(sector_pe, dtype=float))
+    qs = np.asarray(percentiles, dtype=float)
+
+    factor_q = np.percentile(factors, qs)
+    factor_q_flipped = np.percentile(factors, 100 - qs)
+    values = np.where(scale[:, None] >= 0, scale[:, None] * factor_q, scale[:, None] * factor_q_flipped)
+
+    result = pd.DataFrame(values, columns=[f"p{int(q)}" for q in qs])
+    result["mean"] = scale * factors.mean()
+
+    if current_price is not None:
+        price = np.broadcast_to(np.asarray(current_price, dtype=float), scale.shape)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            threshold = price / scale
+        above = len(factors) - np.searchsorted(factors, threshold, side="right")
+        below = np.searchsorted(factors, threshold, side="left")
+        prob = np.where(scale > 0, above, np.where(scale < 0, below, (price < 0) * len(factors))) / len(factors)
+        prob[np.isnan(scale) | np.isnan(price)] = np.nan
+        result["prob_undervalued"] = prob
+    return result
+
+
+def monte_carlo_samples(eps, sector_pe, draws=DRAWS, seed=None):
+    # Full intrinsic value distribution for one symbol (e.g. for a histogram)
+    return float(eps) * float(sector_pe) * scenario_factors(draws, seed=seed)